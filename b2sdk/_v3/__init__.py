@@ -131,13 +131,17 @@ from b2sdk.raw_api import LifecycleRule
 from b2sdk.stream.chained import StreamOpener
 from b2sdk.stream.progress import AbstractStreamWithProgress
 from b2sdk.stream import RangeOfInputStream
+from b2sdk.stream import RateLimitedStream
 from b2sdk.stream import ReadingStreamWithProgress
+from b2sdk.stream import SpillingStream
 from b2sdk.stream import StreamWithHash
+from b2sdk.stream import UploadStream
 from b2sdk.stream import WritingStreamWithProgress
 
 # source / destination
 
 from b2sdk.transfer.inbound.downloaded_file import DownloadedFile
+from b2sdk.transfer.inbound.remote_file import RemoteFileReader
 from b2sdk.transfer.inbound.downloaded_file import MtimeUpdatedFile
 from b2sdk.transfer.inbound.download_manager import DownloadManager
 
@@ -158,11 +162,20 @@ from b2sdk.transfer.emerge.write_intent import WriteIntent
 
 from b2sdk.transfer.inbound.downloader.abstract import AbstractDownloader
 from b2sdk.transfer.outbound.large_file_upload_state import LargeFileUploadState
+from b2sdk.transfer.inbound.downloader.parallel import MmapWriter
 from b2sdk.transfer.inbound.downloader.parallel import ParallelDownloader
 from b2sdk.transfer.inbound.downloader.parallel import PartToDownload
+from b2sdk.transfer.inbound.downloader.parallel import PositionalWriter
 from b2sdk.transfer.inbound.downloader.parallel import WriterThread
 from b2sdk.transfer.outbound.progress_reporter import PartProgressReporter
 from b2sdk.transfer.inbound.downloader.simple import SimpleDownloader
+from b2sdk.transfer.inbound.downloader.streaming import StreamingParallelDownloader
+from b2sdk.transfer.scheduler import TransferClass
+from b2sdk.transfer.scheduler import TransferClassExecutor
+from b2sdk.transfer.scheduler import TransferPriority
+from b2sdk.transfer.scheduler import TransferScheduler
+from b2sdk.transfer.scheduler import get_transfer_priority
+from b2sdk.transfer.scheduler import transfer_priority
 
 # sync
 
@@ -174,6 +187,7 @@ from b2sdk.sync.action import B2HideAction
 from b2sdk.sync.action import B2UploadAction
 from b2sdk.sync.action import LocalDeleteAction
 from b2sdk.sync.exception import IncompleteSync
+from b2sdk.sync.hash_cache import LocalFileHashCache
 from b2sdk.sync.policy import AbstractFileSyncPolicy
 from b2sdk.sync.policy import CompareVersionMode
 from b2sdk.sync.policy import NewerFileSyncMode
@@ -207,6 +221,7 @@ from b2sdk.scan.folder import AbstractFolder
 from b2sdk.scan.folder import B2Folder
 from b2sdk.scan.folder import LocalFolder
 from b2sdk.scan.folder_parser import parse_folder
+from b2sdk.scan.manifest import ScanManifest
 from b2sdk.scan.path import AbstractPath, B2Path, LocalPath
 from b2sdk.scan.policies import convert_dir_regex_to_dir_prefix_regex
 from b2sdk.scan.policies import DEFAULT_SCAN_MANAGER
@@ -238,6 +253,12 @@ from b2sdk.api_config import B2HttpApiConfig
 from b2sdk.api_config import DEFAULT_HTTP_API_CONFIG
 from b2sdk.b2http import ClockSkewHook
 from b2sdk.b2http import HttpCallback
+from b2sdk.concurrency_controller import AimdConcurrencyLimiter
+from b2sdk.concurrency_controller import ConcurrencyController
+from b2sdk.concurrency_controller import RequestClass
+from b2sdk.http_metrics import HttpMetricsCollector
+from b2sdk.http_metrics import HttpMetricsSink
+from b2sdk.http_metrics import RequestMetrics
 from b2sdk.b2http import ResponseContextManager
 from b2sdk.bounded_queue_executor import BoundedQueueExecutor
 from b2sdk.cache import AbstractCache
@@ -257,6 +278,7 @@ from b2sdk.http_constants import (
 )
 from b2sdk.session import B2Session
 from b2sdk.utils.thread_pool import ThreadPoolMixin
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
 
 # filter
 from b2sdk.filter import FilterType, Filter
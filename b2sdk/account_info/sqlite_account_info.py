@@ -40,6 +40,11 @@ class SqliteAccountInfo(UrlPoolAccountInfo):
 
     The ``update_done`` table tracks the schema updates that have been
     completed.
+
+    The contents of the ``account`` and ``bucket`` tables are cached in memory, so reading them
+    does not require a database transaction. The cache is reloaded when the database
+    is changed by any connection (in this or another process), which is detected
+    with ``PRAGMA data_version``.
     """
 
     def __init__(self, file_name=None, last_upgrade_to_run=None, profile: str | None = None):
@@ -79,6 +84,15 @@ class SqliteAccountInfo(UrlPoolAccountInfo):
         self._validate_database(last_upgrade_to_run)
         with self._get_connection() as conn:
             self._create_tables(conn, last_upgrade_to_run)
+
+        # a connection which is used only to check whether the database was modified;
+        # it never writes, so its data_version changes after every commit of any other connection
+        self._data_version_connection = sqlite3.connect(
+            self.filename, isolation_level=None, check_same_thread=False
+        )
+        self._snapshot_lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_data_version = None
         super().__init__()
 
     # dirty trick to use parameters in the docstring
@@ -569,10 +583,12 @@ class SqliteAccountInfo(UrlPoolAccountInfo):
 
     def _get_account_info_or_raise(self, column_name):
         try:
-            with self._get_connection() as conn:
-                cursor = conn.execute(f'SELECT {column_name} FROM account;')
-                value = cursor.fetchone()[0]
-                return value
+            account = self._get_snapshot().account
+            if account is None:
+                raise MissingAccountData('no account data')
+            return account[column_name]
+        except MissingAccountData:
+            raise
         except Exception as e:
             logger.exception(
                 '_get_account_info_or_raise encountered a problem while trying to retrieve "%s"',
@@ -580,6 +596,28 @@ class SqliteAccountInfo(UrlPoolAccountInfo):
             )
             raise MissingAccountData(str(e))
 
+    def _get_snapshot(self) -> _Snapshot:
+        """
+        Return the cached contents of the database, reloading them if the database was modified.
+        """
+        with self._snapshot_lock:
+            cursor = self._data_version_connection.execute('PRAGMA data_version;')
+            data_version = cursor.fetchone()[0]
+            if self._snapshot is None or data_version != self._snapshot_data_version:
+                self._snapshot = self._load_snapshot()
+                self._snapshot_data_version = data_version
+            return self._snapshot
+
+    def _load_snapshot(self) -> _Snapshot:
+        with self._get_connection() as conn:
+            cursor = conn.execute('SELECT * FROM account;')
+            row = cursor.fetchone()
+            account = None
+            if row is not None:
+                account = dict(zip((column[0] for column in cursor.description), row))
+            buckets = conn.execute('SELECT bucket_name, bucket_id FROM bucket;').fetchall()
+        return _Snapshot(account, buckets)
+
     def refresh_entire_bucket_name_cache(self, name_id_iterable):
         with self._get_connection() as conn:
             conn.execute('DELETE FROM bucket;')
@@ -602,24 +640,25 @@ class SqliteAccountInfo(UrlPoolAccountInfo):
             conn.execute('DELETE FROM bucket WHERE bucket_name = ?;', (bucket_name,))
 
     def get_bucket_id_or_none_from_bucket_name(self, bucket_name):
-        return self._safe_query(
-            'SELECT bucket_id FROM bucket WHERE bucket_name = ?;', (bucket_name,)
-        )
+        return self._get_snapshot().bucket_ids_by_name.get(bucket_name)
 
     def get_bucket_name_or_none_from_bucket_id(self, bucket_id: str) -> str | None:
-        return self._safe_query('SELECT bucket_name FROM bucket WHERE bucket_id = ?;', (bucket_id,))
+        return self._get_snapshot().bucket_names_by_id.get(bucket_id)
 
     def list_bucket_names_ids(self) -> list[tuple[str, str]]:
-        with self._get_connection() as conn:
-            cursor = conn.execute('SELECT bucket_name, bucket_id FROM bucket;')
-            return cursor.fetchall()
+        return list(self._get_snapshot().buckets)
 
-    def _safe_query(self, query, params):
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.execute(query, params)
-                return cursor.fetchone()[0]
-        except TypeError:  # TypeError: 'NoneType' object is unsubscriptable
-            return None
-        except sqlite3.Error:
-            return None
+
+class _Snapshot:
+    """
+    Contents of the ``account`` and ``bucket`` tables of :class:`SqliteAccountInfo` database.
+    """
+
+    def __init__(self, account: dict | None, buckets: list[tuple[str, str]]):
+        self.account = account
+        self.buckets = buckets
+        self.bucket_ids_by_name = {}
+        self.bucket_names_by_id = {}
+        for bucket_name, bucket_id in buckets:
+            self.bucket_ids_by_name.setdefault(bucket_name, bucket_id)
+            self.bucket_names_by_id.setdefault(bucket_id, bucket_name)
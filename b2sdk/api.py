@@ -46,7 +46,10 @@ from .transfer import (
     UploadManager,
 )
 from .transfer.inbound.downloaded_file import DownloadedFile
+from .transfer.inbound.remote_file import RemoteFileReader
+from .transfer.scheduler import TransferClass, TransferScheduler
 from .utils import B2TraceMeta, b2_url_encode, limit_trace_arguments
+from .utils.bandwidth_limiter import BandwidthLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +75,7 @@ class Services:
     COPY_MANAGER_CLASS = staticmethod(CopyManager)
     DOWNLOAD_MANAGER_CLASS = staticmethod(DownloadManager)
     LARGE_FILE_SERVICES_CLASS = staticmethod(LargeFileServices)
+    TRANSFER_SCHEDULER_CLASS = staticmethod(TransferScheduler)
 
     def __init__(
         self,
@@ -82,35 +86,73 @@ class Services:
         save_to_buffer_size: int | None = None,
         check_download_hash: bool = True,
         max_download_streams_per_file: int | None = None,
+        min_download_segment_size: int | None = None,
+        download_buffer_pool_size: int | None = None,
+        max_upload_bandwidth: float | None = None,
+        max_download_bandwidth: float | None = None,
+        download_hash_reorder_buffer_size: int | None = None,
     ):
         """
         Initialize Services object using given session.
 
         :param b2sdk.v2.B2Api api:
-        :param max_upload_workers: a number of upload threads
-        :param max_copy_workers: a number of copy threads
-        :param max_download_workers: maximum number of download threads
+        :param max_upload_workers: a number of threads of the transfer scheduler reserved for uploads
+        :param max_copy_workers: a number of threads of the transfer scheduler reserved for copies
+        :param max_download_workers: a number of threads of the transfer scheduler reserved for downloads
         :param save_to_buffer_size: buffer size to use when writing files using DownloadedFile.save_to
         :param check_download_hash: whether to check hash of downloaded files. Can be disabled for files with internal checksums, for example, or to forcefully retrieve objects with corrupted payload or hash value
         :param max_download_streams_per_file: how many streams to use for parallel downloader
+        :param min_download_segment_size: minimum size of a segment assigned on demand to a parallel downloader stream; if not set, the file is split into one part per stream upfront
+        :param download_buffer_pool_size: maximum amount of memory held by the pool of reusable download buffers; if not set, buffers are not pooled
+        :param max_upload_bandwidth: maximum number of bytes per second sent by all the uploads; unlimited if not set
+        :param max_download_bandwidth: maximum number of bytes per second received by all the downloads; unlimited if not set
+        :param download_hash_reorder_buffer_size: maximum amount of out-of-order data a parallel download keeps in memory to hash it as it is downloaded; :attr:`b2sdk.v2.DownloadManager.DEFAULT_HASH_REORDER_BUFFER_SIZE` if not set, 0 to read the data back from the file instead
         """
         self.api = api
         self.session = api.session
         self.large_file = self.LARGE_FILE_SERVICES_CLASS(self)
+        # the transfer managers share the worker threads, each of them having its number reserved
+        self.transfer_scheduler = self.TRANSFER_SCHEDULER_CLASS()
+        self.upload_bandwidth_limiter = BandwidthLimiter(max_upload_bandwidth)
+        self.download_bandwidth_limiter = BandwidthLimiter(max_download_bandwidth)
         self.upload_manager = self.UPLOAD_MANAGER_CLASS(
-            services=self, max_workers=max_upload_workers
+            services=self,
+            thread_pool=self.transfer_scheduler.get_executor(
+                TransferClass.UPLOAD, max_workers=max_upload_workers
+            ),
+            bandwidth_limiter=self.upload_bandwidth_limiter,
+        )
+        self.copy_manager = self.COPY_MANAGER_CLASS(
+            services=self,
+            thread_pool=self.transfer_scheduler.get_executor(
+                TransferClass.COPY, max_workers=max_copy_workers
+            ),
         )
-        self.copy_manager = self.COPY_MANAGER_CLASS(services=self, max_workers=max_copy_workers)
         assert max_download_streams_per_file is None or max_download_streams_per_file >= 1
         self.download_manager = self.DOWNLOAD_MANAGER_CLASS(
             services=self,
-            max_workers=max_download_workers,
+            thread_pool=self.transfer_scheduler.get_executor(
+                TransferClass.DOWNLOAD, max_workers=max_download_workers
+            ),
             write_buffer_size=save_to_buffer_size,
             check_hash=check_download_hash,
             max_download_streams_per_file=max_download_streams_per_file,
+            min_download_segment_size=min_download_segment_size,
+            buffer_pool_size=download_buffer_pool_size,
+            bandwidth_limiter=self.download_bandwidth_limiter,
+            hash_reorder_buffer_size=download_hash_reorder_buffer_size,
         )
         self.emerger = Emerger(self)
 
+    def get_max_transfer_workers(self) -> int:
+        """
+        Return the maximum number of threads running transfers (uploads, copies and downloads) at the same time.
+        """
+        return sum(
+            getattr(manager._thread_pool, '_max_workers', None) or 0
+            for manager in (self.upload_manager, self.copy_manager, self.download_manager)
+        )
+
 
 class B2Api(metaclass=B2TraceMeta):
     """
@@ -139,6 +181,7 @@ class B2Api(metaclass=B2TraceMeta):
     DOWNLOAD_VERSION_FACTORY_CLASS = staticmethod(DownloadVersionFactory)
     SERVICES_CLASS = staticmethod(Services)
     DEFAULT_LIST_KEY_COUNT = 1000
+    EXTRA_HTTP_CONNECTIONS = 4
 
     def __init__(
         self,
@@ -151,6 +194,11 @@ class B2Api(metaclass=B2TraceMeta):
         save_to_buffer_size: int | None = None,
         check_download_hash: bool = True,
         max_download_streams_per_file: int | None = None,
+        min_download_segment_size: int | None = None,
+        download_buffer_pool_size: int | None = None,
+        max_upload_bandwidth: float | None = None,
+        max_download_bandwidth: float | None = None,
+        download_hash_reorder_buffer_size: int | None = None,
     ):
         """
         Initialize the API using the given account info.
@@ -168,6 +216,11 @@ class B2Api(metaclass=B2TraceMeta):
         :param save_to_buffer_size: buffer size to use when writing files using DownloadedFile.save_to
         :param check_download_hash: whether to check hash of downloaded files. Can be disabled for files with internal checksums, for example, or to forcefully retrieve objects with corrupted payload or hash value
         :param max_download_streams_per_file: number of streams for parallel download manager
+        :param min_download_segment_size: if set, parallel downloads are split into segments of adaptive size (not smaller than this) which idle streams take on demand, instead of one part per stream
+        :param download_buffer_pool_size: if set, downloaded data is read with ``readinto`` into reusable buffers from a pool shared by all the downloads, holding at most this many bytes
+        :param max_upload_bandwidth: if set, all the uploads together send at most this many bytes per second; can be changed later with :meth:`set_bandwidth_limits`
+        :param max_download_bandwidth: if set, all the downloads together receive at most this many bytes per second; can be changed later with :meth:`set_bandwidth_limits`
+        :param download_hash_reorder_buffer_size: maximum amount of data a parallel download keeps in memory when it arrives ahead of the data preceding it, so that the file is hashed as it is downloaded instead of being read back from disk; :attr:`b2sdk.v2.DownloadManager.DEFAULT_HASH_REORDER_BUFFER_SIZE` if not set, 0 to always read the file back
         """
         self.session = self.SESSION_CLASS(
             account_info=account_info, cache=cache, api_config=api_config
@@ -183,12 +236,46 @@ class B2Api(metaclass=B2TraceMeta):
             save_to_buffer_size=save_to_buffer_size,
             check_download_hash=check_download_hash,
             max_download_streams_per_file=max_download_streams_per_file,
+            min_download_segment_size=min_download_segment_size,
+            download_buffer_pool_size=download_buffer_pool_size,
+            max_upload_bandwidth=max_upload_bandwidth,
+            max_download_bandwidth=max_download_bandwidth,
+            download_hash_reorder_buffer_size=download_hash_reorder_buffer_size,
         )
+        self._update_http_pool_maxsize()
 
     @property
     def account_info(self):
         return self.session.account_info
 
+    def _update_http_pool_maxsize(self):
+        """
+        Size the connection pools for the current number of transfer threads.
+
+        Called again whenever the number of threads of a transfer manager changes.
+        """
+        # every transfer thread can hold a connection, and a few more are needed by other threads for API calls;
+        # custom raw api classes (not derived from AbstractRawApi) may not support it
+        set_http_pool_maxsize = getattr(self.session.raw_api, 'set_http_pool_maxsize', None)
+        if set_http_pool_maxsize is not None:
+            set_http_pool_maxsize(
+                self.services.get_max_transfer_workers() + self.EXTRA_HTTP_CONNECTIONS
+            )
+
+    def set_bandwidth_limits(
+        self,
+        max_upload_bandwidth: float | None = None,
+        max_download_bandwidth: float | None = None,
+    ):
+        """
+        Change the bandwidth limits of the transfers, including the ones in progress.
+
+        :param max_upload_bandwidth: maximum number of bytes per second sent by all the uploads, ``None`` for no limit
+        :param max_download_bandwidth: maximum number of bytes per second received by all the downloads, ``None`` for no limit
+        """
+        self.services.upload_bandwidth_limiter.set_rate(max_upload_bandwidth)
+        self.services.download_bandwidth_limiter.set_rate(max_download_bandwidth)
+
     @property
     def cache(self):
         return self.session.cache
@@ -298,6 +385,35 @@ class B2Api(metaclass=B2TraceMeta):
             encryption,
         )
 
+    def open_file_by_id(
+        self,
+        file_id: str,
+        encryption: EncryptionSetting | None = None,
+        block_size: int | None = None,
+        cache_size: int | None = None,
+    ) -> RemoteFileReader:
+        """
+        Open a file with the given ID as a seekable, read-only file-like object.
+
+        Only the blocks of the file which are read are downloaded, so it is suitable
+        for random access to large files.
+
+        :param str file_id: a file ID
+        :param encryption: encryption settings (``None`` if unknown)
+        :param block_size: amount of data retrieved with a single request, in bytes
+        :param cache_size: maximum amount of data kept in memory, in bytes
+        """
+        # not get_file_info(), which returns a dict in apiver v1
+        file_version = self.file_version_factory.from_api_response(
+            self.session.get_file_info_by_id(file_id)
+        )
+        return self.services.download_manager.open_file(
+            file_version,
+            encryption=encryption,
+            block_size=block_size,
+            cache_size=cache_size,
+        )
+
     def update_file_retention(
         self,
         file_id: str,
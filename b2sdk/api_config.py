@@ -13,12 +13,15 @@ from typing import Callable
 
 import requests
 
+from .concurrency_controller import ConcurrencyController
+from .http_metrics import HttpMetricsSink
 from .raw_api import AbstractRawApi, B2RawHTTPApi
 
 
 class B2HttpApiConfig:
 
     DEFAULT_RAW_API_CLASS = B2RawHTTPApi
+    DEFAULT_UPLOAD_BLOCK_SIZE = 1024 * 1024
 
     def __init__(
         self,
@@ -26,7 +29,15 @@ class B2HttpApiConfig:
         install_clock_skew_hook: bool = True,
         user_agent_append: str | None = None,
         _raw_api_class: type[AbstractRawApi] | None = None,
-        decode_content: bool = False
+        decode_content: bool = False,
+        pool_maxsize: int | None = None,
+        pool_connections: int | None = None,
+        pool_block: bool = False,
+        keep_alive_idle: int | None = None,
+        socket_options: list[tuple[int, int, int]] | None = None,
+        metrics_sinks: list[HttpMetricsSink] | None = None,
+        concurrency_controller: ConcurrencyController | None = None,
+        upload_block_size: int | None = DEFAULT_UPLOAD_BLOCK_SIZE,
     ):
         """
         A structure with params to be passed to low level API.
@@ -37,12 +48,49 @@ class B2HttpApiConfig:
         :param _raw_api_class: AbstractRawApi-compliant class
         :param decode_content: If true, the underlying http backend will try to decode encoded files when downloading,
                                based on the response headers
+        :param pool_maxsize: maximum number of connections kept open to a single host; if not set, it is adjusted
+                             by :class:`b2sdk.v2.B2Api` to the number of its transfer threads
+        :param pool_connections: number of hosts for which the connections are kept open
+        :param pool_block: if True, wait for a connection when ``pool_maxsize`` connections to a host are in use,
+                           instead of opening one which is closed after use
+        :param keep_alive_idle: if set, send TCP keep-alive probes on connections idle for this many seconds,
+                                so that idle connections in the pool are not dropped by firewalls and load balancers
+        :param socket_options: additional options (``(level, option, value)`` tuples) set on the sockets of the connections
+        :param metrics_sinks: sinks receiving the metrics of every HTTP request, i.e. :class:`b2sdk.v2.HttpMetricsCollector`
+        :param concurrency_controller: if set, every attempt to send a request waits for its permit, and it limits
+                                       the number of uploads, copies, downloads and other API calls in flight
+                                       (separately) when the server responds that it is overloaded
+        :param upload_block_size: number of bytes of the upload bodies read at once; the ranges of local files
+                                  which are neither hashed nor rate-limited are sent with ``sendfile`` on plain
+                                  TCP connections of the connection pools configured by these options;
+                                  if None, the upload bodies are read in the small blocks of http.client
+
+        The connection pools of the session returned by ``http_session_factory`` are replaced with ones
+        configured by these options. The only exception is when ``decode_content`` is set and none of the
+        connection pool options is set: then the pools of the session are used as they are.
         """
         self.http_session_factory = http_session_factory
         self.install_clock_skew_hook = install_clock_skew_hook
         self.user_agent_append = user_agent_append
         self.raw_api_class = _raw_api_class or self.DEFAULT_RAW_API_CLASS
         self.decode_content = decode_content
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections
+        self.pool_block = pool_block
+        self.keep_alive_idle = keep_alive_idle
+        self.socket_options = socket_options
+        self.metrics_sinks = metrics_sinks or []
+        self.concurrency_controller = concurrency_controller
+        self.upload_block_size = upload_block_size
+
+    def has_connection_pool_options(self) -> bool:
+        """
+        Whether any of the connection pool options was set.
+        """
+        return (
+            self.pool_maxsize is not None or self.pool_connections is not None or self.pool_block or
+            self.keep_alive_idle is not None or bool(self.socket_options)
+        )
 
 
 DEFAULT_HTTP_API_CONFIG = B2HttpApiConfig()
@@ -17,14 +17,16 @@ import logging
 import socket
 import threading
 import time
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager, nullcontext
 from random import random
 from typing import Any
 
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
 
 from .api_config import DEFAULT_HTTP_API_CONFIG, B2HttpApiConfig
+from .concurrency_controller import ConcurrencyController
 from .exception import (
     B2ConnectionError,
     B2Error,
@@ -39,6 +41,13 @@ from .exception import (
     UnknownHost,
     interpret_b2_error,
 )
+from .http_metrics import (
+    TIMED_POOL_CLASSES_BY_SCHEME,
+    HttpMetricsSink,
+    RequestMetrics,
+    connection_timer,
+)
+from .http_upload import UploadBody
 from .requests import NotDecompressingResponse
 from .version import USER_AGENT
 
@@ -73,15 +82,31 @@ def setlocale(name):
 class ResponseContextManager:
     """
     A context manager that closes a requests.Response when done.
+
+    If the response holds a permit of a :class:`b2sdk.v2.ConcurrencyController`, it is released
+    when the response is closed, or at the latest when the context manager is exited.
     """
 
-    def __init__(self, response):
+    def __init__(self, response, permit: ExitStack | None = None):
         self.response = response
+        self.permit = permit
+        if permit is not None:
+            close = response.close
+
+            def close_and_release_permit():
+                try:
+                    close()
+                finally:
+                    permit.close()
+
+            response.close = close_and_release_permit
 
     def __enter__(self):
         return self.response
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.permit is not None:
+            self.permit.close()
         return None
 
 
@@ -156,6 +181,21 @@ class ClockSkewHook(HttpCallback):
             raise ClockSkew(skew_seconds)
 
 
+class ConcurrencyControllerHook(HttpCallback):
+    """
+    Report the responses to a :class:`b2sdk.v2.ConcurrencyController`, so that it can adjust
+    the number of transfers in flight when the server is overloaded.
+    """
+
+    def __init__(self, concurrency_controller: ConcurrencyController):
+        self.concurrency_controller = concurrency_controller
+
+    def post_request(self, method, url, headers, response):
+        self.concurrency_controller.record_response(
+            self.concurrency_controller.classify_url(url), response.status_code
+        )
+
+
 class B2Http:
     """
     A wrapper for the requests module.  Provides the operations
@@ -199,12 +239,55 @@ class B2Http:
         """
         self.user_agent = self._get_user_agent(api_config.user_agent_append)
         self.session = api_config.http_session_factory()
+        self._api_config = api_config
+        self._adapter_class = None
         if not api_config.decode_content:
-            self.session.adapters.clear()
-            self.session.mount('', NotDecompressingHTTPAdapter())
+            self._adapter_class = NotDecompressingHTTPAdapter
+        elif api_config.has_connection_pool_options():
+            self._adapter_class = SocketOptionsHTTPAdapter
+        if self._adapter_class is not None:
+            self._mount_adapter(api_config.pool_maxsize or DEFAULT_POOLSIZE)
         self.callbacks = []
+        self.metrics_sinks = list(api_config.metrics_sinks)
         if api_config.install_clock_skew_hook:
             self.add_callback(ClockSkewHook())
+        if api_config.concurrency_controller is not None:
+            self.add_callback(ConcurrencyControllerHook(api_config.concurrency_controller))
+
+    def set_pool_maxsize(self, pool_maxsize: int):
+        """
+        Adjust the maximum number of connections kept open to a single host, unless it was set
+        in :class:`b2sdk.v2.B2HttpApiConfig` (or the connection pools are not managed by B2Http).
+
+        :param pool_maxsize: maximum number of connections kept open to a single host
+        """
+        if self._adapter_class is None or self._api_config.pool_maxsize is not None:
+            return
+        self._mount_adapter(max(pool_maxsize, DEFAULT_POOLSIZE))
+
+    def _mount_adapter(self, pool_maxsize: int):
+        api_config = self._api_config
+        socket_options = None
+        if api_config.keep_alive_idle is not None or api_config.socket_options:
+            socket_options = list(HTTPConnection.default_socket_options)
+            if api_config.keep_alive_idle is not None:
+                socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+                if hasattr(socket, 'TCP_KEEPIDLE'):  # not available on macOS and Windows
+                    socket_options.append(
+                        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, api_config.keep_alive_idle)
+                    )
+            socket_options.extend(api_config.socket_options or ())
+        logger.debug('using connection pools of %i connections per host', pool_maxsize)
+        self.session.adapters.clear()
+        self.session.mount(
+            '',
+            self._adapter_class(
+                pool_connections=api_config.pool_connections or DEFAULT_POOLSIZE,
+                pool_maxsize=pool_maxsize,
+                pool_block=api_config.pool_block or DEFAULT_POOLBLOCK,
+                socket_options=socket_options,
+            )
+        )
 
     def add_callback(self, callback):
         """
@@ -215,6 +298,14 @@ class B2Http:
         """
         self.callbacks.append(callback)
 
+    def add_metrics_sink(self, sink: HttpMetricsSink):
+        """
+        Add a sink receiving the metrics of every request.
+
+        :param sink: a sink to be added
+        """
+        self.metrics_sinks.append(sink)
+
     def post_content_return_json(
         self,
         url,
@@ -247,18 +338,19 @@ class B2Http:
         # rewind the data back to the beginning.
         def do_post():
             data.seek(0)
-            self._run_pre_request_hooks('POST', url, request_headers)
-            response = self.session.post(
-                url,
-                headers=request_headers,
-                data=data,
-                timeout=(self.CONNECTION_TIMEOUT, _timeout or self.TIMEOUT_FOR_UPLOAD),
-            )
-            self._run_post_request_hooks('POST', url, request_headers, response)
+            with self._permit(url):
+                self._run_pre_request_hooks('POST', url, request_headers)
+                response = self.session.post(
+                    url,
+                    headers=request_headers,
+                    data=self._get_upload_body(data),
+                    timeout=(self.CONNECTION_TIMEOUT, _timeout or self.TIMEOUT_FOR_UPLOAD),
+                )
+                self._run_post_request_hooks('POST', url, request_headers, response)
             return response
 
         try:
-            response = self._translate_and_retry(do_post, try_count, post_params)
+            response = self._retry_request('POST', url, do_post, try_count, post_params)
         except B2RequestTimeout:
             # this forces a token refresh, which is necessary if request is still alive
             # on the server but has terminated for some reason on the client. See #79
@@ -273,6 +365,23 @@ class B2Http:
         finally:
             response.close()
 
+    def _get_upload_body(self, data):
+        """
+        Wrap the data of a POST in an :class:`b2sdk.http_upload.UploadBody` sending it in large blocks,
+        unless the data has no length (like the JSON parameters of the API calls) or it is disabled.
+        """
+        block_size = self._api_config.upload_block_size
+        try:
+            length = len(data)
+        except TypeError:
+            return data
+        if not block_size or not length:
+            return data
+        # the file ranges can only be sent by the connections of the adapters mounted by B2Http
+        return UploadBody(
+            data, length, block_size, send_file_ranges=self._adapter_class is not None
+        )
+
     def post_json_return_json(self, url, headers, params, try_count: int = TRY_COUNT_OTHER):
         """
         Use like this:
@@ -333,21 +442,29 @@ class B2Http:
         :return: Context manager that returns an object that supports iter_content()
         """
         request_headers = {**headers, 'User-Agent': self.user_agent}
+        held_permit = None
 
         # Do the HTTP GET.
         def do_get():
-            self._run_pre_request_hooks('GET', url, request_headers)
-            response = self.session.get(
-                url,
-                headers=request_headers,
-                stream=True,
-                timeout=(self.CONNECTION_TIMEOUT, self.TIMEOUT),
-            )
-            self._run_post_request_hooks('GET', url, request_headers, response)
+            nonlocal held_permit
+            with ExitStack() as permit:
+                permit.enter_context(self._permit(url))
+                self._run_pre_request_hooks('GET', url, request_headers)
+                response = self.session.get(
+                    url,
+                    headers=request_headers,
+                    stream=True,
+                    timeout=(self.CONNECTION_TIMEOUT, self.TIMEOUT),
+                )
+                self._run_post_request_hooks('GET', url, request_headers, response)
+                if self._api_config.concurrency_controller is not None and \
+                        response.status_code in (200, 206):
+                    # the content is still to be read, so the permit is held until the response is closed
+                    held_permit = permit.pop_all()
             return response
 
-        response = self._translate_and_retry(do_get, try_count, None)
-        return ResponseContextManager(response)
+        response = self._retry_request('GET', url, do_get, try_count)
+        return ResponseContextManager(response, held_permit)
 
     def head_content(
         self,
@@ -382,17 +499,18 @@ class B2Http:
 
         # Do the HTTP HEAD.
         def do_head():
-            self._run_pre_request_hooks('HEAD', url, request_headers)
-            response = self.session.head(
-                url,
-                headers=request_headers,
-                stream=True,
-                timeout=(self.CONNECTION_TIMEOUT, self.TIMEOUT),
-            )
-            self._run_post_request_hooks('HEAD', url, request_headers, response)
+            with self._permit(url):
+                self._run_pre_request_hooks('HEAD', url, request_headers)
+                response = self.session.head(
+                    url,
+                    headers=request_headers,
+                    stream=True,
+                    timeout=(self.CONNECTION_TIMEOUT, self.TIMEOUT),
+                )
+                self._run_post_request_hooks('HEAD', url, request_headers, response)
             return response
 
-        return self._translate_and_retry(do_head, try_count, None)
+        return self._retry_request('HEAD', url, do_head, try_count)
 
     @classmethod
     def _get_user_agent(cls, user_agent_append):
@@ -400,6 +518,16 @@ class B2Http:
             return f'{USER_AGENT} {user_agent_append}'
         return USER_AGENT
 
+    def _permit(self, url):
+        """
+        Return a context manager holding a permit of the concurrency controller (if there is one)
+        during a single attempt to send a request, so that no permit is held while waiting before a retry.
+        """
+        concurrency_controller = self._api_config.concurrency_controller
+        if concurrency_controller is None:
+            return nullcontext()
+        return concurrency_controller.permit(concurrency_controller.classify_url(url))
+
     def _run_pre_request_hooks(self, method, url, headers):
         for callback in self.callbacks:
             callback.pre_request(method, url, headers)
@@ -408,6 +536,40 @@ class B2Http:
         for callback in self.callbacks:
             callback.post_request(method, url, headers, response)
 
+    def _retry_request(self, method, url, fcn, try_count, post_params=None):
+        """
+        Call fcn with retries, like :meth:`_translate_and_retry`, and pass the metrics
+        of the request to the metrics sinks (if there are any).
+        """
+        if not self.metrics_sinks:
+            return self._translate_and_retry(fcn, try_count, post_params)
+
+        metrics = RequestMetrics.from_url(method, url)
+        connection_times_measured = self._adapter_class is not None
+
+        def measured_fcn():
+            metrics.tries += 1
+            connection_timer.reset()
+            try:
+                response = fcn()
+            finally:
+                metrics.add_connection_times(connection_timer)
+            metrics.set_response(response)
+            if connection_times_measured:
+                metrics.connection_reused = connection_timer.connections == 0
+            return response
+
+        start = time.perf_counter()
+        try:
+            return self._translate_and_retry(measured_fcn, try_count, post_params, metrics)
+        except Exception:
+            metrics.failed = True
+            raise
+        finally:
+            metrics.duration = time.perf_counter() - start
+            for sink in self.metrics_sinks:
+                sink.record(metrics)
+
     @classmethod
     def _translate_errors(cls, fcn, post_params=None):
         """
@@ -505,13 +667,16 @@ class B2Http:
             raise UnknownError(text)
 
     @classmethod
-    def _translate_and_retry(cls, fcn, try_count, post_params=None):
+    def _translate_and_retry(
+        cls, fcn, try_count, post_params=None, metrics: RequestMetrics | None = None
+    ):
         """
         Try calling fcn try_count times, retrying only if
         the exception is a retryable B2Error.
 
         :param int try_count: a number of retries
         :param dict post_params: request parameters
+        :param metrics: metrics of the request, to which the time spent waiting before the retries is added
         """
         # For all but the last try, catch the exception.
         wait_time = 1.0
@@ -536,6 +701,8 @@ class B2Http:
                     sleep_reason,
                 )
                 time.sleep(sleep_duration)
+                if metrics is not None:
+                    metrics.retry_sleep_time += sleep_duration
 
                 # Set up wait time for the next iteration
                 wait_time *= 1.5
@@ -548,7 +715,25 @@ class B2Http:
         return cls._translate_errors(fcn, post_params)
 
 
-class NotDecompressingHTTPAdapter(HTTPAdapter):
+class SocketOptionsHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter which sets the given options on the sockets of its connections,
+    and measures the time spent on opening them (see :class:`b2sdk.v2.RequestMetrics`).
+    """
+
+    def __init__(self, *args, socket_options: list[tuple[int, int, int]] | None = None, **kwargs):
+        # set before calling super().__init__(), which initializes the pool manager
+        self.socket_options = socket_options
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES_BY_SCHEME
+
+
+class NotDecompressingHTTPAdapter(SocketOptionsHTTPAdapter):
     """
     HTTP adapter that uses :class:`b2sdk.requests.NotDecompressingResponse` instead of the default
     :code:`requests.Response` class.
@@ -11,10 +11,12 @@ from __future__ import annotations
 
 import datetime as dt
 import fnmatch
+import functools
 import logging
 import pathlib
-from contextlib import suppress
-from typing import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, suppress
+from typing import Iterable, Iterator, Sequence
 
 from .encryption.setting import EncryptionSetting, EncryptionSettingFactory
 from .encryption.types import EncryptionMode
@@ -36,6 +38,7 @@ from .file_lock import (
 from .file_version import DownloadVersion, FileVersion
 from .filter import Filter, FilterMatcher
 from .http_constants import LIST_FILE_NAMES_MAX_LIMIT
+from .page_prefetcher import PagePrefetcher
 from .progress import AbstractProgressListener, DoNothingProgressListener
 from .raw_api import LifecycleRule
 from .replication.setting import ReplicationConfiguration, ReplicationConfigurationFactory
@@ -44,7 +47,12 @@ from .transfer.emerge.unbound_write_intent import UnboundWriteIntentGenerator
 from .transfer.emerge.write_intent import WriteIntent
 from .transfer.inbound.downloaded_file import DownloadedFile
 from .transfer.outbound.copy_source import CopySource
-from .transfer.outbound.upload_source import UploadMode, UploadSourceBytes, UploadSourceLocalFile
+from .transfer.outbound.upload_source import (
+    AbstractUploadSource,
+    UploadMode,
+    UploadSourceBytes,
+    UploadSourceLocalFile,
+)
 from .utils import (
     B2TraceMeta,
     Sha1HexDigest,
@@ -63,6 +71,16 @@ class Bucket(metaclass=B2TraceMeta):
     """
 
     DEFAULT_CONTENT_TYPE = AUTO_CONTENT_TYPE
+    DEFAULT_LIST_PARTITIONS = 8
+    DEFAULT_LIST_PREFETCH_PAGES = 2
+    # maximum number of pages ls_parallel fetches at the same time, for all the ranges together
+    DEFAULT_LIST_MAX_WORKERS = 4
+    # number of file names ls_parallel keeps in memory ahead of the consumer, shared by all the ranges
+    DEFAULT_LIST_PREFETCH_BUDGET = 32 * LIST_FILE_NAMES_MAX_LIMIT
+    # the top-level "folders" splitting ls_parallel into ranges are looked for with
+    # at most this many requests, of this many file names each
+    LIST_PARTITION_DISCOVERY_REQUESTS = 32
+    LIST_PARTITION_DISCOVERY_FETCH_COUNT = 100
 
     def __init__(
         self,
@@ -372,6 +390,7 @@ class Bucket(metaclass=B2TraceMeta):
         fetch_count: int | None = LIST_FILE_NAMES_MAX_LIMIT,
         with_wildcard: bool = False,
         filters: Sequence[Filter] = (),
+        prefetch_pages: int | None = None,
     ):
         """
         Pretend that folders exist and yields the information about the files in a folder.
@@ -394,6 +413,10 @@ class Bucket(metaclass=B2TraceMeta):
                               As of 1.19.0 it can only be enabled when recursive is also enabled.
                               Also, in this mode, folder_to_list is considered to be a filename or a pattern.
         :param filters: list of filters to apply to the files returned by the server.
+        :param prefetch_pages: how many pages of the listing to fetch in the background, ahead of the ones
+                               being consumed, or ``None`` to fetch the pages one after another.
+                               In non-recursive mode, the pages prefetched while listing a folder are discarded
+                               when the listing skips ahead past that folder.
         :rtype: generator[tuple[b2sdk.v2.FileVersion, str]]
         :returns: generator of (file_version, folder_name) tuples
 
@@ -453,65 +476,208 @@ class Bucket(metaclass=B2TraceMeta):
         current_dir = None
         start_file_name = prefix
         start_file_id = None
-        session = self.api.session
-        while True:
-            if latest_only:
-                response = session.list_file_names(self.id_, start_file_name, fetch_count, prefix)
-            else:
-                response = session.list_file_versions(
-                    self.id_, start_file_name, start_file_id, fetch_count, prefix
-                )
-            for entry in response['files']:
-                file_version = self.api.file_version_factory.from_api_response(entry)
-                if not file_version.file_name.startswith(prefix):
-                    # We're past the files we care about
+        fetch_page = functools.partial(self._list_page, latest_only, fetch_count, prefix)
+        with PagePrefetcher(fetch_page, self._next_page_cursor, prefetch_pages or 0) as pages:
+            while True:
+                response = pages.get((start_file_name, start_file_id))
+                for entry in response['files']:
+                    file_version = self.api.file_version_factory.from_api_response(entry)
+                    if not file_version.file_name.startswith(prefix):
+                        # We're past the files we care about
+                        return
+                    if with_wildcard and not fnmatch.fnmatchcase(
+                        file_version.file_name, folder_to_list
+                    ):
+                        # File doesn't match our wildcard rules
+                        continue
+
+                    if not filter_matcher.match(file_version.file_name):
+                        continue
+
+                    after_prefix = file_version.file_name[len(prefix):]
+                    # In case of wildcards, we don't care about folders at all, and it's recursive by default.
+                    if '/' not in after_prefix or recursive:
+                        # This is not a folder, so we'll print it out and
+                        # continue on.
+                        yield file_version, None
+                        current_dir = None
+                    else:
+                        # This is a folder.  If it's different than the folder
+                        # we're already in, then we can print it.  This check
+                        # is needed, because all of the files in the folder
+                        # will be in the list.
+                        folder_with_slash = after_prefix.split('/')[0] + '/'
+                        if folder_with_slash != current_dir:
+                            folder_name = prefix + folder_with_slash
+                            yield file_version, folder_name
+                            current_dir = folder_with_slash
+                if response['nextFileName'] is None:
+                    # The response says there are no more files in the bucket,
+                    # so we can stop.
                     return
-                if with_wildcard and not fnmatch.fnmatchcase(
-                    file_version.file_name, folder_to_list
-                ):
-                    # File doesn't match our wildcard rules
-                    continue
-
-                if not filter_matcher.match(file_version.file_name):
-                    continue
 
-                after_prefix = file_version.file_name[len(prefix):]
-                # In case of wildcards, we don't care about folders at all, and it's recursive by default.
-                if '/' not in after_prefix or recursive:
-                    # This is not a folder, so we'll print it out and
-                    # continue on.
-                    yield file_version, None
-                    current_dir = None
+                # Now we need to set up the next search.  The response from
+                # B2 has the starting point to continue with the next file,
+                # but if we're in the middle of a "folder", we can skip ahead
+                # to the end of the folder.  The character after '/' is '0',
+                # so we'll replace the '/' with a '0' and start there.
+                #
+                # When recursive is True, current_dir is always None.
+                if current_dir is None:
+                    start_file_name = response.get('nextFileName')
+                    start_file_id = response.get('nextFileId')
                 else:
-                    # This is a folder.  If it's different than the folder
-                    # we're already in, then we can print it.  This check
-                    # is needed, because all of the files in the folder
-                    # will be in the list.
-                    folder_with_slash = after_prefix.split('/')[0] + '/'
-                    if folder_with_slash != current_dir:
-                        folder_name = prefix + folder_with_slash
-                        yield file_version, folder_name
-                        current_dir = folder_with_slash
-            if response['nextFileName'] is None:
-                # The response says there are no more files in the bucket,
-                # so we can stop.
-                return
+                    start_file_name = max(
+                        response['nextFileName'],
+                        prefix + current_dir[:-1] + '0',
+                    )
 
-            # Now we need to set up the next search.  The response from
-            # B2 has the starting point to continue with the next file,
-            # but if we're in the middle of a "folder", we can skip ahead
-            # to the end of the folder.  The character after '/' is '0',
-            # so we'll replace the '/' with a '0' and start there.
-            #
-            # When recursive is True, current_dir is always None.
-            if current_dir is None:
-                start_file_name = response.get('nextFileName')
-                start_file_id = response.get('nextFileId')
-            else:
-                start_file_name = max(
-                    response['nextFileName'],
-                    prefix + current_dir[:-1] + '0',
-                )
+    def ls_parallel(
+        self,
+        folder_to_list: str = '',
+        latest_only: bool = True,
+        fetch_count: int | None = LIST_FILE_NAMES_MAX_LIMIT,
+        filters: Sequence[Filter] = (),
+        partitions: int | None = None,
+        prefetch_pages: int | None = None,
+        max_workers: int | None = None,
+    ):
+        """
+        List all of the files in a folder and all of its sub-folders, like :meth:`ls` with ``recursive=True``,
+        but list several ranges of file names at the same time.
+
+        First, the top-level "folders" of ``folder_to_list`` are looked for with a bounded number of small requests,
+        and the file names are split at their boundaries into at most ``partitions`` disjoint ranges
+        (the names the search did not reach are the last range). Then all of the ranges are fetched
+        in the background, sharing a pool of at most ``max_workers`` threads, and the files are yielded
+        in the same order as :meth:`ls` yields them.
+        Every range fetches its pages ahead of the consumer until it holds its share of a memory budget,
+        so the ranges which are not consumed yet keep listing while an earlier one is consumed.
+        If no "folders" are found, the folder is listed as a single range.
+
+        :param folder_to_list: the name of the folder to list; must not start with "/".
+                               Empty string means top-level folder
+        :param latest_only: when ``False`` returns info about all versions of a file,
+                            when ``True``, just returns info about the most recent versions
+        :param fetch_count: how many entries to list per API call or ``None`` to use the default. Acceptable values: 1 - 10000
+        :param filters: list of filters to apply to the files returned by the server.
+        :param partitions: maximum number of ranges listed at the same time or ``None`` to use the default
+        :param prefetch_pages: how many pages of every range to fetch ahead of the ones being consumed
+                               or ``None`` to share ``DEFAULT_LIST_PREFETCH_BUDGET`` file names between the ranges
+        :param max_workers: maximum number of pages fetched at the same time
+                            or ``None`` to use ``DEFAULT_LIST_MAX_WORKERS``
+        :rtype: generator[tuple[b2sdk.v2.FileVersion, None]]
+        :returns: generator of (file_version, None) tuples
+        """
+        prefix = folder_to_list
+        if prefix != '' and not prefix.endswith('/'):
+            prefix += '/'
+        boundaries = self._list_partition_boundaries(
+            prefix, partitions or self.DEFAULT_LIST_PARTITIONS
+        )
+        ranges = list(zip([prefix] + boundaries, boundaries + [None]))
+        if prefetch_pages is None:
+            prefetch_pages = max(
+                self.DEFAULT_LIST_PREFETCH_PAGES,
+                self.DEFAULT_LIST_PREFETCH_BUDGET //
+                (len(ranges) * (fetch_count or LIST_FILE_NAMES_MAX_LIMIT)),
+            )
+        fetch_page = functools.partial(self._list_page, latest_only, fetch_count, prefix)
+        filter_matcher = FilterMatcher(filters)
+        with ExitStack() as stack:
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers or self.DEFAULT_LIST_MAX_WORKERS,
+                thread_name_prefix='b2sdk-list',
+            )
+            # the fetches still running when the listing is abandoned are not waited for
+            stack.callback(executor.shutdown, wait=False)
+            listings = []
+            for start, end in ranges:
+                next_cursor = functools.partial(self._next_page_cursor, end=end)
+                pages = PagePrefetcher(fetch_page, next_cursor, prefetch_pages, executor)
+                stack.enter_context(pages)
+                pages.start((start, None))
+                listings.append((start, end, next_cursor, pages))
+
+            for start, end, next_cursor, pages in listings:
+                cursor = (start, None)
+                while cursor is not None:
+                    response = pages.get(cursor)
+                    for entry in response['files']:
+                        file_version = self.api.file_version_factory.from_api_response(entry)
+                        if not file_version.file_name.startswith(prefix):
+                            # We're past the files we care about
+                            return
+                        if end is not None and file_version.file_name >= end:
+                            # The rest of the page belongs to the next range
+                            break
+                        if filter_matcher.match(file_version.file_name):
+                            yield file_version, None
+                    cursor = next_cursor(response)
+                pages.close()
+
+    def _list_partition_boundaries(self, prefix, partitions):
+        """
+        Return the names at which the listing of the given folder can be split into ranges
+        of similar number of top-level "folders", or an empty list if it should not be split.
+
+        The "folders" are found by skipping from one to the next, with at most ``LIST_PARTITION_DISCOVERY_REQUESTS``
+        requests, so that the files are not all listed twice. If the requests do not reach the end of the folder,
+        the names which were not reached are the last range.
+        """
+        if partitions < 2:
+            return []
+        folders = []
+        start_file_name = prefix
+        for _ in range(self.LIST_PARTITION_DISCOVERY_REQUESTS):
+            response = self.api.session.list_file_names(
+                self.id_, start_file_name, self.LIST_PARTITION_DISCOVERY_FETCH_COUNT, prefix
+            )
+            for entry in response['files']:
+                after_prefix = entry['fileName'][len(prefix):]
+                if '/' in after_prefix:
+                    folder_name = prefix + after_prefix.split('/')[0] + '/'
+                    if not folders or folders[-1] != folder_name:
+                        folders.append(folder_name)
+            start_file_name = response['nextFileName']
+            if start_file_name is None:
+                break
+            if folders and start_file_name.startswith(folders[-1]):
+                # skip the rest of the files in the folder; '0' is the character after '/'
+                start_file_name = folders[-1][:-1] + '0'
+        if not folders:
+            # a listing split at the point where the search stopped would list the same files twice
+            return []
+        # the names which were not reached are listed as one more range
+        folder_partitions = partitions if start_file_name is None else partitions - 1
+        if len(folders) < folder_partitions:
+            boundaries = folders
+        else:
+            boundaries = sorted(
+                {
+                    folders[len(folders) * i // folder_partitions]
+                    for i in range(1, folder_partitions)
+                }
+            )
+        if start_file_name is not None:
+            boundaries.append(start_file_name)
+        return boundaries
+
+    def _list_page(self, latest_only, fetch_count, prefix, cursor):
+        start_file_name, start_file_id = cursor
+        session = self.api.session
+        if latest_only:
+            return session.list_file_names(self.id_, start_file_name, fetch_count, prefix)
+        return session.list_file_versions(
+            self.id_, start_file_name, start_file_id, fetch_count, prefix
+        )
+
+    @classmethod
+    def _next_page_cursor(cls, response, end=None):
+        next_file_name = response['nextFileName']
+        if next_file_name is None or (end is not None and next_file_name >= end):
+            return None
+        return next_file_name, response.get('nextFileId')
 
     def list_unfinished_large_files(self, start_file_id=None, batch_size=None, prefix=None):
         """
@@ -921,6 +1087,53 @@ class Bucket(metaclass=B2TraceMeta):
             content_language=content_language,
         )
 
+    def upload_small_files(
+        self,
+        uploads: Iterable[tuple[AbstractUploadSource, str]],
+        content_type: str | None = None,
+        file_info: dict | None = None,
+        encryption: EncryptionSetting | None = None,
+        file_retention: FileRetentionSetting | None = None,
+        legal_hold: LegalHold | None = None,
+        max_in_flight: int | None = None,
+    ) -> Iterator[tuple[str, FileVersion | Exception]]:
+        """
+        Upload many small files, overlapping hashing and uploading of multiple files.
+
+        This is much faster than calling :meth:`upload` for every file when there are a lot of small files,
+        since the time spent waiting for the server is not multiplied by the number of files. Every source
+        is uploaded as a single file, so the sources must not be bigger than the maximum size of a part.
+
+        Results are yielded in the order in which the uploads finish. A failed upload does not stop the others -
+        the exception is yielded instead of the file version.
+
+        :param uploads: an iterable of (upload source, file name) pairs; it is consumed lazily,
+                        so it can be a generator producing millions of files
+        :param str,None content_type: the MIME type of all the files, or ``None`` to accept the default based on file extension of the B2 file name
+        :param dict,None file_info: a file info to store with every file or ``None`` to not store anything
+        :param b2sdk.v2.EncryptionSetting encryption: encryption settings (``None`` if unknown)
+        :param b2sdk.v2.FileRetentionSetting file_retention: file retention setting
+        :param bool legal_hold: legal hold setting
+        :param int,None max_in_flight: maximum number of simultaneous uploads, or ``None`` to use the size of the upload thread pool
+        :return: an iterator of (file name, :class:`b2sdk.v2.FileVersion` or exception) pairs
+        """
+
+        def validated_uploads():
+            for upload_source, file_name in uploads:
+                validate_b2_file_name(file_name)
+                yield upload_source, file_name
+
+        return self.api.services.upload_manager.upload_small_files(
+            self.id_,
+            validated_uploads(),
+            content_type or AUTO_CONTENT_TYPE,
+            file_info or {},
+            encryption=encryption,
+            file_retention=file_retention,
+            legal_hold=legal_hold,
+            max_in_flight=max_in_flight,
+        )
+
     def create_file(
         self,
         write_intents,
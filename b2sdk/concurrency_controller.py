@@ -0,0 +1,168 @@
+######################################################################
+#
+# File: b2sdk/concurrency_controller.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum, unique
+
+logger = logging.getLogger(__name__)
+
+
+@unique
+class RequestClass(Enum):
+    API = 'api'
+    UPLOAD = 'upload'
+    COPY = 'copy'
+    DOWNLOAD = 'download'
+
+
+class AimdConcurrencyLimiter:
+    """
+    Limit the number of requests in flight, adjusting the limit with the AIMD
+    (additive increase, multiplicative decrease) algorithm:
+
+    * when the server signals it is overloaded, the limit is multiplied by ``DECREASE_FACTOR``
+      (at most once per ``DECREASE_INTERVAL``, since all the requests in flight are likely to fail together),
+    * when the requests succeed while the limit is reached, it is increased by one per ``limit`` successful requests.
+
+    Until the first overload signal there is no limit, and the first limit is based
+    on the number of requests in flight at the time.
+
+    .. note:
+        This class is thread-safe.
+    """
+
+    DECREASE_FACTOR = 0.5
+    DECREASE_INTERVAL = 1.0  # seconds
+
+    def __init__(self, min_limit: int = 1, max_limit: int | None = None):
+        """
+        :param min_limit: the limit is never decreased below this number of requests
+        :param max_limit: the limit is never increased above this number of requests
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit: float | None = None  #: current limit, ``None`` if there is none
+        self.in_flight = 0  #: number of requests holding a permit
+        self._condition = threading.Condition()
+        self._last_decrease = None
+
+    def acquire(self):
+        """
+        Wait until a request can be sent.
+        """
+        with self._condition:
+            while self.limit is not None and self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def permit(self):
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_overloaded(self):
+        """
+        Decrease the limit after the server responded that it is overloaded.
+        """
+        now = time.monotonic()
+        with self._condition:
+            if self._last_decrease is not None and now - self._last_decrease < self.DECREASE_INTERVAL:
+                return
+            self._last_decrease = now
+            current_limit = self.limit
+            if current_limit is None:
+                current_limit = max(self.in_flight, self.min_limit)
+            self.limit = max(self.min_limit, current_limit * self.DECREASE_FACTOR)
+            logger.info('server overloaded, decreasing concurrency limit to %i', self.limit)
+
+    def on_success(self):
+        """
+        Increase the limit after a request succeeded, if the limit was reached.
+        """
+        with self._condition:
+            if self.limit is None or self.in_flight < int(self.limit):
+                return
+            if self.max_limit is not None and self.limit >= self.max_limit:
+                return
+            previous_limit = int(self.limit)
+            self.limit += 1 / self.limit
+            if int(self.limit) > previous_limit:
+                self._condition.notify()
+
+
+class ConcurrencyController:
+    """
+    Limit the number of requests in flight, separately for each class of requests,
+    reacting to the server responding that it is overloaded (HTTP 429 and 5xx).
+
+    A single controller can be shared by all the :class:`b2sdk.v2.B2Api` objects of an account,
+    by passing it in :class:`b2sdk.v2.B2HttpApiConfig`: the HTTP layer reports the responses to it,
+    and every attempt to send a request waits for its permit.  The permits are not held while
+    waiting before a retry, so the limit also slows down the requests which are being retried.
+    """
+
+    LIMITER_CLASS = staticmethod(AimdConcurrencyLimiter)
+
+    def __init__(self, min_limit: int = 1, max_limit: int | None = None):
+        """
+        :param min_limit: minimum number of requests of a class in flight
+        :param max_limit: maximum number of requests of a class in flight, unlimited by default
+        """
+        self.limiters = {
+            request_class: self.LIMITER_CLASS(min_limit=min_limit, max_limit=max_limit)
+            for request_class in RequestClass
+        }
+
+    @classmethod
+    def classify_url(cls, url: str) -> RequestClass:
+        if '/b2_upload_file/' in url or '/b2_upload_part/' in url:
+            return RequestClass.UPLOAD
+        if '/b2_copy_file' in url or '/b2_copy_part' in url:
+            return RequestClass.COPY
+        if '/file/' in url or '/b2_download_file_by_id' in url:
+            return RequestClass.DOWNLOAD
+        return RequestClass.API
+
+    def permit(self, request_class: RequestClass):
+        """
+        Return a context manager waiting for a permit to send a request, and releasing it at exit.
+        """
+        return self.limiters[request_class].permit()
+
+    def record_response(self, request_class: RequestClass, status_code: int):
+        """
+        Adjust the limit of the request class to the response of the server.
+
+        :param request_class: class of the request
+        :param status_code: HTTP status of the response
+        """
+        limiter = self.limiters[request_class]
+        if status_code == 429 or status_code >= 500:
+            limiter.on_overloaded()
+        elif status_code < 400:
+            limiter.on_success()
+
+    def get_limits(self) -> dict[RequestClass, float | None]:
+        """
+        Return the current limits (``None`` if there is none) of the request classes.
+        """
+        return {request_class: limiter.limit for request_class, limiter in self.limiters.items()}
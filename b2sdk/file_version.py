@@ -26,6 +26,7 @@ from .utils.range_ import Range
 if TYPE_CHECKING:
     from .api import B2Api
     from .transfer.inbound.downloaded_file import DownloadedFile
+    from .transfer.inbound.remote_file import RemoteFileReader
 
 UNVERIFIED_CHECKSUM_PREFIX = 'unverified:'
 
@@ -193,6 +194,20 @@ class BaseFileVersion:
         )
         return self._clone(file_retention=file_retention)
 
+    def open(
+        self,
+        encryption: EncryptionSetting | None = None,
+        block_size: int | None = None,
+        cache_size: int | None = None,
+    ) -> RemoteFileReader:
+        """Open this file version as a seekable, read-only file-like object, which downloads only the parts that are read."""
+        return self.api.services.download_manager.open_file(
+            self,
+            encryption=encryption,
+            block_size=block_size,
+            cache_size=cache_size,
+        )
+
     def _type(self):
         """
         FOR TEST PURPOSES ONLY
@@ -0,0 +1,222 @@
+######################################################################
+#
+# File: b2sdk/http_metrics.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .http_upload import FileRangeSendingMixin
+
+
+@dataclass
+class RequestMetrics:
+    """
+    Metrics of a single request made by :class:`b2sdk.v2.B2Http`, including all of its retries.
+
+    The connection times are only measured for the connection pools managed by B2Http
+    (see :class:`b2sdk.v2.B2HttpApiConfig`).
+    """
+
+    api_name: str  #: name of the B2 API called, i.e. ``b2_upload_file``
+    method: str  #: HTTP method
+    host: str  #: host the request was sent to
+    status_code: int | None = None  #: HTTP status of the last try, if a response was received
+    failed: bool = False  #: whether the request failed (after all of the retries)
+    tries: int = 0  #: number of times the request was sent
+    retry_sleep_time: float = 0.0  #: time spent waiting before the retries, in seconds
+    duration: float = 0.0  #: total time of the request, including the retries, in seconds
+    new_connections: int = 0  #: number of connections opened for the request
+    connection_reused: bool | None = None  #: whether the last try reused a connection from the pool
+    connect_time: float = 0.0  #: time spent on DNS resolution and TCP connect, in seconds
+    tls_time: float = 0.0  #: time spent on TLS handshakes, in seconds
+    time_to_first_byte: float = 0.0  #: time from sending the last try until its response headers arrived
+    bytes_sent: int = 0  #: size of the request body of the last try
+    bytes_received: int = 0  #: size of the response body of the last try, as declared by the server
+
+    @classmethod
+    def from_url(cls, method: str, url: str) -> RequestMetrics:
+        parts = urlsplit(url)
+        return cls(api_name=cls._get_api_name(parts.path), method=method, host=parts.hostname or '')
+
+    @classmethod
+    def _get_api_name(cls, path: str) -> str:
+        _, b2api, name = path.partition('/b2api/')
+        if b2api:
+            # /b2api/v3/b2_upload_file/... -> b2_upload_file
+            return name.split('/')[1] if '/' in name else name
+        if path.startswith('/file/'):
+            return 'download_file_by_name'
+        return 'other'
+
+    def add_connection_times(self, timer: ConnectionTimer):
+        self.new_connections += timer.connections
+        self.connect_time += timer.connect_time
+        self.tls_time += timer.tls_time
+
+    def set_response(self, response):
+        self.status_code = response.status_code
+        self.time_to_first_byte = response.elapsed.total_seconds()
+        self.bytes_sent = int(response.request.headers.get('Content-Length') or 0)
+        self.bytes_received = int(response.headers.get('Content-Length') or 0)
+
+
+class HttpMetricsSink:
+    """
+    A sink of request metrics that does nothing.  Override ``record`` to export them.
+
+    Sinks are called by the threads making the requests, so they have to be thread-safe.
+    """
+
+    def record(self, metrics: RequestMetrics):
+        """
+        Called after a request is done (successfully or not).
+        Should not raise an exception.
+
+        :param metrics: metrics of the request
+        """
+
+
+class HttpMetricsCollector(HttpMetricsSink):
+    """
+    Aggregate request metrics per API name and host.
+
+    Use like this:
+
+    .. code-block:: python
+
+       collector = HttpMetricsCollector()
+       api = B2Api(info, api_config=B2HttpApiConfig(metrics_sinks=[collector]))
+       ...
+       for api_name, hosts in collector.snapshot().items():
+           for host, counters in hosts.items():
+               print(api_name, host, counters['requests'], counters['retry_sleep_time'])
+    """
+
+    COUNTERS = (
+        'requests',
+        'failures',
+        'tries',
+        'retry_sleep_time',
+        'duration',
+        'new_connections',
+        'reused_connections',
+        'connect_time',
+        'tls_time',
+        'time_to_first_byte',
+        'bytes_sent',
+        'bytes_received',
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(self._new_counters)
+
+    @classmethod
+    def _new_counters(cls):
+        return dict.fromkeys(cls.COUNTERS, 0)
+
+    def record(self, metrics: RequestMetrics):
+        with self._lock:
+            counters = self._counters[metrics.api_name, metrics.host]
+            counters['requests'] += 1
+            counters['failures'] += metrics.failed
+            counters['reused_connections'] += bool(metrics.connection_reused)
+            for name in (
+                'tries',
+                'retry_sleep_time',
+                'duration',
+                'new_connections',
+                'connect_time',
+                'tls_time',
+                'time_to_first_byte',
+                'bytes_sent',
+                'bytes_received',
+            ):
+                counters[name] += getattr(metrics, name)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, int | float]]]:
+        """
+        Return a copy of the counters, as ``{api_name: {host: {counter_name: value}}}``.
+        """
+        result = defaultdict(dict)
+        with self._lock:
+            for (api_name, host), counters in self._counters.items():
+                result[api_name][host] = dict(counters)
+        return dict(result)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class ConnectionTimer(threading.local):
+    """
+    Number of connections opened by the current thread, and the time it took.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.connections = 0
+        self.connect_time = 0.0
+        self.tls_time = 0.0
+
+
+connection_timer = ConnectionTimer()
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            connection_timer.connect_time += time.perf_counter() - start
+
+    def connect(self):
+        start = time.perf_counter()
+        connect_time = connection_timer.connect_time
+        try:
+            super().connect()
+        finally:
+            connection_timer.connections += 1
+            if self.is_tls:
+                # everything besides opening the socket is the TLS handshake
+                socket_time = connection_timer.connect_time - connect_time
+                connection_timer.tls_time += time.perf_counter() - start - socket_time
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, FileRangeSendingMixin, HTTPConnection):
+    is_tls = False
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, FileRangeSendingMixin, HTTPSConnection):
+    is_tls = True
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+TIMED_POOL_CLASSES_BY_SCHEME = {
+    'http': TimedHTTPConnectionPool,
+    'https': TimedHTTPSConnectionPool,
+}
@@ -0,0 +1,191 @@
+######################################################################
+#
+# File: b2sdk/http_upload.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+import os
+import socket
+import ssl
+import stat
+from typing import Callable, Iterator
+
+from .stream.progress import ReadingStreamWithProgress
+from .stream.range import RangeOfInputStream
+from .stream.upload import UploadStream
+
+
+class FileRange:
+    """
+    A range of a local file in the body of an upload request.
+
+    The connections of :class:`b2sdk.b2http.B2Http` send it with ``sendfile`` on plain TCP sockets,
+    without reading the data in Python, and in large blocks otherwise.
+    It can also be read like a file, by any other connection.
+    """
+
+    def __init__(
+        self,
+        file,
+        offset: int,
+        length: int,
+        block_size: int,
+        progress_callback: Callable[[int], None] | None = None,
+    ):
+        """
+        :param file: a local file opened in binary mode
+        :param offset: offset of the range in the file
+        :param length: length of the range
+        :param block_size: number of bytes sent at once
+        :param progress_callback: called with the number of bytes after each block is sent
+        """
+        self.file = file
+        self.offset = offset
+        self.length = length
+        self.block_size = block_size
+        self.progress_callback = progress_callback
+        self.position = 0
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=None):
+        """
+        Read data from the range.
+
+        :param int size: number of bytes to read
+        :return: data read from the range
+        :rtype: bytes
+        """
+        remaining = self.length - self.position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if not size:
+            return b''
+        self.file.seek(self.offset + self.position)
+        data = self.file.read(size)
+        self._update_position(len(data))
+        return data
+
+    def send_to(self, sock):
+        """
+        Send the rest of the range to the socket.
+        """
+        use_sendfile = hasattr(os, 'sendfile') and isinstance(sock, socket.socket) \
+            and not isinstance(sock, ssl.SSLSocket)
+        while self.position < self.length:
+            size = min(self.block_size, self.length - self.position)
+            if use_sendfile:
+                sent = sock.sendfile(self.file, self.offset + self.position, size)
+                self._update_position(sent)
+            else:
+                data = self.read(size)
+                sent = len(data)
+                sock.sendall(data)
+            if not sent:
+                raise io.UnsupportedOperation(
+                    f'{self.file!r} ended {self.length - self.position} bytes before the end of the range'
+                )
+
+    def _update_position(self, delta: int):
+        self.position += delta
+        if self.progress_callback is not None:
+            self.progress_callback(delta)
+
+
+class UploadBody:
+    """
+    The body of an upload request, sending the data of a stream in large blocks.
+
+    http.client reads a file-like body in small blocks, each of them going through all the wrappers
+    of the upload stream, while this body reads ``block_size`` bytes at once.
+    An :class:`b2sdk.stream.upload.UploadStream` is read in blocks of a reused buffer.
+    If ``send_file_ranges`` is set, and the stream is a range of a local file which is neither hashed
+    nor rate-limited, the range is sent as a :class:`FileRange` instead.
+    """
+
+    def __init__(self, stream, length: int, block_size: int, send_file_ranges: bool = False):
+        """
+        :param stream: the stream to send, at the position from which it is sent
+        :param length: number of bytes to send
+        :param block_size: number of bytes read from the stream at once
+        :param send_file_ranges: whether the connections sending the body can send a :class:`FileRange`
+        """
+        self.stream = stream
+        self.length = length
+        self.block_size = block_size
+        self.send_file_ranges = send_file_ranges
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self) -> Iterator[bytes | FileRange]:
+        file_range = self.get_file_range() if self.send_file_ranges else None
+        if file_range is not None:
+            yield file_range
+            return
+        if type(self.stream) is UploadStream:
+            yield from self.stream.iter_blocks(self.block_size)
+            return
+        while True:
+            data = self.stream.read(self.block_size)
+            if not data:
+                return
+            yield data
+
+    def get_file_range(self) -> FileRange | None:
+        """
+        Return the range of a local file the stream reads, or None if it is not a plain range of a local file.
+        """
+        stream = self.stream
+        if type(stream) is UploadStream:
+            if stream.file is None or stream.hashed or stream.bandwidth_limiter is not None:
+                return None
+            return self._make_file_range(
+                stream.file,
+                stream.offset + stream.tell(),
+                stream.length - stream.tell(),
+                stream.report_progress,
+            )
+        progress_callback = None
+        if type(stream) is ReadingStreamWithProgress:
+            progress_callback = stream._progress_update
+            stream = stream.stream
+        if type(stream) is RangeOfInputStream:
+            return self._make_file_range(
+                stream.stream,
+                stream.offset + stream.tell(),
+                stream.length - stream.tell(),
+                progress_callback,
+            )
+        return self._make_file_range(stream, None, self.length, progress_callback)
+
+    def _make_file_range(self, file, offset, length, progress_callback) -> FileRange | None:
+        if length != self.length or not isinstance(file, (io.BufferedReader, io.FileIO)):
+            return None
+        try:
+            if not stat.S_ISREG(os.fstat(file.fileno()).st_mode):
+                return None
+            if offset is None:
+                offset = file.tell()
+        except OSError:
+            return None
+        return FileRange(file, offset, length, self.block_size, progress_callback)
+
+
+class FileRangeSendingMixin:
+    """
+    Mixin of the HTTP connections which can send a :class:`FileRange` of an :class:`UploadBody`.
+    """
+
+    def send(self, data):
+        if isinstance(data, FileRange):
+            data.send_to(self.sock)
+        else:
+            super().send(data)
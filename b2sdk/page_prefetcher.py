@@ -0,0 +1,159 @@
+######################################################################
+#
+# File: b2sdk/page_prefetcher.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class PagePrefetcher:
+    """
+    Fetch the pages of a paginated listing ahead of the consumer, on a background thread.
+
+    A page is fetched with ``fetch_page(cursor)`` and the cursor of the page which follows it
+    is taken from the page with ``next_cursor(page)`` (``None`` means there are no more pages).
+    As soon as a page arrives, the request for the next one is sent, until ``max_pages`` pages
+    are waiting to be consumed.
+
+    When the consumer asks for a page with a different cursor than the one which follows
+    the previous page (i.e. it skips ahead), the pages fetched so far are discarded and
+    prefetching starts again from the new cursor.
+
+    With ``max_pages`` set to 0, the pages are fetched on the consumer thread, one at a time.
+
+    Every page is fetched by a separate task, which never waits for the consumer, so an ``executor``
+    shared by several prefetchers bounds the number of pages fetched at the same time.
+    Without an executor, every task runs on a new thread.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[Hashable], Any],
+        next_cursor: Callable[[Any], Hashable | None],
+        max_pages: int = 1,
+        executor: Executor | None = None,
+    ):
+        """
+        :param fetch_page: a callable fetching the page at the given cursor
+        :param next_cursor: a callable returning the cursor of the page following the given one
+        :param max_pages: maximum number of pages fetched ahead of the consumer
+        :param executor: executor to fetch the pages on; if not set, every page is fetched on a new thread
+        """
+        assert max_pages >= 0
+        self.fetch_page = fetch_page
+        self.next_cursor = next_cursor
+        self.max_pages = max_pages
+        self.executor = executor
+        self._condition = threading.Condition()
+        self._pages: deque[tuple[Any, Exception | None]] = deque()
+        self._expected_cursor = None
+        # cursor of the next page to fetch, or None if there are no more pages (or fetching stopped at an error)
+        self._cursor_to_fetch = None
+        self._fetching = False
+        self._generation = 0
+        self._started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self, cursor: Hashable):
+        """
+        Start fetching the pages from the given cursor, without waiting for them.
+        """
+        if not self.max_pages:
+            return
+        with self._condition:
+            if not self._started or cursor != self._expected_cursor:
+                self._restart(cursor)
+
+    def get(self, cursor: Hashable):
+        """
+        Return the page at the given cursor.
+        """
+        if not self.max_pages:
+            return self.fetch_page(cursor)
+        with self._condition:
+            if not self._started or cursor != self._expected_cursor:
+                self._restart(cursor)
+            self._condition.wait_for(lambda: self._pages)
+            page, error = self._pages.popleft()
+            self._fetch_more()
+            if error is None:
+                self._expected_cursor = self.next_cursor(page)
+            else:
+                # fetching stopped at the error, so a retry has to start it again
+                self._started = False
+        if error is not None:
+            raise error
+        return page
+
+    def close(self):
+        """
+        Stop fetching pages and discard the ones which were not consumed.
+        """
+        with self._condition:
+            self._generation += 1
+            self._pages.clear()
+            self._cursor_to_fetch = None
+
+    def _restart(self, cursor):
+        if self._started:
+            logger.debug(
+                'discarding %i prefetched pages, restarting at %r', len(self._pages), cursor
+            )
+        self._generation += 1
+        self._pages.clear()
+        self._expected_cursor = cursor
+        self._started = True
+        self._cursor_to_fetch = cursor
+        # a task of the previous generation, if any, is going to discard its page
+        self._fetching = False
+        self._fetch_more()
+
+    def _fetch_more(self):
+        # called with the condition held
+        if self._fetching or self._cursor_to_fetch is None or len(self._pages) >= self.max_pages:
+            return
+        self._fetching = True
+        args = (self._cursor_to_fetch, self._generation)
+        if self.executor is not None:
+            self.executor.submit(self._fetch_page, *args)
+        else:
+            threading.Thread(
+                target=self._fetch_page,
+                args=args,
+                name='b2sdk-page-prefetcher',
+                daemon=True,
+            ).start()
+
+    def _fetch_page(self, cursor, generation):
+        if self._generation != generation:
+            # the prefetcher was closed or restarted before the task started
+            return
+        try:
+            page, error = self.fetch_page(cursor), None
+        except Exception as e:
+            page, error = None, e
+        with self._condition:
+            if self._generation != generation:
+                return
+            self._fetching = False
+            self._pages.append((page, error))
+            self._cursor_to_fetch = self.next_cursor(page) if error is None else None
+            self._condition.notify_all()
+            self._fetch_more()
@@ -106,6 +106,12 @@ class AbstractRawApi(metaclass=ABCMeta):
     Direct access to the B2 web apis.
     """
 
+    def set_http_pool_maxsize(self, pool_maxsize: int):
+        """
+        Adjust the maximum number of HTTP connections kept open to a single host.
+        Does nothing, unless the API is accessed with HTTP.
+        """
+
     @abstractmethod
     def authorize_account(self, realm_url, application_key_id, application_key):
         pass
@@ -435,6 +441,9 @@ class B2RawHTTPApi(AbstractRawApi):
     def __init__(self, b2_http):
         self.b2_http = b2_http
 
+    def set_http_pool_maxsize(self, pool_maxsize: int):
+        self.b2_http.set_pool_maxsize(pool_maxsize)
+
     def _post_json(self, base_url, api_name, auth, **params) -> dict[str, Any]:
         """
         A helper method for calling an API with the given auth and params.
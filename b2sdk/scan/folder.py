@@ -9,16 +9,20 @@
 ######################################################################
 from __future__ import annotations
 
+import functools
+import itertools
 import logging
 import os
 import platform
 import re
+import stat
 import sys
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterator
 
-from ..utils import fix_windows_path_limit, get_file_mtime, is_file_readable
+from ..utils import fix_windows_path_limit
 from .exception import (
     EmptyDirectory,
     EnvironmentEncodingError,
@@ -26,6 +30,7 @@ from .exception import (
     UnableToCreateDirectory,
     UnsupportedFilename,
 )
+from .manifest import DirectoryEntry, ScanManifest
 from .path import AbstractPath, B2Path, LocalPath
 from .policies import DEFAULT_SCAN_MANAGER, ScanPoliciesManager
 from .report import ProgressReport
@@ -113,17 +118,26 @@ class LocalFolder(AbstractFolder):
     Folder interface to a directory on the local machine.
     """
 
-    def __init__(self, root: str | Path):
+    # number of threads listing directories ahead of the ones being scanned
+    SCAN_THREADS = 8
+    # number of the next subdirectories of a directory listed ahead of the scan, so that the listings
+    # waiting to be scanned do not pile up in memory
+    SCAN_LOOKAHEAD = 16
+
+    def __init__(self, root: str | Path, manifest: ScanManifest | None = None):
         """
         Initialize a new folder.
 
         :param root: path to the root of the local folder.  Must be unicode.
+        :param manifest: a manifest storing the directory listings between the scans, to reuse the listings
+                         of the directories which did not change
         """
         if isinstance(root, Path):
             root = str(root)
         if not isinstance(root, str):
             raise ValueError('folder path should be str or pathlib.Path: %s' % repr(root))
         self.root = fix_windows_path_limit(os.path.abspath(root))
+        self.manifest = manifest
 
     def folder_type(self):
         """
@@ -138,11 +152,23 @@ class LocalFolder(AbstractFolder):
         """
         Yield all files.
 
+        The subdirectories are listed on a thread pool, ahead of the directories being scanned.
+
         :param reporter: a place to report errors
         :param policies_manager: a policy manager object, default is DEFAULT_SCAN_MANAGER
         """
         root_path = Path(self.root)
-        yield from self._walk_relative_paths(root_path, Path(''), reporter, policies_manager)
+        completed = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.SCAN_THREADS) as executor:
+                yield from self._walk_relative_paths(
+                    root_path, Path(''), reporter, policies_manager, executor=executor
+                )
+            completed = True
+        finally:
+            if self.manifest is not None:
+                # only a complete scan knows which directories are gone
+                self.manifest.save(prune_root=self.root if completed else None)
 
     def make_full_path(self, file_name):
         """
@@ -194,6 +220,8 @@ class LocalFolder(AbstractFolder):
         reporter: ProgressReport,
         policies_manager: ScanPoliciesManager,
         visited_symlinks: set[int] | None = None,
+        executor: Executor | None = None,
+        scan: Future | None = None,
     ):
         """
         Yield a File object for each of the files anywhere under this folder, in the
@@ -204,23 +232,9 @@ class LocalFolder(AbstractFolder):
         :param reporter: a reporter object to report errors and warnings
         :param policies_manager: a policies manager object
         :param visited_symlinks: a set of paths to symlinks that have already been visited. Using inode numbers to reduce memory usage
+        :param executor: an executor listing the subdirectories ahead of the scan; if not set, they are listed when they are scanned
+        :param scan: a future result of :meth:`_scan_directory` for this directory, if it was already started
         """
-
-        # Collect the names.  We do this before returning any results, because
-        # directories need to sort as if their names end in '/'.
-        #
-        # With a directory containing 'a', 'a.txt', and 'a0.txt', with 'a' being
-        # a directory containing 'b.txt', and 'c.txt', the results returned
-        # should be:
-        #
-        #    a.txt
-        #    a/b.txt
-        #    a/c.txt
-        #    a0.txt
-        #
-        # This is because in Unicode '.' comes before '/', which comes before '0'.
-        names = []  # list of (name, local_path, relative_file_path)
-
         visited_symlinks = visited_symlinks or set()
 
         if local_dir.is_symlink():
@@ -237,11 +251,99 @@ class LocalFolder(AbstractFolder):
                 # Infinite symlink loop detected, report warning and skip symlink
                 if reporter is not None:
                     reporter.circular_symlink_skipped(str(local_dir))
+                if scan is not None:
+                    scan.cancel()
                 return
 
             visited_symlinks.add(inode_number)
 
-        for name in (x.name for x in local_dir.iterdir()):
+        if scan is not None:
+            entries, problems = scan.result()
+        else:
+            entries, problems = self._scan_directory(local_dir, relative_dir_path, policies_manager)
+
+        if reporter is not None:
+            for report, path in problems:
+                getattr(reporter, report)(path)
+
+        # Start listing the next subdirectories, so that they are ready by the time we get to them.
+        subdirectory_scans = {}
+        subdirectories = iter(
+            [entry for entry in entries if entry[0].endswith('/')] if executor is not None else []
+        )
+
+        def submit_next_scans():
+            for name, local_path, relative_file_path, _ in itertools.islice(
+                subdirectories, self.SCAN_LOOKAHEAD - len(subdirectory_scans)
+            ):
+                subdirectory_scans[name] = executor.submit(
+                    self._scan_directory, local_path, relative_file_path, policies_manager
+                )
+
+        submit_next_scans()
+        try:
+            for name, local_path, relative_file_path, dir_entry in entries:
+                if name.endswith('/'):
+                    scan = subdirectory_scans.pop(name, None)
+                    submit_next_scans()
+                    yield from self._walk_relative_paths(
+                        local_path,
+                        relative_file_path,
+                        reporter,
+                        policies_manager,
+                        visited_symlinks,
+                        executor,
+                        scan,
+                    )
+                else:
+                    local_scan_path = LocalPath(
+                        absolute_path=self.make_full_path(str(relative_file_path)),
+                        relative_path=str(relative_file_path),
+                        mod_time=dir_entry.mod_time,
+                        size=dir_entry.size,
+                    )
+
+                    if policies_manager.should_exclude_local_path(local_scan_path):
+                        continue
+
+                    yield local_scan_path
+        finally:
+            # the scan was interrupted - do not list the remaining subdirectories
+            for subdirectory_scan in subdirectory_scans.values():
+                subdirectory_scan.cancel()
+
+    def _scan_directory(
+        self,
+        local_dir: Path,
+        relative_dir_path: Path | str,
+        policies_manager: ScanPoliciesManager,
+    ) -> tuple[list[tuple[str, Path, str, DirectoryEntry]], list[tuple[str, str]]]:
+        """
+        List a directory.
+
+        Return the entries which are not excluded by policies manager, as
+        (name, local_path, relative_file_path, directory_entry) tuples in the order they
+        would appear in B2, and the problems to be reported, as (reporter method name, path) pairs.
+        """
+
+        # Collect the names.  We do this before returning any results, because
+        # directories need to sort as if their names end in '/'.
+        #
+        # With a directory containing 'a', 'a.txt', and 'a0.txt', with 'a' being
+        # a directory containing 'b.txt', and 'c.txt', the results returned
+        # should be:
+        #
+        #    a.txt
+        #    a/b.txt
+        #    a/c.txt
+        #    a0.txt
+        #
+        # This is because in Unicode '.' comes before '/', which comes before '0'.
+        entries = []
+        problems = []
+
+        for dir_entry in self._list_directory(local_dir):
+            name = dir_entry.name
 
             if '/' in name:
                 raise UnsupportedFilename(
@@ -253,15 +355,18 @@ class LocalFolder(AbstractFolder):
             relative_file_path = join_b2_path(relative_dir_path, name)
 
             # Skip broken symlinks or other inaccessible files
-            if not is_file_readable(str(local_path), reporter):
+            if dir_entry.is_dir is None:
+                problems.append(('local_access_error', str(local_path)))
+                continue
+            if not dir_entry.readable:
+                problems.append(('local_permission_error', str(local_path)))
                 continue
 
-            if policies_manager.exclude_all_symlinks and local_path.is_symlink():
-                if reporter is not None:
-                    reporter.symlink_skipped(str(local_path))
+            if policies_manager.exclude_all_symlinks and dir_entry.is_symlink:
+                problems.append(('symlink_skipped', str(local_path)))
                 continue
 
-            if local_path.is_dir():
+            if dir_entry.is_dir:
                 name += '/'
                 if policies_manager.should_exclude_local_directory(str(relative_file_path)):
                     continue
@@ -270,39 +375,62 @@ class LocalFolder(AbstractFolder):
             relative_file_path_str = str(relative_file_path)
             if relative_file_path_str.startswith("./"):
                 relative_file_path_str = relative_file_path_str[2:]
-            names.append((name, local_path, relative_file_path_str))
+            entries.append((name, local_path, relative_file_path_str, dir_entry))
 
-        # Yield all of the answers.
-        #
-        # Sorting the list of triples puts them in the right order because 'name',
-        # the sort key, is the first thing in the triple.
-        for (name, local_path, relative_file_path) in sorted(names):
-            if name.endswith('/'):
-                yield from self._walk_relative_paths(
-                    local_path,
-                    relative_file_path,
-                    reporter,
-                    policies_manager,
-                    visited_symlinks,
-                )
-            else:
-                # Check that the file still exists and is accessible, since it can take a long time
-                # to iterate through large folders
-                if is_file_readable(str(local_path), reporter):
-                    file_mod_time = get_file_mtime(str(local_path))
-                    file_size = local_path.stat().st_size
+        # The names are unique, so the entries are sorted by name only.
+        entries.sort(key=lambda entry: entry[0])
+        return entries, problems
 
-                    local_scan_path = LocalPath(
-                        absolute_path=self.make_full_path(str(relative_file_path)),
-                        relative_path=str(relative_file_path),
-                        mod_time=file_mod_time,
-                        size=file_size,
-                    )
+    def _list_directory(self, local_dir: Path) -> list[DirectoryEntry]:
+        """
+        List a directory, or take the listing from the manifest if the directory did not change.
+        """
+        if self.manifest is None:
+            return self._read_directory(local_dir)
+        path = str(local_dir)
+        dir_stat = os.stat(path)
+        listing = self.manifest.get(path, dir_stat)
+        if listing is None:
+            listing = self._read_directory(local_dir)
+        elif not self.manifest.trust_mtime:
+            listing = [
+                self._make_directory_entry(
+                    os.path.join(path, entry.name),
+                    entry.name,
+                    entry.is_symlink,
+                    functools.partial(os.stat, os.path.join(path, entry.name)),
+                ) for entry in listing
+            ]
+        self.manifest.put(path, dir_stat, listing)
+        return listing
 
-                    if policies_manager.should_exclude_local_path(local_scan_path):
-                        continue
+    @classmethod
+    def _read_directory(cls, local_dir: Path) -> list[DirectoryEntry]:
+        """
+        List a directory, with a single ``stat`` of every entry (and none of symlinks, where
+        the type of the entry is known from the listing).
+        """
+        with os.scandir(local_dir) as dir_entries:
+            return [
+                cls._make_directory_entry(
+                    dir_entry.path, dir_entry.name, dir_entry.is_symlink(), dir_entry.stat
+                ) for dir_entry in dir_entries
+            ]
 
-                    yield local_scan_path
+    @classmethod
+    def _make_directory_entry(cls, path, name, is_symlink, get_stat) -> DirectoryEntry:
+        try:
+            stat_result = get_stat()
+        except OSError:
+            return DirectoryEntry(name, is_symlink, None, False, 0, 0)
+        return DirectoryEntry(
+            name=name,
+            is_symlink=is_symlink,
+            is_dir=stat.S_ISDIR(stat_result.st_mode),
+            readable=os.access(path, os.R_OK),
+            mod_time=int(stat_result.st_mtime * 1000),
+            size=stat_result.st_size,
+        )
 
     @classmethod
     def _handle_non_unicode_file_name(cls, name):
@@ -337,6 +465,9 @@ class B2Folder(AbstractFolder):
     Folder interface to b2.
     """
 
+    # number of pages of the listing fetched ahead of the ones being scanned
+    LIST_PREFETCH_PAGES = 2
+
     def __init__(self, bucket_name, folder_name, api):
         """
         :param bucket_name: a name of the bucket
@@ -413,6 +544,7 @@ class B2Folder(AbstractFolder):
             self.folder_name,
             latest_only=False,
             recursive=True,
+            prefetch_pages=self.LIST_PREFETCH_PAGES,
         ):
             yield file_version
 
@@ -0,0 +1,141 @@
+######################################################################
+#
+# File: b2sdk/scan/manifest.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryEntry(NamedTuple):
+    """
+    An entry of a local directory, as listed by :class:`b2sdk.v2.LocalFolder`.
+    """
+    name: str
+    is_symlink: bool
+    is_dir: bool | None  #: ``None`` if the entry could not be accessed (i.e. it is a broken symlink)
+    readable: bool
+    mod_time: int  #: modification time, in milliseconds
+    size: int
+
+
+class ScanManifest:
+    """
+    Store the listings of the local directories scanned by :class:`b2sdk.v2.LocalFolder`
+    in an `sqlite3 <https://www.sqlite.org>`_ database, so that they can be reused by the next scan.
+
+    A directory which has the same modification time and inode number as when it was recorded
+    still has the same entries, so its listing is taken from the manifest and only the entries are
+    checked again (with a ``stat`` of every entry).
+
+    With ``trust_mtime``, the entries are not checked either - their size and modification time are also
+    taken from the manifest.  Then a directory which did not change is not accessed at all (except for
+    a single ``stat`` of the directory itself), but the changes of files which do not change the directory
+    (i.e. modifying an existing file in place) are not noticed.
+
+    Directories which were modified less than ``MTIME_RESOLUTION`` seconds before they were listed are not
+    recorded, since they could be changed again without changing their modification time.
+    """
+
+    MTIME_RESOLUTION = 2
+
+    def __init__(self, file_name: str, trust_mtime: bool = False):
+        """
+        :param file_name: path to the database file; it is created if it does not exist
+        :param trust_mtime: if ``True``, do not check the entries of directories which did not change
+        """
+        self.file_name = file_name
+        self.trust_mtime = trust_mtime
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(file_name, check_same_thread=False)
+        self._visited: set[str] = set()
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS
+                directory (
+                    path TEXT NOT NULL PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    entries TEXT NOT NULL
+                );
+                """
+            )
+
+    def get(self, path: str, stat_result: os.stat_result) -> list[DirectoryEntry] | None:
+        """
+        Return the recorded entries of a directory, or ``None`` if the directory was not recorded
+        or it was changed since.
+
+        :param path: path to the directory
+        :param stat_result: current ``stat`` of the directory
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT mtime_ns, inode, entries FROM directory WHERE path = ?;', (path,)
+            ).fetchone()
+        if row is None or row[:2] != (stat_result.st_mtime_ns, stat_result.st_ino):
+            return None
+        return [DirectoryEntry(*entry) for entry in json.loads(row[2])]
+
+    def put(self, path: str, stat_result: os.stat_result, entries: list[DirectoryEntry]):
+        """
+        Record the entries of a directory.
+
+        :param path: path to the directory
+        :param stat_result: ``stat`` of the directory, taken before it was listed
+        :param entries: entries of the directory
+        """
+        with self._lock:
+            self._visited.add(path)
+            if time.time() - stat_result.st_mtime < self.MTIME_RESOLUTION:
+                logger.debug('not recording %s, which was modified too recently', path)
+                self._connection.execute('DELETE FROM directory WHERE path = ?;', (path,))
+                return
+            self._connection.execute(
+                'INSERT OR REPLACE INTO directory (path, mtime_ns, inode, entries) VALUES (?, ?, ?, ?);',
+                (path, stat_result.st_mtime_ns, stat_result.st_ino, json.dumps(entries)),
+            )
+
+    def save(self, prune_root: str | None = None):
+        """
+        Save the recorded directories.
+
+        :param prune_root: if set, forget the directories under this path which were not recorded
+                           since the manifest was opened or last pruned (i.e. because they were removed)
+        """
+        with self._lock, self._connection:
+            if prune_root is None:
+                return
+            paths = [
+                path for (path,) in self._connection.execute('SELECT path FROM directory;')
+                if (path == prune_root or path.startswith(prune_root.rstrip(os.sep) +
+                                                          os.sep)) and path not in self._visited
+            ]
+            self._connection.executemany(
+                'DELETE FROM directory WHERE path = ?;', [(path,) for path in paths]
+            )
+            self._visited.clear()
+
+    def close(self):
+        self.save()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
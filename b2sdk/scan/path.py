@@ -12,6 +12,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 
 from ..file_version import FileVersion
+from ..utils import Sha1HexDigest
 
 
 class AbstractPath(ABC):
@@ -35,10 +36,18 @@ class AbstractPath(ABC):
 
 
 class LocalPath(AbstractPath):
-    __slots__ = ['absolute_path', 'relative_path', 'mod_time', 'size']
+    __slots__ = ['absolute_path', 'relative_path', 'mod_time', 'size', 'content_sha1']
 
-    def __init__(self, absolute_path: str, relative_path: str, mod_time: int, size: int):
+    def __init__(
+        self,
+        absolute_path: str,
+        relative_path: str,
+        mod_time: int,
+        size: int,
+        content_sha1: Sha1HexDigest | None = None,
+    ):
         self.absolute_path = absolute_path
+        self.content_sha1 = content_sha1  #: SHA1 of the file, if it was computed
         super().__init__(relative_path, mod_time, size)
 
     def is_visible(self) -> bool:
@@ -73,6 +82,10 @@ class B2Path(AbstractPath):
     def size(self) -> int:
         return self.selected_version.size
 
+    @property
+    def content_sha1(self) -> Sha1HexDigest | None:
+        return self.selected_version.get_content_sha1()
+
     def __repr__(self):
         return '{}({}, [{}])'.format(
             self.__class__.__name__, self.relative_path, ', '.join(
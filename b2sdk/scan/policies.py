@@ -9,6 +9,7 @@
 ######################################################################
 from __future__ import annotations
 
+import functools
 import logging
 import re
 from typing import Iterable
@@ -24,13 +25,38 @@ class RegexSet:
     """
     Hold a (possibly empty) set of regular expressions and know how to check
     whether a string matches any of them.
+
+    The regular expressions are combined into a single alternation, so that a string
+    is checked against all of them at once.  Those which cannot be safely combined
+    (because they have groups or flags of their own) are checked one by one.
+
+    Optionally, the results for the most recently checked strings are remembered,
+    which helps when the same strings (i.e. names of directories) are checked over and over.
     """
 
-    def __init__(self, regex_iterable):
+    _DEFAULT_FLAGS = re.compile('').flags
+
+    def __init__(self, regex_iterable, cache_size: int = 0):
         """
         :param regex_iterable: an interable which yields regexes
+        :param cache_size: how many results to remember, 0 to not remember any
         """
         self._compiled_list = [re.compile(r) for r in regex_iterable]
+        self._combined = None
+        self._uncombined_list = self._compiled_list
+        combinable = [
+            c for c in self._compiled_list if c.groups == 0 and c.flags == self._DEFAULT_FLAGS
+        ]
+        if len(combinable) > 1:
+            try:
+                self._combined = re.compile('|'.join(f'(?:{c.pattern})' for c in combinable))
+            except re.error:
+                logger.debug('cannot combine regexes %r', combinable)
+            else:
+                self._uncombined_list = [c for c in self._compiled_list if c not in combinable]
+        self._cached_matches = None
+        if cache_size:
+            self._cached_matches = functools.lru_cache(maxsize=cache_size)(self._matches)
 
     def matches(self, s):
         """
@@ -40,7 +66,14 @@ class RegexSet:
         :type s: str
         :rtype: bool
         """
-        return any(c.match(s) is not None for c in self._compiled_list)
+        if self._cached_matches is not None:
+            return self._cached_matches(s)
+        return self._matches(s)
+
+    def _matches(self, s):
+        if self._combined is not None and self._combined.match(s) is not None:
+            return True
+        return any(c.match(s) is not None for c in self._uncombined_list)
 
 
 def convert_dir_regex_to_dir_prefix_regex(dir_regex: str | re.Pattern) -> str:
@@ -122,6 +155,9 @@ class ScanPoliciesManager:
     sub-directories in it.
     """
 
+    # number of directories for which the verdict is remembered
+    DIRECTORY_CACHE_SIZE = 4096
+
     def __init__(
         self,
         exclude_dir_regexes: Iterable[str | re.Pattern] = tuple(),
@@ -158,7 +194,9 @@ class ScanPoliciesManager:
         with check_invalid_argument(
             'exclude_dir_regexes', 'wrong regex was given for excluding directories', re.error
         ):
-            self._exclude_dir_set = RegexSet(exclude_dir_regexes)
+            self._exclude_dir_set = RegexSet(
+                exclude_dir_regexes, cache_size=self.DIRECTORY_CACHE_SIZE
+            )
             self._exclude_file_because_of_dir_set = RegexSet(
                 map(convert_dir_regex_to_dir_prefix_regex, exclude_dir_regexes)
             )
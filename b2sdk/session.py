@@ -25,6 +25,7 @@ from b2sdk.exception import InvalidAuthToken, Unauthorized
 from b2sdk.file_lock import BucketRetentionSetting, FileRetentionSetting, LegalHold
 from b2sdk.raw_api import ALL_CAPABILITIES, REALM_URLS, LifecycleRule
 from b2sdk.replication.setting import ReplicationConfiguration
+from b2sdk.upload_url_prefetcher import UploadUrlPrefetcher
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +87,9 @@ class B2Session:
             TokenType.UPLOAD_SMALL: self._upload_small,
             TokenType.UPLOAD_PART: self._upload_part,
         }
+        self._upload_url_prefetcher = UploadUrlPrefetcher(
+            self.get_upload_url, self._put_upload_data
+        )
 
     def authorize_automatically(self):
         """
@@ -134,6 +138,7 @@ class B2Session:
             allowed=allowed,
             application_key_id=application_key_id,
         )
+        self._upload_url_prefetcher.reset()
 
     def cancel_large_file(self, file_id):
         return self._wrap_default_token(self.raw_api.cancel_large_file, file_id)
@@ -214,6 +219,17 @@ class B2Session:
     def get_upload_url(self, bucket_id):
         return self._wrap_default_token(self.raw_api.get_upload_url, bucket_id)
 
+    def prefetch_upload_urls(self, bucket_id: str, count: int):
+        """
+        Start getting upload URLs for the bucket in the background, so that ``count`` uploads
+        can start without waiting for ``b2_get_upload_url``.  URLs evicted after failed uploads
+        are replaced in the background as well.
+
+        :param bucket_id: a bucket ID
+        :param count: number of upload URLs to keep
+        """
+        self._upload_url_prefetcher.warm_up(bucket_id, count)
+
     def get_upload_part_url(self, file_id):
         return self._wrap_default_token(self.raw_api.get_upload_part_url, file_id)
 
@@ -514,11 +530,16 @@ class B2Session:
         """
         account_info = self.account_info
         upload_url, upload_auth_token = account_info.take_bucket_upload_url(bucket_id)
-        if None not in (upload_url, upload_auth_token):
-            return upload_url, upload_auth_token
-
-        response = self.get_upload_url(bucket_id)
-        return response['uploadUrl'], response['authorizationToken']
+        if None in (upload_url, upload_auth_token):
+            response = self.get_upload_url(bucket_id)
+            self._upload_url_prefetcher.url_fetched(bucket_id)
+            upload_url, upload_auth_token = response['uploadUrl'], response['authorizationToken']
+        # the URLs for the next uploads are fetched in the background, if the pool fell below its target
+        self._upload_url_prefetcher.refill(bucket_id)
+        return upload_url, upload_auth_token
+
+    def _put_upload_data(self, bucket_id, upload_url, upload_auth_token):
+        self.account_info.put_bucket_upload_url(bucket_id, upload_url, upload_auth_token)
 
     def _get_upload_part_data(self, file_id):
         """
@@ -535,7 +556,12 @@ class B2Session:
 
     def _upload_small(self, f, bucket_id, *args, **kwargs):
         upload_url, upload_auth_token = self._get_upload_data(bucket_id)
-        response = f(upload_url, upload_auth_token, *args, **kwargs)
+        try:
+            response = f(upload_url, upload_auth_token, *args, **kwargs)
+        except BaseException:
+            # the URL is not returned to the pool, since it may not work anymore
+            self._upload_url_prefetcher.url_evicted(bucket_id)
+            raise
         self.account_info.put_bucket_upload_url(bucket_id, upload_url, upload_auth_token)
         return response
 
@@ -12,10 +12,16 @@ from __future__ import annotations
 from .hashing import StreamWithHash
 from .progress import ReadingStreamWithProgress, WritingStreamWithProgress
 from .range import RangeOfInputStream
+from .rate_limited import RateLimitedStream
+from .spilling import SpillingStream
+from .upload import UploadStream
 
 __all__ = [
     'RangeOfInputStream',
+    'RateLimitedStream',
     'ReadingStreamWithProgress',
+    'SpillingStream',
     'StreamWithHash',
+    'UploadStream',
     'WritingStreamWithProgress',
 ]
@@ -90,3 +90,10 @@ class WritingStreamWithProgress(AbstractStreamWithProgress):
         """
         self._progress_update(len(data))
         return super().write(data)
+
+    def fileno(self):
+        """
+        Return the file descriptor of the underlying stream, so that writers can bypass
+        the Python-level file object (progress has to be reported with ``_progress_update`` then).
+        """
+        return self.stream.fileno()
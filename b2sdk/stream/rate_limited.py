@@ -0,0 +1,38 @@
+######################################################################
+#
+# File: b2sdk/stream/rate_limited.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+from b2sdk.stream.wrapper import StreamWrapper
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
+
+
+class RateLimitedStream(StreamWrapper):
+    """
+    Wrap a file-like object, waiting for the bandwidth limiter before returning the data read.
+    """
+
+    def __init__(self, stream, bandwidth_limiter: BandwidthLimiter):
+        """
+        :param stream: the stream to read from
+        :param bandwidth_limiter: the limiter shared by all the transfers
+        """
+        super().__init__(stream)
+        self.bandwidth_limiter = bandwidth_limiter
+
+    def read(self, size=None):
+        """
+        Read data from the stream.
+
+        :param int size: number of bytes to read
+        :return: data read from the stream
+        """
+        data = super().read(size)
+        self.bandwidth_limiter.consume(len(data))
+        return data
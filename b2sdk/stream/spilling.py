@@ -0,0 +1,102 @@
+######################################################################
+#
+# File: b2sdk/stream/spilling.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+import tempfile
+
+from b2sdk.stream.base import ReadOnlyStreamMixin
+from b2sdk.stream.wrapper import StreamWithLengthWrapper
+
+
+class SpillingStream(ReadOnlyStreamMixin, StreamWithLengthWrapper):
+    """
+    Wrap a stream which cannot seek (or is expensive to read again), keeping a copy
+    of the data read so far in a temporary file, so that the stream can be rewound
+    and read again (i.e. when an upload is retried) without reading the source again.
+
+    The copy is kept in memory until it exceeds ``max_memory_size`` bytes.
+    """
+
+    DEFAULT_MAX_MEMORY_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, stream, length=None, max_memory_size=None):
+        """
+        :param stream: a stream to read from
+        :param int length: length of the stream, if known
+        :param int max_memory_size: maximum size of the copy kept in memory, in bytes
+        """
+        super().__init__(stream, length)
+        self.spill = tempfile.SpooledTemporaryFile(
+            max_size=max_memory_size or self.DEFAULT_MAX_MEMORY_SIZE
+        )
+        self.position = 0
+        self.spilled = 0  #: number of bytes read from the wrapped stream
+
+    def seekable(self):
+        return True
+
+    def seek(self, pos, whence=0):
+        """
+        Seek to a given position in the stream.
+
+        :param int pos: position in the stream
+        :return: new absolute position
+        :rtype: int
+        """
+        if whence == io.SEEK_CUR:
+            pos += self.position
+        elif whence == io.SEEK_END:
+            self._read_source(None)
+            pos += self.spilled
+        elif whence != io.SEEK_SET:
+            raise ValueError(f'invalid whence ({whence})')
+        if pos < 0:
+            raise ValueError(f'negative seek position {pos}')
+        if pos > self.spilled:
+            self._read_source(pos - self.spilled)
+        self.position = min(pos, self.spilled)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=None):
+        """
+        Read data from the stream.
+
+        :param int size: number of bytes to read
+        :return: data read from the stream
+        :rtype: bytes
+        """
+        if size is not None and size < 0:
+            size = None
+        data = b''
+        if self.position < self.spilled:
+            available = self.spilled - self.position
+            self.spill.seek(self.position)
+            data = self.spill.read(available if size is None else min(size, available))
+        if size is None or len(data) < size:
+            data += self._read_source(None if size is None else size - len(data))
+        self.position += len(data)
+        return data
+
+    def close(self):
+        super().close()
+        self.spill.close()
+        self.stream.close()
+
+    def _read_source(self, size):
+        data = self.stream.read() if size is None else self.stream.read(size)
+        if data:
+            self.spill.seek(self.spilled)
+            self.spill.write(data)
+            self.spilled += len(data)
+        return data
@@ -0,0 +1,204 @@
+######################################################################
+#
+# File: b2sdk/stream/upload.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import hashlib
+import io
+from typing import Iterator
+
+from b2sdk.stream.base import ReadOnlyStreamMixin
+from b2sdk.stream.range import RangeOfInputStream
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
+
+
+class UploadStream(ReadOnlyStreamMixin, io.RawIOBase):
+    """
+    Read the data of an upload from a range of a local file or from a bytes buffer, computing its SHA1,
+    reporting progress and waiting for the bandwidth limiter in a single step, instead of going through
+    a stack of stream wrappers (:class:`b2sdk.v2.ReadingStreamWithProgress`,
+    :class:`b2sdk.v2.StreamWithHash`, :class:`b2sdk.v2.RangeOfInputStream`...).
+
+    If ``hashed`` is set, the hex digest of the SHA1 is appended at the end of the stream, like in
+    :class:`b2sdk.v2.StreamWithHash`, and it is available as ``hash`` once the data has been read.
+
+    The stream can only be rewound to the beginning. The file is not closed with the stream.
+    """
+
+    DIGEST_SIZE = hashlib.sha1().digest_size * 2
+
+    def __init__(
+        self,
+        source,
+        offset: int,
+        length: int,
+        progress_listener=None,
+        hashed: bool = False,
+        bandwidth_limiter: BandwidthLimiter | None = None,
+    ):
+        """
+        :param source: a local file opened in binary mode, or a bytes-like object
+        :param offset: offset of the data in the source
+        :param length: length of the data
+        :param b2sdk.v2.AbstractProgressListener progress_listener: the listener that we tell about progress
+        :param hashed: whether to append the hex digest of the SHA1 of the data
+        :param bandwidth_limiter: the limiter shared by all the uploads
+        """
+        super().__init__()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self.file = None
+            self.data = memoryview(source).cast('B')[offset:offset + length]
+        else:
+            self.file = source
+            self.data = None
+        self.offset = offset
+        self.length = length
+        self.progress_listener = progress_listener
+        self.hashed = hashed
+        self.bandwidth_limiter = bandwidth_limiter
+        self._buffer = None
+        self._rewind()
+
+    @classmethod
+    def from_stream(cls, stream, length: int, **kwargs) -> UploadStream | None:
+        """
+        Make an upload stream of the ``length`` bytes which ``stream`` would read from its current position,
+        if it reads a local file or a :class:`io.BytesIO` (directly or through ranges), or return None.
+
+        :param stream: a stream opened by an upload source
+        :param length: length of the data
+        :param kwargs: other arguments of :class:`UploadStream`
+        """
+        source = stream
+        while type(source) is RangeOfInputStream:
+            source = source.stream
+        is_bytes_buffer = type(source) is io.BytesIO
+        if not is_bytes_buffer and not isinstance(source, (io.BufferedReader, io.FileIO)):
+            return None
+        position = stream.tell()
+        while type(stream) is RangeOfInputStream:
+            # the position in the range becomes the position in the stream it reads
+            if stream.length - position < length:
+                return None
+            position += stream.offset
+            stream = stream.stream
+        if is_bytes_buffer:
+            # shares the buffer of the stream, if it was made from bytes
+            return cls(source.getvalue(), position, length, **kwargs)
+        return cls(source, position, length, **kwargs)
+
+    def __len__(self):
+        return self.length + (self.DIGEST_SIZE if self.hashed else 0)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, pos, whence=0):
+        """
+        Seek to the beginning of the stream.
+
+        :param int pos: position in the stream, only 0 is supported
+        """
+        if pos != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('upload stream can only be seeked to beginning')
+        self._rewind()
+        return 0
+
+    def tell(self):
+        return self.position + self.hash_position
+
+    def readinto(self, b):
+        """
+        Read data from the stream into a buffer.
+
+        :param b: a writable bytes-like object
+        :return: number of bytes read
+        :rtype: int
+        """
+        view = memoryview(b).cast('B')
+        if not self._data_ended:
+            if self.file is not None:
+                data = self._read_data(len(view), view)
+            else:
+                data = self._read_data(len(view))
+                view[:len(data)] = data
+            if data:
+                return len(data)
+        if not self.hashed:
+            return 0
+        digest = self._read_digest(len(view))
+        view[:len(digest)] = digest
+        return len(digest)
+
+    def iter_blocks(self, block_size: int) -> Iterator[memoryview | bytes]:
+        """
+        Yield the rest of the stream in blocks of up to ``block_size`` bytes.
+
+        The blocks read from a file are views of a buffer reused for the next block,
+        so each of them has to be consumed before the next one is requested.
+        """
+        while not self._data_ended:
+            if self.file is not None:
+                if self._buffer is None or len(self._buffer) != block_size:
+                    self._buffer = memoryview(bytearray(block_size))
+                data = self._read_data(block_size, self._buffer)
+            else:
+                data = self._read_data(block_size)
+            if data:
+                yield data
+        if self.hashed:
+            digest = self._read_digest(self.DIGEST_SIZE)
+            if digest:
+                yield digest
+
+    def report_progress(self, delta: int):
+        """
+        Report that ``delta`` more bytes of the data were sent without being read from the stream
+        (i.e. with ``sendfile``).
+        """
+        self.position += delta
+        if self.progress_listener is not None:
+            self.progress_listener.bytes_completed(self.position)
+
+    def _rewind(self):
+        if self.file is not None:
+            self.file.seek(self.offset)
+        self.position = 0
+        self._data_ended = False
+        self.digest = hashlib.sha1() if self.hashed else None
+        self.hash = None
+        self.hash_position = 0
+
+    def _read_data(self, size: int, buffer: memoryview | None = None) -> memoryview:
+        size = min(size, self.length - self.position)
+        if size <= 0:
+            data = memoryview(b'')
+        elif self.file is not None:
+            data = buffer[:self.file.readinto(buffer[:size]) or 0]
+        else:
+            data = self.data[self.position:self.position + size]
+        if not data:
+            self._data_ended = True
+            if self.digest is not None:
+                self.hash = self.digest.hexdigest()
+            return data
+        if self.digest is not None:
+            self.digest.update(data)
+        self.report_progress(len(data))
+        if self.bandwidth_limiter is not None:
+            self.bandwidth_limiter.consume(len(data))
+        return data
+
+    def _read_digest(self, size: int) -> bytes:
+        digest = self.hash[self.hash_position:self.hash_position + size].encode()
+        self.hash_position += len(digest)
+        return digest
@@ -0,0 +1,141 @@
+######################################################################
+#
+# File: b2sdk/sync/hash_cache.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+
+from ..utils import Sha1HexDigest, hex_sha1_of_file
+
+logger = logging.getLogger(__name__)
+
+
+class LocalFileHashCache:
+    """
+    Compute SHA1 of local files, remembering the results in an `sqlite3 <https://www.sqlite.org>`_
+    database, so that a file is not hashed again until it changes.
+
+    A remembered SHA1 is used as long as the file has the same device, inode number,
+    size and modification time (in nanoseconds) as when it was hashed.
+
+    New hashes are written to the database in batches of ``SAVE_BATCH_SIZE``, each in a short
+    transaction, so that several caches (i.e. in other processes) can share the database file.
+    If the database cannot be read or written, files are hashed as if they were not in the cache.
+
+    Files can be hashed from many threads at once.
+    """
+
+    SAVE_BATCH_SIZE = 100
+    DATABASE_TIMEOUT = 5.0  # seconds
+
+    def __init__(self, file_name: str = ':memory:'):
+        """
+        :param file_name: path to the database file, created if it does not exist;
+                          by default the hashes are only kept in memory
+        """
+        self.file_name = file_name
+        self._lock = threading.Lock()
+        self._unsaved = {}
+        self._connection = sqlite3.connect(
+            file_name, timeout=self.DATABASE_TIMEOUT, check_same_thread=False
+        )
+        try:
+            with self._connection:
+                self._connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS
+                    file_sha1 (
+                        device INTEGER NOT NULL,
+                        inode INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        sha1 TEXT NOT NULL,
+                        PRIMARY KEY (device, inode)
+                    );
+                    """
+                )
+        except sqlite3.Error as e:
+            logger.warning('cannot create the table of hashes in %s: %s', file_name, e)
+
+    def get_sha1(self, path: str) -> Sha1HexDigest:
+        """
+        Return SHA1 of a file, hashing it only if it changed since it was last hashed.
+
+        :param path: path to the file
+        """
+        stat_result = os.stat(path)
+        key = self._key(stat_result)
+        row = self._get_row(key)
+        if row is not None and row[:2] == key[2:]:
+            return Sha1HexDigest(row[2])
+
+        logger.debug('hashing %s', path)
+        sha1 = hex_sha1_of_file(path)
+        if self._key(os.stat(path)) != key:
+            # the file was modified while it was being hashed, so the result cannot be trusted later
+            logger.debug('%s was modified while it was hashed', path)
+            return sha1
+        with self._lock:
+            self._unsaved[key[:2]] = key[2:] + (sha1,)
+            if len(self._unsaved) >= self.SAVE_BATCH_SIZE:
+                self._save()
+        return sha1
+
+    def save(self):
+        """
+        Save the hashes computed so far to the database file.
+        """
+        with self._lock:
+            self._save()
+
+    def close(self):
+        self.save()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _get_row(self, key: tuple[int, int, int, int]) -> tuple[int, int, str] | None:
+        with self._lock:
+            row = self._unsaved.get(key[:2])
+            if row is not None:
+                return row
+            try:
+                return self._connection.execute(
+                    'SELECT size, mtime_ns, sha1 FROM file_sha1 WHERE device = ? AND inode = ?;',
+                    key[:2],
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning('cannot read %s: %s', self.file_name, e)
+                return None
+
+    def _save(self):
+        if not self._unsaved:
+            return
+        rows = [device_inode + row for device_inode, row in self._unsaved.items()]
+        self._unsaved.clear()
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO file_sha1 (device, inode, size, mtime_ns, sha1) VALUES (?, ?, ?, ?, ?);',
+                    rows,
+                )
+        except sqlite3.Error as e:
+            # the files will be hashed again next time
+            logger.warning('cannot save %i hashes to %s: %s', len(rows), self.file_name, e)
+
+    @classmethod
+    def _key(cls, stat_result: os.stat_result) -> tuple[int, int, int, int]:
+        return stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns
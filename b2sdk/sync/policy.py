@@ -52,6 +52,7 @@ class CompareVersionMode(Enum):
     MODTIME = 201  #: use file modification time on source filesystem
     SIZE = 202  #: compare using file size
     NONE = 203  #: compare using file name only
+    SHA1 = 204  #: compare using SHA1 of file contents (and modification time, if SHA1 of a file is unknown)
 
 
 class AbstractFileSyncPolicy(metaclass=ABCMeta):
@@ -205,6 +206,37 @@ class AbstractFileSyncPolicy(metaclass=ABCMeta):
 
             # Replace if size difference is over threshold
             return compare_threshold_exceeded
+
+        # Compare using SHA1 of file contents
+        elif compare_version_mode == CompareVersionMode.SHA1:
+            if source_path.size != dest_path.size:
+                return True
+
+            source_sha1 = source_path.content_sha1
+            dest_sha1 = dest_path.content_sha1
+            if source_sha1 is None or dest_sha1 is None:
+                # i.e. a large file uploaded without large_file_sha1 in its file info
+                logger.debug(
+                    'File %s: source SHA1 %s, dest SHA1 %s, comparing modification time instead',
+                    source_path.relative_path,
+                    source_sha1,
+                    dest_sha1,
+                )
+                return cls.files_are_different(
+                    source_path,
+                    dest_path,
+                    compare_threshold,
+                    CompareVersionMode.MODTIME,
+                    newer_file_mode,
+                )
+
+            logger.debug(
+                'File %s: source SHA1 %s, dest SHA1 %s',
+                source_path.relative_path,
+                source_sha1,
+                dest_sha1,
+            )
+            return source_sha1 != dest_sha1
         else:
             raise InvalidArgument('compare_version_mode', 'is invalid option')
 
@@ -11,21 +11,24 @@ from __future__ import annotations
 
 import concurrent.futures as futures
 import logging
+from collections import deque
 from enum import Enum, unique
 from typing import cast
 
 from ..bounded_queue_executor import BoundedQueueExecutor
 from ..scan.exception import InvalidArgument
 from ..scan.folder import AbstractFolder, B2Folder, LocalFolder
-from ..scan.path import AbstractPath
+from ..scan.path import AbstractPath, B2Path, LocalPath
 from ..scan.policies import DEFAULT_SCAN_MANAGER, ScanPoliciesManager
 from ..scan.scan import zip_folders
 from ..transfer.outbound.upload_source import UploadMode
+from ..transfer.scheduler import get_transfer_priority, run_with_transfer_priority
 from .encryption_provider import (
     SERVER_DEFAULT_SYNC_ENCRYPTION_SETTINGS_PROVIDER,
     AbstractSyncEncryptionSettingsProvider,
 )
 from .exception import IncompleteSync
+from .hash_cache import LocalFileHashCache
 from .policy import CompareVersionMode, NewerFileSyncMode
 from .policy_manager import POLICY_MANAGER, SyncPolicyManager
 from .report import SyncReport
@@ -80,6 +83,9 @@ class Synchronizer:
       (see ``compare_version_mode`` and ``compare_threshold`` arguments)
     """
 
+    # number of files whose SHA1 can be computed ahead of the file being compared
+    SHA1_COMPARE_WINDOW = 1000
+
     def __init__(
         self,
         max_workers,
@@ -94,6 +100,7 @@ class Synchronizer:
         sync_policy_manager: SyncPolicyManager = POLICY_MANAGER,
         upload_mode: UploadMode = UploadMode.FULL,
         absolute_minimum_part_size: int | None = None,
+        hash_cache: LocalFileHashCache | None = None,
     ):
         """
         Initialize synchronizer class and validate arguments
@@ -110,6 +117,8 @@ class Synchronizer:
         :param SyncPolicyManager sync_policy_manager: object which decides what to do with each file (upload, download, delete, copy, hide etc)
         :param b2sdk.v2.UploadMode upload_mode: determines how file uploads are handled
         :param int absolute_minimum_part_size: minimum file part size for large files
+        :param b2sdk.v2.LocalFileHashCache hash_cache: cache of SHA1 of local files, used when comparing with ``CompareVersionMode.SHA1``;
+                                                       if not set, the hashes are only kept in memory during a sync
         """
         self.newer_file_mode = newer_file_mode
         self.keep_days_or_delete = keep_days_or_delete
@@ -123,6 +132,7 @@ class Synchronizer:
         self.max_workers = max_workers
         self.upload_mode = upload_mode
         self.absolute_minimum_part_size = absolute_minimum_part_size
+        self.hash_cache = hash_cache
         self._validate()
 
     def _validate(self):
@@ -167,6 +177,8 @@ class Synchronizer:
         source is also in the destination.  Deletes any file versions
         in the destination older than history_days.
 
+        The transfers have the priority of the calling thread, see :func:`b2sdk.v2.transfer_priority`.
+
         :param source_folder: source folder object
         :param dest_folder: destination folder object
         :param now_millis: current time in milliseconds
@@ -187,8 +199,8 @@ class Synchronizer:
             cast(LocalFolder, source_folder).ensure_non_empty()
 
         # Make an executor to count files and run all of the actions. This is
-        # not the same as the executor in the API object which is used for
-        # uploads. The tasks in this executor wait for uploads. Putting them
+        # not the same as the transfer scheduler in the API object which is used
+        # for uploads. The tasks in this executor wait for uploads. Putting them
         # in the same thread pool could lead to deadlock.
         #
         # We use an executor with a bounded queue to avoid using up lots of memory
@@ -210,7 +222,8 @@ class Synchronizer:
         elif source_type == 'b2':
             action_bucket = cast(B2Folder, source_folder).bucket
 
-        # Schedule each of the actions.
+        # Schedule each of the actions, passing the priority of this thread to their transfers.
+        priority = get_transfer_priority()
         for action in self._make_folder_sync_actions(
             source_folder,
             dest_folder,
@@ -220,7 +233,14 @@ class Synchronizer:
             encryption_settings_provider,
         ):
             logging.debug('scheduling action %s on bucket %s', action, action_bucket)
-            sync_executor.submit(action.run, action_bucket, reporter, self.dry_run)
+            sync_executor.submit(
+                run_with_transfer_priority,
+                priority,
+                action.run,
+                action_bucket,
+                reporter,
+                self.dry_run,
+            )
 
         # Wait for everything to finish
         sync_executor.shutdown()
@@ -260,12 +280,15 @@ class Synchronizer:
 
         total_files = 0
         total_bytes = 0
-        for source_path, dest_path in zip_folders(
+        paths = zip_folders(
             source_folder,
             dest_folder,
             reporter,
             policies_manager,
-        ):
+        )
+        if self.compare_version_mode == CompareVersionMode.SHA1:
+            paths = self._compute_local_sha1(paths)
+        for source_path, dest_path in paths:
             if source_path is None:
                 logger.debug('determined that %s is not present on source', dest_path)
             elif dest_path is None:
@@ -298,6 +321,51 @@ class Synchronizer:
                 reporter.end_total()
             reporter.end_compare(total_files, total_bytes)
 
+    def _compute_local_sha1(self, paths):
+        """
+        Compute SHA1 of the local files which have to be compared by content with their B2 counterparts,
+        on a thread pool, ahead of the pairs of paths being yielded.
+        """
+        hash_cache = self.hash_cache or LocalFileHashCache()
+        window = deque()
+        with futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for source_path, dest_path in paths:
+                    local_path = self._get_local_path_to_hash(source_path, dest_path)
+                    future = None
+                    if local_path is not None:
+                        future = executor.submit(hash_cache.get_sha1, local_path.absolute_path)
+                    window.append((source_path, dest_path, local_path, future))
+                    if len(window) > self.SHA1_COMPARE_WINDOW:
+                        yield self._set_local_sha1(*window.popleft())
+                while window:
+                    yield self._set_local_sha1(*window.popleft())
+            finally:
+                for _, _, _, future in window:
+                    if future is not None:
+                        future.cancel()
+                hash_cache.save()
+
+    @classmethod
+    def _get_local_path_to_hash(cls, source_path, dest_path) -> LocalPath | None:
+        if source_path is None or dest_path is None or source_path.size != dest_path.size:
+            return None
+        for local_path, b2_path in [(source_path, dest_path), (dest_path, source_path)]:
+            if isinstance(local_path, LocalPath) and isinstance(b2_path, B2Path):
+                # there is nothing to compare the hash with if SHA1 of the B2 file is unknown
+                return local_path if b2_path.content_sha1 is not None else None
+        return None
+
+    @classmethod
+    def _set_local_sha1(cls, source_path, dest_path, local_path, future):
+        if future is not None:
+            try:
+                local_path.content_sha1 = future.result()
+            except OSError as e:
+                # the file will be compared by modification time; the transfer will report the problem
+                logger.warning('cannot compute SHA1 of %s: %s', local_path.absolute_path, e)
+        return source_path, dest_path
+
     def _make_file_sync_actions(
         self,
         sync_type: str,
@@ -15,14 +15,19 @@ from b2sdk.encryption.setting import EncryptionSetting
 from b2sdk.exception import (
     InvalidRange,
 )
+from b2sdk.file_version import BaseFileVersion
 from b2sdk.progress import DoNothingProgressListener
 from b2sdk.utils import B2TraceMetaAbstract
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
 
 from ...utils.thread_pool import ThreadPoolMixin
 from ..transfer_manager import TransferManager
 from .downloaded_file import DownloadedFile
+from .downloader.buffer_pool import BufferPool
 from .downloader.parallel import ParallelDownloader
 from .downloader.simple import SimpleDownloader
+from .downloader.streaming import StreamingParallelDownloader
+from .remote_file import RemoteFileReader
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +45,17 @@ class DownloadManager(TransferManager, ThreadPoolMixin, metaclass=B2TraceMetaAbs
     MIN_CHUNK_SIZE = 8192  # ~1MB file will show ~1% progress increment
     MAX_CHUNK_SIZE = 1024**2
 
+    # size of a segment downloaded by a single stream when the destination is not seekable,
+    # and the limit of memory used to keep the segments until they can be written in order
+    DEFAULT_STREAMING_SEGMENT_SIZE = 8 * 1024 * 1024
+    DEFAULT_STREAMING_BUFFER_SIZE = 64 * 1024 * 1024
+
+    # limit of memory used by a parallel download to hash the data arriving out of order,
+    # instead of reading it back from the file
+    DEFAULT_HASH_REORDER_BUFFER_SIZE = 32 * 1024 * 1024
+
     PARALLEL_DOWNLOADER_CLASS = staticmethod(ParallelDownloader)
+    STREAMING_PARALLEL_DOWNLOADER_CLASS = staticmethod(StreamingParallelDownloader)
     SIMPLE_DOWNLOADER_CLASS = staticmethod(SimpleDownloader)
 
     def __init__(
@@ -48,13 +63,30 @@ class DownloadManager(TransferManager, ThreadPoolMixin, metaclass=B2TraceMetaAbs
         write_buffer_size: int | None = None,
         check_hash: bool = True,
         max_download_streams_per_file: int | None = None,
+        min_download_segment_size: int | None = None,
+        buffer_pool_size: int | None = None,
+        bandwidth_limiter: BandwidthLimiter | None = None,
+        hash_reorder_buffer_size: int | None = None,
         **kwargs
     ):
         """
         Initialize the DownloadManager using the given services object.
+
+        :param min_download_segment_size: if set, parallel downloads are split into segments of adaptive size
+                                          (but not smaller than this) distributed between the streams on demand
+        :param buffer_pool_size: if set, downloaded data is read into reusable buffers from a pool shared by all
+                                 the downloads, holding at most this many bytes
+        :param bandwidth_limiter: if set, limits the rate at which the data of all the downloads is received
+        :param hash_reorder_buffer_size: maximum amount of out-of-order data a parallel download keeps in memory
+                                         to hash the file as it is downloaded; ``DEFAULT_HASH_REORDER_BUFFER_SIZE``
+                                         if not set, 0 to read the data back from the file instead
         """
 
         super().__init__(**kwargs)
+        self.buffer_pool = BufferPool(buffer_pool_size) if buffer_pool_size else None
+        self.bandwidth_limiter = bandwidth_limiter
+        if hash_reorder_buffer_size is None:
+            hash_reorder_buffer_size = self.DEFAULT_HASH_REORDER_BUFFER_SIZE
         self.strategies = [
             self.PARALLEL_DOWNLOADER_CLASS(
                 min_part_size=self.DEFAULT_MIN_PART_SIZE,
@@ -64,6 +96,21 @@ class DownloadManager(TransferManager, ThreadPoolMixin, metaclass=B2TraceMetaAbs
                 thread_pool=self._thread_pool,
                 check_hash=check_hash,
                 max_streams=max_download_streams_per_file,
+                min_segment_size=min_download_segment_size,
+                hash_reorder_buffer_size=hash_reorder_buffer_size,
+                buffer_pool=self.buffer_pool,
+                bandwidth_limiter=bandwidth_limiter,
+            ),
+            self.STREAMING_PARALLEL_DOWNLOADER_CLASS(
+                segment_size=self.DEFAULT_STREAMING_SEGMENT_SIZE,
+                max_buffer_size=self.DEFAULT_STREAMING_BUFFER_SIZE,
+                min_chunk_size=self.MIN_CHUNK_SIZE,
+                max_chunk_size=max(self.MAX_CHUNK_SIZE, write_buffer_size or 0),
+                align_factor=write_buffer_size,
+                thread_pool=self._thread_pool,
+                check_hash=check_hash,
+                max_streams=max_download_streams_per_file,
+                bandwidth_limiter=bandwidth_limiter,
             ),
             self.SIMPLE_DOWNLOADER_CLASS(
                 min_chunk_size=self.MIN_CHUNK_SIZE,
@@ -71,6 +118,8 @@ class DownloadManager(TransferManager, ThreadPoolMixin, metaclass=B2TraceMetaAbs
                 align_factor=write_buffer_size,
                 thread_pool=self._thread_pool,
                 check_hash=check_hash,
+                buffer_pool=self.buffer_pool,
+                bandwidth_limiter=bandwidth_limiter,
             ),
         ]
         self.write_buffer_size = write_buffer_size
@@ -113,3 +162,29 @@ class DownloadManager(TransferManager, ThreadPoolMixin, metaclass=B2TraceMetaAbs
                 write_buffer_size=self.write_buffer_size,
                 check_hash=self.check_hash,
             )
+
+    def open_file(
+        self,
+        file_version: BaseFileVersion,
+        encryption: EncryptionSetting | None = None,
+        block_size: int | None = None,
+        cache_size: int | None = None,
+    ) -> RemoteFileReader:
+        """
+        Open the file for random-access reading, downloading only the parts which are read.
+
+        :param file_version: the file to open
+        :param b2sdk.v2.EncryptionSetting encryption: encryption setting (``None`` if unknown)
+        :param block_size: amount of data retrieved with a single request, in bytes
+        :param cache_size: maximum amount of data kept in memory, in bytes
+        """
+        return RemoteFileReader(
+            session=self.services.session,
+            url=self.services.session.get_download_url_by_id(file_version.id_),
+            size=file_version.size,
+            encryption=encryption,
+            block_size=block_size,
+            cache_size=cache_size,
+            thread_pool=self._thread_pool,
+            bandwidth_limiter=self.bandwidth_limiter,
+        )
@@ -12,6 +12,8 @@ from __future__ import annotations
 import contextlib
 import io
 import logging
+import mmap
+import os
 import pathlib
 import sys
 from typing import TYPE_CHECKING, BinaryIO
@@ -74,6 +76,7 @@ class MtimeUpdatedFile(io.IOBase):
         self.buffering = buffering if buffering is not None else -1
         self.mod_time_to_set = mod_time_millis
         self.file = None
+        self.mmap = None
 
     @property
     def path_(self) -> str:
@@ -104,6 +107,14 @@ class MtimeUpdatedFile(io.IOBase):
     def tell(self):
         return self.file.tell()
 
+    def flush(self):
+        # ``io.IOBase.close`` (also called on garbage collection) flushes, and by then ``self.file`` is already closed
+        if self.file is not None and not self.file.closed:
+            self.file.flush()
+
+    def fileno(self):
+        return self.file.fileno()
+
     def __enter__(self):
         try:
             path = self.path
@@ -134,7 +145,35 @@ class MtimeUpdatedFile(io.IOBase):
         self.mode = self.file.mode
         return self
 
+    def map(self, size: int) -> bool:
+        """
+        Preallocate the file to ``size`` bytes and memory-map it, so that downloaders can copy data
+        directly into the mapping (see :class:`b2sdk.v2.MmapWriter`).
+
+        :return: ``False`` if the file cannot be mapped, in which case it is left as it was
+        """
+        if size <= 0 or 'r' not in self.mode and '+' not in self.mode:
+            return False
+        try:
+            fileno = self.file.fileno()
+            self.file.flush()
+            try:
+                # allocating the blocks upfront avoids fragmentation of files written in parallel
+                os.posix_fallocate(fileno, 0, size)
+            except (
+                AttributeError, OSError
+            ):  # not available on the platform or not supported by the filesystem
+                os.ftruncate(fileno, size)
+            self.mmap = mmap.mmap(fileno, size)
+        except (OSError, ValueError) as ex:
+            logger.debug('unable to memory-map %s: %s', self.path, ex)
+            return False
+        return True
+
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
         self.file.close()
         set_file_mtime(self.path_, self.mod_time_to_set)
 
@@ -190,6 +229,11 @@ class DownloadedFile:
             if bytes_read != desired_length:
                 raise TruncatedOutput(bytes_read, desired_length)
 
+    def _get_size_to_write(self) -> int:
+        if self.range_ is not None:
+            return self.range_[1] - self.range_[0] + 1
+        return self.download_version.content_length
+
     def save(self, file: BinaryIO, allow_seeking: bool | None = None) -> None:
         """
         Read data from B2 cloud and write it to a file-like object
@@ -206,11 +250,7 @@ class DownloadedFile:
 
         if self.progress_listener:
             file = WritingStreamWithProgress(file, self.progress_listener)
-            if self.range_ is not None:
-                total_bytes = self.range_[1] - self.range_[0] + 1
-            else:
-                total_bytes = self.download_version.content_length
-            self.progress_listener.set_total_bytes(total_bytes)
+            self.progress_listener.set_total_bytes(self._get_size_to_write())
         for strategy in self.download_manager.strategies:
             if strategy.is_suitable(self.download_version, allow_seeking):
                 break
@@ -231,6 +271,7 @@ class DownloadedFile:
         path_: str | pathlib.Path,
         mode: Literal['wb', 'wb+'] | None = None,
         allow_seeking: bool | None = None,
+        use_mmap: bool = False,
     ) -> None:
         """
         Open a local file and write data from B2 cloud to it, also update the mod_time.
@@ -239,6 +280,9 @@ class DownloadedFile:
         :param mode: mode in which the file should be opened
         :param allow_seeking: if False, download strategies that rely on seeking to write data
                               (parallel strategies) will be discarded.
+        :param use_mmap: if True, the file is preallocated and memory-mapped, so that parallel download
+                         streams can copy data directly into it; falls back to regular writes
+                         if the file cannot be mapped (FIFOs, stdout, ``wb`` mode, empty files)
         """
         path_ = pathlib.Path(path_)
         is_stdout = points_to_stdout(path_)
@@ -270,4 +314,6 @@ class DownloadedFile:
             mode=mode or 'wb+',
             buffering=self.write_buffer_size,
         ) as file:
+            if use_mmap:
+                file.map(self._get_size_to_write())
             return self.save(file, allow_seeking=allow_seeking)
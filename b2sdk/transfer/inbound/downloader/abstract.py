@@ -20,8 +20,11 @@ from b2sdk.encryption.setting import EncryptionSetting
 from b2sdk.file_version import DownloadVersion
 from b2sdk.session import B2Session
 from b2sdk.utils import B2TraceMetaAbstract
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
 from b2sdk.utils.range_ import Range
 
+from .buffer_pool import BufferPool
+
 
 class EmptyHasher:
     def __init__(self, *args, **kwargs):
@@ -54,8 +57,15 @@ class AbstractDownloader(metaclass=B2TraceMetaAbstract):
         max_chunk_size: int | None = None,
         align_factor: int | None = None,
         check_hash: bool = True,
+        buffer_pool: BufferPool | None = None,
+        bandwidth_limiter: BandwidthLimiter | None = None,
         **kwargs
     ):
+        """
+        :param buffer_pool: if set, downloaded data is read into buffers taken from this pool
+                            instead of being allocated for every chunk
+        :param bandwidth_limiter: if set, limits the rate at which the data is downloaded
+        """
         align_factor = align_factor or self.DEFAULT_ALIGN_FACTOR
         assert force_chunk_size is not None or (
             min_chunk_size is not None and max_chunk_size is not None and
@@ -66,6 +76,8 @@ class AbstractDownloader(metaclass=B2TraceMetaAbstract):
         self._forced_chunk_size = force_chunk_size
         self._align_factor = align_factor
         self._check_hash = check_hash
+        self._buffer_pool = buffer_pool
+        self._bandwidth_limiter = bandwidth_limiter
         self._thread_pool = thread_pool if thread_pool is not None \
             else self.DEFAULT_THREAD_POOL_CLASS()
         super().__init__(**kwargs)
@@ -0,0 +1,122 @@
+######################################################################
+#
+# File: b2sdk/transfer/inbound/downloader/buffer_pool.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import threading
+from typing import Iterator
+
+from requests.models import Response
+
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
+
+
+class BufferPool:
+    """
+    A pool of reusable ``bytearray`` buffers with a memory ceiling, shared between downloads.
+
+    If acquiring a buffer would exceed ``max_size`` bytes, the call blocks until another buffer
+    is released. A single buffer bigger than the ceiling can still be acquired if no other buffer
+    is in use, so that a download never waits forever.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        :param max_size: maximum amount of memory (in bytes) held by the buffers of the pool
+        """
+        assert max_size > 0
+        self.max_size = max_size
+        self.allocated = 0  #: size of all the buffers of the pool, in use or not
+        self._in_use = 0
+        self._free: dict[int, list[bytearray]] = {}
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> bytearray:
+        """
+        Return a buffer of exactly ``size`` bytes, reusing a released one if possible.
+        """
+        with self._condition:
+            while True:
+                free = self._free.get(size)
+                if free:
+                    buffer = free.pop()
+                    break
+                if self.allocated + size > self.max_size:
+                    self._drop_free_buffers()
+                if self.allocated + size <= self.max_size or self._in_use == 0:
+                    buffer = bytearray(size)
+                    self.allocated += size
+                    break
+                self._condition.wait()
+            self._in_use += size
+            return buffer
+
+    def release(self, buffer: bytearray) -> None:
+        """
+        Return the buffer to the pool. It must not be used by the caller anymore.
+        """
+        size = len(buffer)
+        with self._condition:
+            self._in_use -= size
+            self._free.setdefault(size, []).append(buffer)
+            self._condition.notify_all()
+
+    def _drop_free_buffers(self):
+        for buffers in self._free.values():
+            for buffer in buffers:
+                self.allocated -= len(buffer)
+        self._free.clear()
+
+
+def iter_response_content(
+    response: Response,
+    chunk_size: int,
+    buffer_pool: BufferPool | None = None,
+    bandwidth_limiter: BandwidthLimiter | None = None,
+) -> Iterator[bytes | memoryview]:
+    """
+    Iterate over the content of the response, like ``response.iter_content(chunk_size)`` does.
+
+    If a ``bandwidth_limiter`` is given, every chunk is held back until it fits in the limit.
+
+    If a ``buffer_pool`` is given and the raw stream of the response can be read as-is (it is not
+    content-encoded), the data is read with ``readinto`` into a single buffer taken from the pool,
+    which is returned to the pool when the iteration ends. The yielded memoryviews are therefore only
+    valid until the next item is requested - the consumer has to write (and hash) them synchronously.
+    """
+    if bandwidth_limiter is not None:
+        consume = bandwidth_limiter.consume
+        for data in iter_response_content(response, chunk_size, buffer_pool):
+            consume(len(data))
+            yield data
+        return
+
+    raw = getattr(response, 'raw', None)
+    if buffer_pool is None or not hasattr(raw,
+                                          'readinto') or response.headers.get('Content-Encoding'):
+        yield from response.iter_content(chunk_size=chunk_size)
+        return
+
+    readinto = raw.readinto
+    buffer = buffer_pool.acquire(chunk_size)
+    view = memoryview(buffer)
+    try:
+        while True:
+            size = 0
+            # fill the whole buffer unless the stream ends, so that writes are not smaller than they have to be
+            while size < chunk_size:
+                read = readinto(view[size:])
+                if not read:
+                    break
+                size += read
+            if not size:
+                break
+            yield view if size == chunk_size else view[:size]
+    finally:
+        buffer_pool.release(buffer)
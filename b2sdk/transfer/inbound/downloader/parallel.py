@@ -9,21 +9,32 @@
 ######################################################################
 from __future__ import annotations
 
+import contextlib
 import logging
+import mmap
+import os
 import queue
+import socket
+import stat
 import threading
 from concurrent import futures
 from io import IOBase
 from time import perf_counter_ns
 
+import requests
 from requests.models import Response
 
 from b2sdk.encryption.setting import EncryptionSetting
+from b2sdk.exception import B2Error
 from b2sdk.file_version import DownloadVersion
 from b2sdk.session import B2Session
+from b2sdk.stream.progress import WritingStreamWithProgress
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
 from b2sdk.utils.range_ import Range
 
 from .abstract import AbstractDownloader
+from .buffer_pool import BufferPool, iter_response_content
+from .segment_scheduler import Segment, SegmentScheduler
 from .stats_collector import StatsCollector
 
 logger = logging.getLogger(__name__)
@@ -51,14 +62,37 @@ class ParallelDownloader(AbstractDownloader):
     #
     FINISH_HASHING_BUFFER_SIZE = 1024**2
 
-    def __init__(self, min_part_size: int, max_streams: int | None = None, **kwargs):
+    def __init__(
+        self,
+        min_part_size: int,
+        max_streams: int | None = None,
+        positional_writes: bool = True,
+        hash_reorder_buffer_size: int | None = None,
+        min_segment_size: int | None = None,
+        **kwargs
+    ):
         """
         :param max_streams: maximum number of simultaneous streams
         :param min_part_size: minimum amount of data a single stream will retrieve, in bytes
+        :param positional_writes: if True and the destination is backed by a regular file descriptor,
+                                  each stream writes its own data with ``os.pwrite`` instead of going
+                                  through a single :class:`WriterThread`
+        :param hash_reorder_buffer_size: if set, the file is hashed as it is downloaded, in order,
+                                         keeping at most this many bytes of out-of-order data in memory;
+                                         the streams download segments (see ``min_segment_size``) small enough
+                                         to fit into the buffer, and wait for the slower ones before getting
+                                         too far ahead, so that the file does not have to be read back
+        :param min_segment_size: if set, instead of splitting the file into one part per stream, the streams
+                                 download segments of adaptive size (at least ``min_segment_size`` bytes) assigned
+                                 by a :class:`SegmentScheduler`, which lets idle streams take over the unfinished
+                                 work of slower ones
         """
         super().__init__(**kwargs)
         self.max_streams = max_streams
         self.min_part_size = min_part_size
+        self.positional_writes = positional_writes
+        self.hash_reorder_buffer_size = hash_reorder_buffer_size
+        self.min_segment_size = min_segment_size
 
     def is_suitable(self, download_version: DownloadVersion, allow_seeking: bool):
         if not super().is_suitable(download_version, allow_seeking):
@@ -91,74 +125,167 @@ class ParallelDownloader(AbstractDownloader):
         remote_range = self._get_remote_range(response, download_version)
         actual_size = remote_range.size()
         start_file_position = file.tell()
-        parts_to_download = list(
-            gen_parts(
-                remote_range,
-                Range(start_file_position, start_file_position + actual_size - 1),
-                part_count=self._get_number_of_streams(download_version.content_length),
-            )
-        )
-
-        first_part = parts_to_download[0]
+        local_range = Range(start_file_position, start_file_position + actual_size - 1)
+        num_streams = self._get_number_of_streams(download_version.content_length)
+        end_offset = local_range.start + download_version.content_length
+        chunk_size = self._get_chunk_size(actual_size)
 
         hasher = self._get_hasher()
-
-        with WriterThread(file, max_queue_depth=len(parts_to_download) * 2) as writer:
-            self._get_parts(
-                response,
-                session,
-                writer,
+        reordering_hasher = None
+        if self._check_hash and (
+            self.hash_reorder_buffer_size or self.min_segment_size is not None
+        ):
+            reordering_hasher = ReorderingHasher(
                 hasher,
-                first_part,
-                parts_to_download[1:],
-                self._get_chunk_size(actual_size),
-                encryption=encryption,
+                local_range.start,
+                max_buffered_bytes=self.hash_reorder_buffer_size or 0,
             )
+
+        segment_scheduler = self._get_segment_scheduler(
+            remote_range, local_range, num_streams, chunk_size
+        )
+        with self._get_writer(file, max_queue_depth=num_streams * 2) as writer:
+            if segment_scheduler is not None:
+                hashed_until = local_range.start
+                self._get_segments(
+                    response,
+                    session,
+                    writer,
+                    reordering_hasher,
+                    segment_scheduler,
+                    chunk_size,
+                    encryption=encryption,
+                )
+            else:
+                parts_to_download = list(
+                    gen_parts(remote_range, local_range, part_count=num_streams)
+                )
+                first_part = parts_to_download[0]
+                hashed_until = first_part.local_range.end + 1
+                self._get_parts(
+                    response,
+                    session,
+                    writer,
+                    hasher,
+                    first_part,
+                    parts_to_download[1:],
+                    chunk_size,
+                    encryption=encryption,
+                    reordering_hasher=reordering_hasher,
+                )
         bytes_written = writer.total
 
-        # At this point the hasher already consumed the data until the end of first stream.
+        # At this point the hasher already consumed the data until the end of first stream
+        # (or further, if all parts were hashed in order as they were downloaded).
         # Consume the rest of the file to complete the hashing process
         if self._check_hash:
             # we skip hashing if we would not check it - hasher object is actually a EmptyHasher instance
             # but we avoid here reading whole file (except for the first part) from disk again
-            before_hash = perf_counter_ns()
-            self._finish_hashing(first_part, file, hasher, download_version.content_length)
-            after_hash = perf_counter_ns()
-            logger.info(
-                'download stats | %s | %s total: %.3f ms',
-                file,
-                'finish_hash',
-                (after_hash - before_hash) / 1000000,
-            )
+            if reordering_hasher is not None:
+                hashed_until = reordering_hasher.hashed_offset
+            if hashed_until < end_offset:
+                before_hash = perf_counter_ns()
+                if isinstance(writer, MmapWriter):
+                    writer.update_hasher(hasher, hashed_until, end_offset)
+                else:
+                    self._finish_hashing(file, hasher, hashed_until, end_offset)
+                after_hash = perf_counter_ns()
+                logger.info(
+                    'download stats | %s | %s total: %.3f ms',
+                    file,
+                    'finish_hash',
+                    (after_hash - before_hash) / 1000000,
+                )
 
         return bytes_written, hasher.hexdigest()
 
-    def _finish_hashing(self, first_part, file, hasher, content_length):
-        end_of_first_part = first_part.local_range.end + 1
-        file.seek(end_of_first_part)
+    def _get_segment_scheduler(
+        self,
+        remote_range: Range,
+        local_range: Range,
+        num_streams: int,
+        chunk_size: int,
+    ) -> SegmentScheduler | None:
+        """
+        Return the scheduler of the segments of the download, or ``None`` if the file is split into one part per stream.
+
+        If the file is hashed as it is downloaded, the segments are limited so that the data written
+        out of order fits into the reorder buffer of the hasher.
+        """
+        min_segment_size = self.min_segment_size
+        max_segment_size = max_ahead = None
+        if self._check_hash and self.hash_reorder_buffer_size:
+            # every stream may have one more chunk which is written, but not hashed yet
+            max_ahead = self.hash_reorder_buffer_size - chunk_size
+            max_segment_size = min(max_ahead // num_streams, -(-local_range.size() // num_streams))
+            if max_segment_size >= chunk_size:
+                min_segment_size = min(min_segment_size or max_segment_size, max_segment_size)
+            else:
+                # the buffer is too small to be worth it, so the rest of the file is read back
+                max_segment_size = max_ahead = None
+        if min_segment_size is None:
+            return None
+        return SegmentScheduler(
+            remote_range,
+            local_range,
+            num_streams=num_streams,
+            min_segment_size=min_segment_size,
+            max_segment_size=max_segment_size,
+            max_ahead=max_ahead,
+        )
+
+    def _get_writer(self, file, max_queue_depth):
+        """
+        Select the writer for the destination: a :class:`MmapWriter` if the file was memory-mapped,
+        a :class:`PositionalWriter` if the file is backed by a regular file descriptor
+        (if positional writes are enabled), a :class:`WriterThread` otherwise.
+        """
+        if self.positional_writes:
+            mmap_ = MmapWriter.get_mmap(file)
+            if mmap_ is not None:
+                return MmapWriter(file, mmap_)
+            fileno = PositionalWriter.get_fileno(file)
+            if fileno is not None:
+                return PositionalWriter(file, fileno)
+        return WriterThread(file, max_queue_depth=max_queue_depth)
+
+    def _get_buffer_pool(self, writer):
+        # data read into pooled buffers has to be written before the buffer is reused,
+        # which is only guaranteed by a writer writing synchronously
+        if isinstance(writer, PositionalWriter):
+            return self._buffer_pool
+        return None
+
+    def _finish_hashing(self, file, hasher, start_offset, end_offset):
+        """
+        Read the ``[start_offset, end_offset)`` range of the file back from disk and feed it to the hasher.
+        """
+        file.seek(start_offset)
         file_read = file.read
 
-        last_offset = first_part.local_range.start + content_length
-        current_offset = end_of_first_part
-        stop = False
-        while 1:
-            data = file_read(self.FINISH_HASHING_BUFFER_SIZE)
+        current_offset = start_offset
+        while current_offset < end_offset:
+            data = file_read(min(self.FINISH_HASHING_BUFFER_SIZE, end_offset - current_offset))
             if not data:
                 break
-            if current_offset + len(data) >= last_offset:
-                to_hash = data[:last_offset - current_offset]
-                stop = True
-            else:
-                to_hash = data
             hasher.update(data)
-            current_offset += len(to_hash)
-            if stop:
-                break
+            current_offset += len(data)
 
     def _get_parts(
-        self, response, session, writer, hasher, first_part, parts_to_download, chunk_size,
-        encryption
+        self,
+        response,
+        session,
+        writer,
+        hasher,
+        first_part,
+        parts_to_download,
+        chunk_size,
+        encryption,
+        reordering_hasher=None,
     ):
+        if reordering_hasher is not None:
+            hasher = reordering_hasher.for_offset(first_part.local_range.start)
+        buffer_pool = self._get_buffer_pool(writer)
         stream = self._thread_pool.submit(
             download_first_part,
             response,
@@ -168,6 +295,8 @@ class ParallelDownloader(AbstractDownloader):
             first_part,
             chunk_size,
             encryption=encryption,
+            buffer_pool=buffer_pool,
+            bandwidth_limiter=self._bandwidth_limiter,
         )
         streams = [stream]
 
@@ -180,11 +309,143 @@ class ParallelDownloader(AbstractDownloader):
                 part,
                 chunk_size,
                 encryption=encryption,
+                hasher=reordering_hasher and reordering_hasher.for_offset(part.local_range.start),
+                buffer_pool=buffer_pool,
+                bandwidth_limiter=self._bandwidth_limiter,
             )
             streams.append(stream)
 
         futures.wait(streams)
 
+    def _get_segments(
+        self,
+        response,
+        session,
+        writer,
+        reordering_hasher,
+        scheduler,
+        chunk_size,
+        encryption,
+    ):
+        # the original response starts at the beginning of the range, so the first segment has to be assigned to it
+        first_segment = scheduler.take()
+        buffer_pool = self._get_buffer_pool(writer)
+        streams = [
+            self._thread_pool.submit(
+                download_segments,
+                response.request.url,
+                session,
+                writer,
+                scheduler,
+                chunk_size,
+                encryption=encryption,
+                hasher=reordering_hasher,
+                response=response,
+                first_segment=first_segment,
+                buffer_pool=buffer_pool,
+                bandwidth_limiter=self._bandwidth_limiter,
+            )
+        ]
+        for _ in range(scheduler.num_streams - 1):
+            stream = self._thread_pool.submit(
+                download_segments,
+                response.request.url,
+                session,
+                writer,
+                scheduler,
+                chunk_size,
+                encryption=encryption,
+                hasher=reordering_hasher,
+                buffer_pool=buffer_pool,
+                bandwidth_limiter=self._bandwidth_limiter,
+            )
+            streams.append(stream)
+
+        futures.wait(streams)
+        for stream in streams:
+            # raise the error which stopped a stream, if any, rather than report truncated output later
+            stream.result()
+
+
+class ReorderingHasher:
+    """
+    Feed data chunks written at arbitrary offsets to a hasher in the order of offsets.
+
+    Chunks which arrive ahead of the lowest not yet hashed offset are kept in memory until the data
+    preceding them arrives. If keeping a chunk would exceed ``max_buffered_bytes``, the buffered chunks
+    with the highest offsets are discarded and hashing stops at the lowest discarded offset -
+    the remainder then has to be read back from the file, starting at :attr:`hashed_offset`.
+    """
+
+    def __init__(self, hasher, start_offset: int, max_buffered_bytes: int):
+        """
+        :param hasher: hashlib-like object to feed the data to
+        :param start_offset: offset of the first byte to be hashed
+        :param max_buffered_bytes: maximum amount of out-of-order data kept in memory
+        """
+        self.hasher = hasher
+        self.hashed_offset = start_offset
+        self.max_buffered_bytes = max_buffered_bytes
+        self.buffered_bytes = 0
+        self._pending = {}
+        self._limit = None
+        self._lock = threading.Lock()
+
+    def update_at(self, offset: int, data) -> None:
+        """
+        Hash ``data`` located at ``offset``, now or as soon as all the preceding data is hashed.
+        """
+        if not data:
+            # an empty chunk at the end of a part would replace the pending first chunk of the next part
+            return
+        with self._lock:
+            if offset == self.hashed_offset:
+                self.hasher.update(data)
+                self.hashed_offset += len(data)
+                self._hash_pending()
+            elif self.hashed_offset < offset and (self._limit is None or offset < self._limit):
+                # data might be a view of a buffer which is going to be reused, so it is copied
+                self._pending[offset] = bytes(data)
+                self.buffered_bytes += len(data)
+                if self.buffered_bytes > self.max_buffered_bytes:
+                    self._evict()
+
+    def for_offset(self, offset: int) -> _PartHasher:
+        """
+        Return a hasher-like object for a stream of data starting at ``offset``.
+        """
+        return _PartHasher(self, offset)
+
+    def _hash_pending(self):
+        pending = self._pending
+        while self.hashed_offset in pending:
+            data = pending.pop(self.hashed_offset)
+            self.buffered_bytes -= len(data)
+            self.hasher.update(data)
+            self.hashed_offset += len(data)
+
+    def _evict(self):
+        pending = self._pending
+        for offset in sorted(pending, reverse=True):
+            if self.buffered_bytes <= self.max_buffered_bytes:
+                break
+            self.buffered_bytes -= len(pending.pop(offset))
+            self._limit = offset
+
+
+class _PartHasher:
+    """
+    Hasher-like adapter feeding sequential data of a single part to a :class:`ReorderingHasher`.
+    """
+
+    def __init__(self, reordering_hasher: ReorderingHasher, offset: int):
+        self.reordering_hasher = reordering_hasher
+        self.offset = offset
+
+    def update(self, data) -> None:
+        self.reordering_hasher.update_at(self.offset, data)
+        self.offset += len(data)
+
 
 class WriterThread(threading.Thread):
     """
@@ -240,6 +501,12 @@ class WriterThread(threading.Thread):
 
                 self.total += len(data)
 
+    def put(self, offset, data):
+        """
+        Schedule ``data`` to be written at ``offset`` of the file.
+        """
+        self.queue.put((False, offset, data))
+
     def __enter__(self):
         self.start()
         return self
@@ -250,14 +517,128 @@ class WriterThread(threading.Thread):
         self.stats_collector.report()
 
 
+class PositionalWriter:
+    """
+    A writer which lets every download stream write its own data chunks directly to the file descriptor
+    using positional writes (``os.pwrite``), so there is no shared queue nor a single thread limiting the
+    throughput of fast local storage.
+
+    Positional writes do not touch the file position of the descriptor, so concurrent writers don't need
+    to be synchronized. The Python-level buffer of the file object is flushed on enter and the position
+    of the file object is set to the end of the written range on exit.
+
+    It exposes the same interface as :class:`WriterThread`, so it can be used by the download functions
+    interchangeably.
+    """
+
+    STATS_DETAIL = 'pwrite'
+
+    def __init__(self, file, fileno: int | None):
+        self.file = file
+        self.fileno = fileno
+        self.total = 0
+        self.end_offset = None
+        self._lock = threading.Lock()
+        if isinstance(file, WritingStreamWithProgress):
+            self._progress_update = file._progress_update
+        else:
+            self._progress_update = None
+        self.stats_collector = StatsCollector(str(self.file), self.STATS_DETAIL, 'none')
+
+    @classmethod
+    def get_fileno(cls, file) -> int | None:
+        """
+        Return the file descriptor backing ``file`` if positional writes can be used with it, ``None`` otherwise.
+        """
+        if not hasattr(os, 'pwrite'):
+            return None
+        try:
+            fileno = file.fileno()
+            is_regular = stat.S_ISREG(os.fstat(fileno).st_mode)
+        # io.UnsupportedOperation is both an OSError and a ValueError
+        except (AttributeError, OSError, ValueError):
+            return None
+        return fileno if is_regular else None
+
+    def put(self, offset, data):
+        """
+        Write ``data`` at ``offset`` of the file, in the calling thread.
+        """
+        size = len(data)
+        self._write_at(offset, data)
+        with self._lock:
+            self.total += size
+            end_offset = offset + size
+            if self.end_offset is None or end_offset > self.end_offset:
+                self.end_offset = end_offset
+            if self._progress_update is not None:
+                self._progress_update(size)
+
+    def _write_at(self, offset, data):
+        fileno = self.fileno
+        view = memoryview(data)
+        written = 0
+        size = len(view)
+        while written < size:
+            written += os.pwrite(fileno, view[written:], offset + written)
+
+    def __enter__(self):
+        self.stats_collector.total.__enter__()
+        self.file.flush()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.end_offset is not None:
+            self.file.seek(self.end_offset)
+        self.stats_collector.total.__exit__(exc_type, exc_val, exc_tb)
+        self.stats_collector.report()
+
+
+class MmapWriter(PositionalWriter):
+    """
+    A writer which lets every download stream copy its data chunks directly into a memory-mapped file,
+    without a system call per chunk. The data can also be hashed straight from the mapping.
+
+    The file has to be mapped (and sized) upfront, see :meth:`b2sdk.v2.MtimeUpdatedFile.map`.
+    """
+
+    STATS_DETAIL = 'mmap'
+
+    def __init__(self, file, mmap_: mmap.mmap):
+        super().__init__(file, fileno=None)
+        self.mmap = mmap_
+
+    @classmethod
+    def get_mmap(cls, file) -> mmap.mmap | None:
+        """
+        Return the memory map of ``file`` if it was mapped, ``None`` otherwise.
+        """
+        if isinstance(file, WritingStreamWithProgress):
+            file = file.stream
+        mmap_ = getattr(file, 'mmap', None)
+        return mmap_ if isinstance(mmap_, mmap.mmap) else None
+
+    def _write_at(self, offset, data):
+        self.mmap[offset:offset + len(data)] = data
+
+    def update_hasher(self, hasher, start_offset, end_offset):
+        """
+        Feed the ``[start_offset, end_offset)`` range of the mapping to the hasher.
+        """
+        with memoryview(self.mmap) as view:
+            hasher.update(view[start_offset:end_offset])
+
+
 def download_first_part(
     response: Response,
     hasher,
     session: B2Session,
-    writer: WriterThread,
+    writer: WriterThread | PositionalWriter,
     first_part: PartToDownload,
     chunk_size: int,
     encryption: EncryptionSetting | None = None,
+    buffer_pool: BufferPool | None = None,
+    bandwidth_limiter: BandwidthLimiter | None = None,
 ) -> None:
     """
     :param response: response of the original GET call
@@ -267,6 +648,9 @@ def download_first_part(
     :param first_part: definition of the part to be downloaded
     :param chunk_size: size (in bytes) of read data chunks
     :param encryption: encryption mode, algorithm and key
+    :param buffer_pool: pool of buffers to read the data into; can only be used if ``writer``
+                        writes the data synchronously
+    :param bandwidth_limiter: limiter of the rate at which the data is downloaded
     """
     # This function contains a loop that has heavy impact on performance.
     # It has not been broken down to several small functions due to fear of
@@ -282,7 +666,7 @@ def download_first_part(
     # Basic tools to figure out where the time is being spent is a must for long-term
     # maintainability.
 
-    writer_queue_put = writer.queue.put
+    writer_put = writer.put
     hasher_update = hasher.update
     first_offset = first_part.local_range.start
     last_offset = first_part.local_range.end + 1
@@ -298,7 +682,9 @@ def download_first_part(
     stats_collector_write = stats_collector.write
 
     with stats_collector.total:
-        response_iterator = response.iter_content(chunk_size=chunk_size)
+        response_iterator = iter_response_content(
+            response, chunk_size, buffer_pool, bandwidth_limiter
+        )
 
         while True:
             with stats_collector_read:
@@ -308,13 +694,13 @@ def download_first_part(
                     break
 
             if first_offset + bytes_read + len(data) >= last_offset:
-                to_write = data[:last_offset - bytes_read]
+                to_write = data[:last_offset - first_offset - bytes_read]
                 stop = True
             else:
                 to_write = data
 
             with stats_collector_write:
-                writer_queue_put((False, first_offset + bytes_read, to_write))
+                writer_put(first_offset + bytes_read, to_write)
 
             with stats_collector_other:
                 hasher_update(to_write)
@@ -342,7 +728,9 @@ def download_first_part(
                 cloud_range.as_tuple(),
                 encryption=encryption,
             ) as response:
-                response_iterator = response.iter_content(chunk_size=chunk_size)
+                response_iterator = iter_response_content(
+                    response, chunk_size, buffer_pool, bandwidth_limiter
+                )
 
                 while True:
                     with stats_collector_read:
@@ -352,7 +740,7 @@ def download_first_part(
                             break
 
                     with stats_collector_write:
-                        writer_queue_put((False, first_offset + bytes_read, to_write))
+                        writer_put(first_offset + bytes_read, to_write)
 
                     with stats_collector_other:
                         hasher_update(to_write)
@@ -366,10 +754,13 @@ def download_first_part(
 def download_non_first_part(
     url: str,
     session: B2Session,
-    writer: WriterThread,
+    writer: WriterThread | PositionalWriter,
     part_to_download: PartToDownload,
     chunk_size: int,
     encryption: EncryptionSetting | None = None,
+    hasher=None,
+    buffer_pool: BufferPool | None = None,
+    bandwidth_limiter: BandwidthLimiter | None = None,
 ) -> None:
     """
     :param url: download URL
@@ -378,8 +769,13 @@ def download_non_first_part(
     :param part_to_download: definition of the part to be downloaded
     :param chunk_size: size (in bytes) of read data chunks
     :param encryption: encryption mode, algorithm and key
+    :param hasher: optional hasher object to feed to as the stream is written
+    :param buffer_pool: pool of buffers to read the data into; can only be used if ``writer``
+                        writes the data synchronously
+    :param bandwidth_limiter: limiter of the rate at which the data is downloaded
     """
-    writer_queue_put = writer.queue.put
+    writer_put = writer.put
+    hasher_update = hasher.update if hasher is not None else None
     start_range = part_to_download.local_range.start
     actual_part_size = part_to_download.local_range.size()
     bytes_read = 0
@@ -393,8 +789,11 @@ def download_non_first_part(
             'download attempts remaining: %i, bytes read already: %i. Getting range %s now.',
             retries_left, bytes_read, cloud_range
         )
-        stats_collector = StatsCollector(url, f'{cloud_range.start}:{cloud_range.end}', 'none')
+        stats_collector = StatsCollector(
+            url, f'{cloud_range.start}:{cloud_range.end}', 'none' if hasher is None else 'hash'
+        )
         stats_collector_read = stats_collector.read
+        stats_collector_other = stats_collector.other
         stats_collector_write = stats_collector.write
 
         with stats_collector.total:
@@ -403,7 +802,9 @@ def download_non_first_part(
                 cloud_range.as_tuple(),
                 encryption=encryption,
             ) as response:
-                response_iterator = response.iter_content(chunk_size=chunk_size)
+                response_iterator = iter_response_content(
+                    response, chunk_size, buffer_pool, bandwidth_limiter
+                )
 
                 while True:
                     with stats_collector_read:
@@ -413,7 +814,11 @@ def download_non_first_part(
                             break
 
                     with stats_collector_write:
-                        writer_queue_put((False, start_range + bytes_read, to_write))
+                        writer_put(start_range + bytes_read, to_write)
+
+                    if hasher_update is not None:
+                        with stats_collector_other:
+                            hasher_update(to_write)
 
                     bytes_read += len(to_write)
             retries_left -= 1
@@ -421,6 +826,130 @@ def download_non_first_part(
         stats_collector.report()
 
 
+def is_transient_error(error: Exception) -> bool:
+    """
+    Tell whether a segment which failed with the given error is worth downloading again.
+
+    Connection and read errors are, and so are B2 errors which would be retried by the HTTP layer.
+    Any other error, e.g. failure to write the file or a missing file version, is not.
+    """
+    if isinstance(error, B2Error):
+        return error.should_retry_http()
+    return isinstance(
+        error, (requests.RequestException, ConnectionError, TimeoutError, socket.timeout)
+    )
+
+
+def download_segments(
+    url: str,
+    session: B2Session,
+    writer: WriterThread | PositionalWriter,
+    scheduler: SegmentScheduler,
+    chunk_size: int,
+    encryption: EncryptionSetting | None = None,
+    hasher: ReorderingHasher | None = None,
+    response: Response | None = None,
+    first_segment: Segment | None = None,
+    buffer_pool: BufferPool | None = None,
+    bandwidth_limiter: BandwidthLimiter | None = None,
+) -> None:
+    """
+    Keep downloading segments assigned by the scheduler until there is nothing left to download.
+
+    :param url: download URL
+    :param session: B2 API session
+    :param writer: thread responsible for writing downloaded data
+    :param scheduler: scheduler assigning the segments to download
+    :param chunk_size: size (in bytes) of read data chunks
+    :param encryption: encryption mode, algorithm and key
+    :param hasher: optional hasher object to feed to as the stream is written
+    :param response: response of the original GET call, used to download ``first_segment``
+    :param first_segment: segment to start with
+    :param buffer_pool: pool of buffers to read the data into; can only be used if ``writer``
+                        writes the data synchronously
+    :param bandwidth_limiter: limiter of the rate at which the data is downloaded
+    """
+    writer_put = writer.put
+    hasher_update_at = hasher.update_at if hasher is not None else None
+    scheduler_claim = scheduler.claim
+    bytes_read = 0
+
+    stats_collector = StatsCollector(url, 'segments', 'none' if hasher is None else 'hash')
+    stats_collector_read = stats_collector.read
+    stats_collector_other = stats_collector.other
+    stats_collector_write = stats_collector.write
+
+    with stats_collector.total:
+        segment = first_segment if first_segment is not None else scheduler.take()
+        while segment is not None:
+            try:
+                while segment.remaining() > 0 and segment.retries_left > 0:
+                    try:
+                        if response is not None:
+                            # the original response is closed as soon as the first segment is read from it
+                            response_context = contextlib.closing(response)
+                            response = None
+                        else:
+                            cloud_range = scheduler.get_cloud_range(segment)
+                            logger.debug(
+                                'download attempts remaining: %i, segment: %s. Getting range %s now.',
+                                segment.retries_left, segment, cloud_range
+                            )
+                            response_context = session.download_file_from_url(
+                                url,
+                                cloud_range.as_tuple(),
+                                encryption=encryption,
+                            )
+                        with response_context as segment_response:
+                            response_iterator = iter_response_content(
+                                segment_response, chunk_size, buffer_pool, bandwidth_limiter
+                            )
+                            while True:
+                                with stats_collector_read:
+                                    try:
+                                        data = next(response_iterator)
+                                    except StopIteration:
+                                        break
+
+                                offset, allowed = scheduler_claim(segment, len(data))
+                                to_write = data if allowed == len(data) else data[:allowed]
+                                if to_write:
+                                    with stats_collector_write:
+                                        writer_put(offset, to_write)
+                                    if hasher_update_at is not None:
+                                        with stats_collector_other:
+                                            hasher_update_at(offset, to_write)
+                                    bytes_read += allowed
+                                if allowed < len(data):
+                                    # the segment is complete, possibly because its tail was taken over by another stream
+                                    break
+                    except Exception as e:
+                        if not is_transient_error(e):
+                            # retrying would not help, so the other streams are stopped and the error is
+                            # raised from download()
+                            scheduler.abort()
+                            raise
+                        # the segment goes back to the scheduler to be retried, and the stream goes on
+                        segment.retries_left -= 1
+                        logger.debug(
+                            'error downloading segment %s, attempts remaining: %i',
+                            segment,
+                            segment.retries_left,
+                            exc_info=True,
+                        )
+                        break
+                    if segment.remaining() > 0:
+                        segment.retries_left -= 1
+            finally:
+                scheduler.release(segment)
+
+            read_time = stats_collector.read.sum_of_all_entries
+            throughput = bytes_read * 1_000_000_000 / read_time if read_time else None
+            segment = scheduler.take(throughput)
+
+    stats_collector.report()
+
+
 class PartToDownload:
     """
     Hold the range of a file to download, and the range of the
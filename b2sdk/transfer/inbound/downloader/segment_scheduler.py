@@ -0,0 +1,205 @@
+######################################################################
+#
+# File: b2sdk/transfer/inbound/downloader/segment_scheduler.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import logging
+import threading
+
+from b2sdk.utils.range_ import Range
+
+logger = logging.getLogger(__name__)
+
+
+class Segment:
+    """
+    A range of the local file assigned to a single download stream.
+
+    ``end`` can be moved towards ``position`` by the :class:`SegmentScheduler` at any time,
+    when an idle stream takes over the unfinished tail of the segment.
+    """
+
+    def __init__(self, start: int, end: int, retries_left: int):
+        self.start = start
+        self.end = end
+        self.position = start  #: next offset to be written
+        self.retries_left = retries_left
+
+    def remaining(self) -> int:
+        return self.end - self.position + 1
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.start}:{self.position}:{self.end}>'
+
+
+class SegmentScheduler:
+    """
+    Work-stealing scheduler of download segments.
+
+    Instead of splitting the download into one part per stream upfront, every stream asks for
+    the next segment as soon as it finishes the previous one. The segment size is chosen from
+    the throughput measured for the stream, so that a single request takes about
+    ``SEGMENT_TARGET_DURATION`` seconds. When there is nothing left to assign, an idle stream takes over
+    a half of the biggest unfinished remainder of another (slower) stream, so that a single
+    straggler does not hold up the whole download.
+
+    Segments which were not finished (because of errors) are returned to the scheduler and
+    reassigned, as long as they have retries left.
+
+    If ``max_ahead`` is set, a new segment is not assigned until it ends at most ``max_ahead`` bytes
+    after the lowest offset which no stream has started writing yet, so that the data written out of order
+    can be kept in a buffer of about that size (i.e. to be hashed in order).
+    """
+
+    SEGMENT_TARGET_DURATION = 5  # seconds
+    MAX_SEGMENT_RETRIES = 5
+
+    def __init__(
+        self,
+        cloud_range: Range,
+        local_range: Range,
+        num_streams: int,
+        min_segment_size: int,
+        max_segment_size: int | None = None,
+        max_ahead: int | None = None,
+    ):
+        """
+        :param cloud_range: range of the remote file to download
+        :param local_range: range of the local file to write to
+        :param num_streams: number of streams downloading the segments
+        :param min_segment_size: minimum amount of data a single request will retrieve, in bytes
+        :param max_segment_size: maximum amount of data a single request will retrieve, in bytes
+        :param max_ahead: maximum distance between the lowest offset which no stream has started writing yet
+                          and the end of a new segment, in bytes
+        """
+        assert cloud_range.size() == local_range.size(), (cloud_range.size(), local_range.size())
+        assert num_streams >= 1 and min_segment_size >= 1
+        assert max_segment_size is None or max_segment_size >= min_segment_size
+        self.cloud_range = cloud_range
+        self.local_range = local_range
+        self.num_streams = num_streams
+        self.min_segment_size = min_segment_size
+        self.max_segment_size = max_segment_size
+        self.max_ahead = max_ahead
+        self._cursor = local_range.start
+        self._returned: list[Segment] = []
+        self._active: set[Segment] = set()
+        self._aborted = False
+        self._lock = threading.Lock()
+        self._progress = threading.Condition(self._lock)
+
+    def take(self, throughput: float | None = None) -> Segment | None:
+        """
+        Assign a new segment to a stream.
+
+        :param throughput: bytes per second measured so far for the stream, if known
+        :return: a segment or ``None`` if there is nothing more to download
+        """
+        with self._lock:
+            while not self._aborted and not self._returned and self._cursor <= self.local_range.end and \
+                    self._is_too_far_ahead(self._get_segment_size(throughput)):
+                # the segments which are in progress will make room when they are written
+                self._progress.wait()
+            if self._aborted:
+                return None
+            if self._returned:
+                segment = min(self._returned, key=lambda returned: returned.position)
+                self._returned.remove(segment)
+            elif self._cursor <= self.local_range.end:
+                size = self._get_segment_size(throughput)
+                segment = Segment(self._cursor, self._cursor + size - 1, self.MAX_SEGMENT_RETRIES)
+                self._cursor += size
+            else:
+                segment = self._steal()
+                if segment is None:
+                    return None
+            self._active.add(segment)
+            logger.debug('assigned download segment: %s', segment)
+            return segment
+
+    def claim(self, segment: Segment, size: int) -> tuple[int, int]:
+        """
+        Claim up to ``size`` bytes of the segment for writing.
+
+        :return: a tuple of the offset to write at and the number of bytes which can be written;
+                 if it is lower than ``size``, the segment is complete (its tail might have been taken over)
+        """
+        with self._lock:
+            offset = segment.position
+            allowed = max(0, min(size, segment.end - offset + 1))
+            segment.position += allowed
+            if self.max_ahead is not None:
+                self._progress.notify_all()
+            return offset, allowed
+
+    def release(self, segment: Segment) -> None:
+        """
+        Return the segment to the scheduler after the stream is done with it.
+
+        If the segment is not complete and has retries left, it will be reassigned.
+        """
+        with self._lock:
+            self._active.discard(segment)
+            if segment.remaining() > 0:
+                if segment.retries_left > 0:
+                    logger.debug('returning unfinished download segment: %s', segment)
+                    self._returned.append(segment)
+                else:
+                    logger.debug('giving up on download segment: %s', segment)
+            self._progress.notify_all()
+
+    def abort(self) -> None:
+        """
+        Stop assigning segments, e.g. after an error which makes completing the download impossible.
+        """
+        with self._lock:
+            self._aborted = True
+            self._progress.notify_all()
+
+    def get_cloud_range(self, segment: Segment) -> Range:
+        """
+        Return the range of the remote file which remains to be downloaded for the segment.
+        """
+        return self.cloud_range.subrange(
+            segment.position - self.local_range.start,
+            segment.end - self.local_range.start,
+        )
+
+    def _get_segment_size(self, throughput: float | None) -> int:
+        unassigned = self.local_range.end - self._cursor + 1
+        size = self.min_segment_size
+        if throughput:
+            fair_share = -(-unassigned // self.num_streams)
+            size = max(size, min(int(throughput * self.SEGMENT_TARGET_DURATION), fair_share))
+        if self.max_segment_size is not None:
+            size = min(size, self.max_segment_size)
+        if unassigned - size < self.min_segment_size:
+            # do not leave a tail which would be too small to be worth a separate request
+            size = unassigned
+        return size
+
+    def _is_too_far_ahead(self, size: int) -> bool:
+        if self.max_ahead is None or not self._active:
+            # with no segment in progress, nothing could make room, so the segment is assigned anyway
+            return False
+        lowest_unwritten = min(segment.position for segment in self._active)
+        return self._cursor + size - lowest_unwritten > self.max_ahead
+
+    def _steal(self) -> Segment | None:
+        if not self._active:
+            return None
+        victim = max(self._active, key=Segment.remaining)
+        remaining = victim.remaining()
+        if remaining < 2 * self.min_segment_size:
+            return None
+        split = victim.position + remaining // 2
+        segment = Segment(split, victim.end, self.MAX_SEGMENT_RETRIES)
+        victim.end = split - 1
+        logger.debug('split download segment %s, taking over %s', victim, segment)
+        return segment
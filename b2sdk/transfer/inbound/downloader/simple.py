@@ -19,6 +19,7 @@ from b2sdk.file_version import DownloadVersion
 from b2sdk.session import B2Session
 
 from .abstract import AbstractDownloader
+from .buffer_pool import iter_response_content
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +42,9 @@ class SimpleDownloader(AbstractDownloader):
         digest = self._get_hasher()
 
         bytes_read = 0
-        for data in response.iter_content(chunk_size=chunk_size):
+        for data in iter_response_content(
+            response, chunk_size, self._buffer_pool, self._bandwidth_limiter
+        ):
             file.write(data)
             digest.update(data)
             bytes_read += len(data)
@@ -70,8 +73,11 @@ class SimpleDownloader(AbstractDownloader):
                 new_range.as_tuple(),
                 encryption=encryption,
             ) as followup_response:
-                for data in followup_response.iter_content(
-                    chunk_size=self._get_chunk_size(actual_size)
+                for data in iter_response_content(
+                    followup_response,
+                    self._get_chunk_size(actual_size),
+                    self._buffer_pool,
+                    self._bandwidth_limiter,
                 ):
                     file.write(data)
                     digest.update(data)
@@ -0,0 +1,227 @@
+######################################################################
+#
+# File: b2sdk/transfer/inbound/downloader/streaming.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import collections
+import logging
+from io import IOBase
+
+from requests.models import Response
+
+from b2sdk.encryption.setting import EncryptionSetting
+from b2sdk.file_version import DownloadVersion
+from b2sdk.session import B2Session
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
+from b2sdk.utils.range_ import Range
+
+from .abstract import AbstractDownloader
+from .buffer_pool import iter_response_content
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingParallelDownloader(AbstractDownloader):
+    """
+    Download segments of the file concurrently, but write them to the file strictly in order,
+    so that multiple streams can be used with destinations which cannot seek (pipes, sockets, stdout).
+
+    Segments are kept in memory until all the preceding ones are written, so the amount of memory used
+    is limited by the number of segments downloaded at the same time: at most ``max_buffer_size``
+    bytes (but at least one segment) are held.
+    """
+
+    REQUIRES_SEEKING = False
+
+    def __init__(
+        self,
+        segment_size: int,
+        max_streams: int | None = None,
+        max_buffer_size: int | None = None,
+        **kwargs
+    ):
+        """
+        :param segment_size: amount of data a single stream will retrieve at once, in bytes
+        :param max_streams: maximum number of simultaneous streams
+        :param max_buffer_size: maximum amount of downloaded data kept in memory, in bytes
+        """
+        super().__init__(**kwargs)
+        self.segment_size = segment_size
+        self.max_streams = max_streams
+        self.max_buffer_size = max_buffer_size
+
+    def is_suitable(self, download_version: DownloadVersion, allow_seeking: bool):
+        if allow_seeking:
+            # a destination which can be seeked is better served by ParallelDownloader or SimpleDownloader
+            return False
+        if not super().is_suitable(download_version, allow_seeking):
+            return False
+        return self._get_number_of_streams(download_version.content_length) >= 2
+
+    def _get_number_of_streams(self, content_length):
+        num_streams = content_length // self.segment_size
+        if self.max_streams is not None:
+            num_streams = min(num_streams, self.max_streams)
+        else:
+            max_threadpool_workers = getattr(self._thread_pool, '_max_workers', None)
+            if max_threadpool_workers is not None:
+                num_streams = min(num_streams, max_threadpool_workers)
+        if self.max_buffer_size is not None:
+            num_streams = min(num_streams, max(1, self.max_buffer_size // self.segment_size))
+        return num_streams
+
+    def download(
+        self,
+        file: IOBase,
+        response: Response,
+        download_version: DownloadVersion,
+        session: B2Session,
+        encryption: EncryptionSetting | None = None,
+    ):
+        """
+        Download a file from given url using parallel download sessions and write it to the file in order.
+        """
+        remote_range = self._get_remote_range(response, download_version)
+        actual_size = remote_range.size()
+        chunk_size = self._get_chunk_size(actual_size)
+        num_streams = self._get_number_of_streams(download_version.content_length)
+        url = response.request.url
+        segments = gen_segments(remote_range, self.segment_size)
+
+        hasher = self._get_hasher()
+        hasher_update = hasher.update
+        file_write = file.write
+        bytes_written = 0
+
+        # the original response starts at the beginning of the range, so it is used for the first segment
+        in_flight = collections.deque(
+            [
+                self._thread_pool.submit(
+                    download_segment,
+                    url,
+                    session,
+                    next(segments),
+                    chunk_size,
+                    encryption=encryption,
+                    response=response,
+                    bandwidth_limiter=self._bandwidth_limiter,
+                )
+            ]
+        )
+        while len(in_flight) < num_streams:
+            segment = next(segments, None)
+            if segment is None:
+                break
+            in_flight.append(
+                self._thread_pool.submit(
+                    download_segment,
+                    url,
+                    session,
+                    segment,
+                    chunk_size,
+                    encryption=encryption,
+                    bandwidth_limiter=self._bandwidth_limiter,
+                )
+            )
+
+        try:
+            while in_flight:
+                chunks = in_flight.popleft().result()
+                for data in chunks:
+                    file_write(data)
+                    hasher_update(data)
+                    bytes_written += len(data)
+                del chunks
+                # the next segment is requested only after one was written, to stay within the memory limit
+                segment = next(segments, None)
+                if segment is not None:
+                    in_flight.append(
+                        self._thread_pool.submit(
+                            download_segment,
+                            url,
+                            session,
+                            segment,
+                            chunk_size,
+                            encryption=encryption,
+                            bandwidth_limiter=self._bandwidth_limiter,
+                        )
+                    )
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+        return bytes_written, hasher.hexdigest()
+
+
+def download_segment(
+    url: str,
+    session: B2Session,
+    cloud_range: Range,
+    chunk_size: int,
+    encryption: EncryptionSetting | None = None,
+    response: Response | None = None,
+    bandwidth_limiter: BandwidthLimiter | None = None,
+) -> list[bytes]:
+    """
+    Download a range of the file into memory.
+
+    :param url: download URL
+    :param session: B2 API session
+    :param cloud_range: range of the file to download
+    :param chunk_size: size (in bytes) of read data chunks
+    :param encryption: encryption mode, algorithm and key
+    :param response: response of the original GET call, if it starts at the beginning of ``cloud_range``
+    :param bandwidth_limiter: limiter of the rate at which the data is downloaded
+    :return: downloaded data chunks
+    """
+    size = cloud_range.size()
+    chunks = []
+    bytes_read = 0
+
+    if response is not None:
+        for data in iter_response_content(
+            response, chunk_size, bandwidth_limiter=bandwidth_limiter
+        ):
+            if bytes_read + len(data) >= size:
+                chunks.append(data[:size - bytes_read])
+                bytes_read = size
+                break
+            chunks.append(data)
+            bytes_read += len(data)
+        # since we got everything we need from original response, close the socket and free the buffer
+        response.close()
+
+    retries_left = 5  # this is hardcoded because we are going to replace the entire retry interface soon, so we'll avoid deprecation here and keep it private
+    while retries_left and bytes_read < size:
+        subrange = cloud_range.subrange(bytes_read, size - 1)
+        logger.debug(
+            'download attempts remaining: %i, bytes read already: %i. Getting range %s now.',
+            retries_left, bytes_read, subrange
+        )
+        with session.download_file_from_url(
+            url,
+            subrange.as_tuple(),
+            encryption=encryption,
+        ) as segment_response:
+            for data in iter_response_content(
+                segment_response, chunk_size, bandwidth_limiter=bandwidth_limiter
+            ):
+                chunks.append(data)
+                bytes_read += len(data)
+        retries_left -= 1
+    return chunks
+
+
+def gen_segments(cloud_range: Range, segment_size: int):
+    """
+    Generate a sequence of consecutive ranges of at most ``segment_size`` bytes covering ``cloud_range``.
+    """
+    size = cloud_range.size()
+    for offset in range(0, size, segment_size):
+        yield cloud_range.subrange(offset, min(offset + segment_size, size) - 1)
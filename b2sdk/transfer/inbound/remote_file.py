@@ -0,0 +1,218 @@
+######################################################################
+#
+# File: b2sdk/transfer/inbound/remote_file.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+import logging
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+
+from b2sdk.encryption.setting import EncryptionSetting
+from b2sdk.exception import TruncatedOutput
+from b2sdk.session import B2Session
+from b2sdk.utils.bandwidth_limiter import BandwidthLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class RemoteFileReader(io.RawIOBase):
+    """
+    A seekable, read-only file-like object reading a remote file with ranged GET requests.
+
+    The file is read in blocks of ``block_size`` bytes, which are kept in an LRU cache holding
+    at most ``cache_size`` bytes, so random reads (i.e. of a footer of a Parquet file) only download
+    the blocks which are needed. When the blocks are read one after another, the following ones
+    are downloaded in the background (if a ``thread_pool`` is given), up to ``max_prefetch_blocks``
+    blocks ahead.
+
+    Since only parts of the file are downloaded, the checksum of the file is not verified.
+    """
+
+    DEFAULT_BLOCK_SIZE = 1024 * 1024
+    DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+    DEFAULT_MAX_PREFETCH_BLOCKS = 8
+
+    # number of consecutive blocks which have to be read before prefetching starts
+    SEQUENTIAL_READS_THRESHOLD = 2
+
+    MAX_BLOCK_RETRIES = 5
+
+    def __init__(
+        self,
+        session: B2Session,
+        url: str,
+        size: int,
+        encryption: EncryptionSetting | None = None,
+        block_size: int | None = None,
+        cache_size: int | None = None,
+        max_prefetch_blocks: int | None = None,
+        thread_pool: Executor | None = None,
+        bandwidth_limiter: BandwidthLimiter | None = None,
+    ):
+        """
+        :param session: B2 API session
+        :param url: download URL of the file
+        :param size: size of the file, in bytes
+        :param encryption: encryption mode, algorithm and key
+        :param block_size: amount of data retrieved with a single request, in bytes
+        :param cache_size: maximum amount of data kept in memory (including prefetched blocks), in bytes
+        :param max_prefetch_blocks: maximum number of blocks downloaded ahead during a sequential read
+        :param thread_pool: executor used to prefetch blocks; if not set, blocks are not prefetched
+        :param bandwidth_limiter: if set, limits the rate at which the blocks are downloaded
+        """
+        super().__init__()
+        self.session = session
+        self.url = url
+        self.size = size
+        self.encryption = encryption
+        self.block_size = block_size or self.DEFAULT_BLOCK_SIZE
+        cache_size = cache_size or self.DEFAULT_CACHE_SIZE
+        assert self.block_size > 0 and cache_size > 0
+        self.max_cached_blocks = max(1, cache_size // self.block_size)
+        if max_prefetch_blocks is None:
+            max_prefetch_blocks = self.DEFAULT_MAX_PREFETCH_BLOCKS
+        # at least one block has to be left for the one being read
+        self.max_prefetch_blocks = min(max_prefetch_blocks, self.max_cached_blocks - 1)
+        self.thread_pool = thread_pool
+        self.bandwidth_limiter = bandwidth_limiter
+        self._position = 0
+        self._cache: OrderedDict[int, bytes] = OrderedDict()
+        self._prefetched: dict[int, Future] = {}
+        self._last_block = None
+        self._sequential_reads = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._check_closed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_closed()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        if position < 0:
+            raise ValueError(f'negative seek position {position}')
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        """
+        Read data into the buffer. Less data than the size of the buffer is read only at the end of the file.
+        """
+        self._check_closed()
+        view = memoryview(buffer).cast('B')
+        bytes_read = 0
+        while bytes_read < len(view) and self._position < self.size:
+            index, block_offset = divmod(self._position, self.block_size)
+            block = self._get_block(index)
+            size = min(len(block) - block_offset, len(view) - bytes_read)
+            view[bytes_read:bytes_read + size] = block[block_offset:block_offset + size]
+            bytes_read += size
+            self._position += size
+        return bytes_read
+
+    def close(self) -> None:
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
+        self._cache.clear()
+        super().close()
+
+    def _check_closed(self):
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+
+    def _get_block(self, index: int) -> bytes:
+        self._track_access(index)
+        block = self._cache.get(index)
+        if block is not None:
+            self._cache.move_to_end(index)
+        else:
+            future = self._prefetched.pop(index, None)
+            block = future.result() if future is not None else self._download_block(index)
+            self._make_room(keep=index)
+            self._cache[index] = block
+        if self._sequential_reads >= self.SEQUENTIAL_READS_THRESHOLD:
+            self._prefetch(index)
+        return block
+
+    def _track_access(self, index: int):
+        if index == self._last_block:
+            return
+        if self._last_block is not None and index == self._last_block + 1:
+            self._sequential_reads += 1
+        else:
+            # a random read - the blocks downloaded ahead are not going to be needed
+            self._sequential_reads = 0
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
+        self._last_block = index
+
+    def _prefetch(self, index: int):
+        if self.thread_pool is None:
+            return
+        # the more blocks were read sequentially, the further ahead we go
+        ahead = min(self.max_prefetch_blocks, self._sequential_reads)
+        last_index = min(index + ahead, (self.size - 1) // self.block_size)
+        for next_index in range(index + 1, last_index + 1):
+            if next_index in self._cache or next_index in self._prefetched:
+                continue
+            if not self._make_room(keep=index):
+                break
+            logger.debug('prefetching block %i of %s', next_index, self.url)
+            self._prefetched[next_index] = self.thread_pool.submit(self._download_block, next_index)
+
+    def _make_room(self, keep: int) -> bool:
+        """
+        Evict the least recently used blocks (except for ``keep``) until another block fits in the cache.
+
+        :return: whether there is room for another block
+        """
+        while len(self._cache) + len(self._prefetched) >= self.max_cached_blocks:
+            oldest = next(iter(self._cache), None)
+            if oldest is None or oldest == keep:
+                return False
+            del self._cache[oldest]
+        return True
+
+    def _download_block(self, index: int) -> bytes:
+        start = index * self.block_size
+        end = min(start + self.block_size, self.size) - 1
+        expected_size = end - start + 1
+        chunks = []
+        bytes_read = 0
+        retries_left = self.MAX_BLOCK_RETRIES
+        while retries_left and bytes_read < expected_size:
+            with self.session.download_file_from_url(
+                self.url,
+                (start + bytes_read, end),
+                encryption=self.encryption,
+            ) as response:
+                for data in response.iter_content(chunk_size=self.block_size):
+                    if self.bandwidth_limiter is not None:
+                        self.bandwidth_limiter.consume(len(data))
+                    chunks.append(data)
+                    bytes_read += len(data)
+            retries_left -= 1
+        if bytes_read < expected_size:
+            raise TruncatedOutput(bytes_read, expected_size)
+        return b''.join(chunks)[:expected_size]
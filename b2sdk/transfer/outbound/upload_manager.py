@@ -9,9 +9,12 @@
 ######################################################################
 from __future__ import annotations
 
+import collections
+import concurrent.futures as futures
 import logging
+import os
 from contextlib import ExitStack
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 from b2sdk.encryption.setting import EncryptionMode, EncryptionSetting
 from b2sdk.exception import (
@@ -21,9 +24,14 @@ from b2sdk.exception import (
 )
 from b2sdk.file_lock import FileRetentionSetting, LegalHold
 from b2sdk.http_constants import HEX_DIGITS_AT_END
+from b2sdk.progress import DoNothingProgressListener
 from b2sdk.stream.hashing import StreamWithHash
 from b2sdk.stream.progress import ReadingStreamWithProgress
+from b2sdk.stream.rate_limited import RateLimitedStream
+from b2sdk.stream.spilling import SpillingStream
+from b2sdk.stream.upload import UploadStream
 
+from ...utils.bandwidth_limiter import BandwidthLimiter
 from ...utils.thread_pool import ThreadPoolMixin
 from ..transfer_manager import TransferManager
 from .progress_reporter import PartProgressReporter
@@ -31,7 +39,9 @@ from .progress_reporter import PartProgressReporter
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from ...file_version import FileVersion
     from ...utils.typing import _TypeUploadSource
+    from .upload_source import AbstractUploadSource
 
 
 class UploadManager(TransferManager, ThreadPoolMixin):
@@ -41,6 +51,19 @@ class UploadManager(TransferManager, ThreadPoolMixin):
 
     MAX_UPLOAD_ATTEMPTS = 5
 
+    # amount of data read from a non-seekable stream which is kept in memory (the rest is spilled to a file)
+    SPILL_MAX_MEMORY_SIZE = SpillingStream.DEFAULT_MAX_MEMORY_SIZE
+
+    # used by upload_small_files if the size of the thread pool is unknown
+    DEFAULT_SMALL_FILE_UPLOADS_IN_FLIGHT = 10
+
+    def __init__(self, bandwidth_limiter: BandwidthLimiter | None = None, **kwargs):
+        """
+        :param bandwidth_limiter: if set, limits the rate at which the data of all the uploads is sent
+        """
+        super().__init__(**kwargs)
+        self.bandwidth_limiter = bandwidth_limiter
+
     @property
     def account_info(self):
         return self.services.session.account_info
@@ -58,6 +81,8 @@ class UploadManager(TransferManager, ThreadPoolMixin):
         legal_hold: LegalHold | None = None,
         custom_upload_timestamp: int | None = None,
     ):
+        # every upload thread is going to need an upload URL, so they are fetched in the background
+        self.services.session.prefetch_upload_urls(bucket_id, self._get_max_uploads())
         f = self._thread_pool.submit(
             self._upload_small_file,
             bucket_id,
@@ -73,6 +98,95 @@ class UploadManager(TransferManager, ThreadPoolMixin):
         )
         return f
 
+    def upload_small_files(
+        self,
+        bucket_id: str,
+        uploads: Iterable[tuple[AbstractUploadSource, str]],
+        content_type: str | None,
+        file_info: dict | None,
+        encryption: EncryptionSetting | None = None,
+        file_retention: FileRetentionSetting | None = None,
+        legal_hold: LegalHold | None = None,
+        max_in_flight: int | None = None,
+    ) -> Iterator[tuple[str, FileVersion | Exception]]:
+        """
+        Upload many small files as a pipeline, yielding the results as soon as the uploads finish.
+
+        SHA1 of the sources is computed by a separate pool of hashing threads, ahead of the uploads,
+        so that the checksum is sent in the headers and the upload threads only wait for the network.
+        At most ``max_in_flight`` uploads are running at the same time, each of them using its own
+        upload URL taken from the pool of the bucket, and at most as many sources are hashed ahead.
+        The upload URLs are fetched in the background while the first sources are hashed.
+
+        :param bucket_id: a bucket ID
+        :param uploads: an iterable of (upload source, file name) pairs; it is consumed lazily
+        :param content_type: the MIME type of all the files, or ``None`` to determine it from the file name
+        :param file_info: a file info to store with every file
+        :param encryption: encryption settings (``None`` if unknown)
+        :param file_retention: file retention setting
+        :param legal_hold: legal hold setting
+        :param max_in_flight: maximum number of simultaneous uploads, by default the size of the thread pool
+        :return: an iterator of (file name, file version or the exception which made the upload fail) pairs,
+                 in the order of completion
+        """
+        max_in_flight = max_in_flight or self._get_max_uploads()
+        self.services.session.prefetch_upload_urls(bucket_id, max_in_flight)
+        uploads = iter(uploads)
+        hashing = {}
+        hashed = collections.deque()
+        uploading = {}
+        sources_left = True
+        with futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as hash_pool:
+            try:
+                while True:
+                    while sources_left and len(hashing) + len(hashed) < max_in_flight:
+                        upload = next(uploads, None)
+                        if upload is None:
+                            sources_left = False
+                            break
+                        hashing[hash_pool.submit(upload[0].get_content_sha1)] = upload
+                    while hashed and len(uploading) < max_in_flight:
+                        upload_source, file_name = hashed.popleft()
+                        future = self._thread_pool.submit(
+                            self._upload_small_file,
+                            bucket_id,
+                            upload_source,
+                            file_name,
+                            content_type,
+                            file_info,
+                            DoNothingProgressListener(),
+                            encryption,
+                            file_retention,
+                            legal_hold,
+                        )
+                        uploading[future] = file_name
+                    if not hashing and not uploading:
+                        return
+                    done, _ = futures.wait(
+                        [*hashing, *uploading], return_when=futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        if future in hashing:
+                            upload = hashing.pop(future)
+                            if future.exception() is not None:
+                                yield upload[1], future.exception()
+                            else:
+                                hashed.append(upload)
+                        else:
+                            file_name = uploading.pop(future)
+                            yield file_name, future.exception() or future.result()
+            finally:
+                for future in [*hashing, *uploading]:
+                    future.cancel()
+
+    def _get_max_uploads(self) -> int:
+        """
+        Return the maximum number of uploads running at the same time, i.e. the number of upload threads.
+        """
+        return getattr(
+            self._thread_pool, '_max_workers', None
+        ) or self.DEFAULT_SMALL_FILE_UPLOADS_IN_FLIGHT
+
     def upload_part(
         self,
         bucket_id,
@@ -150,19 +264,21 @@ class UploadManager(TransferManager, ThreadPoolMixin):
                     raise AlreadyFailed(large_file_upload_state.get_error_message())
 
                 try:
-                    # reuse the stream in case of retry
-                    part_stream = part_stream or part_upload_source.open()
-                    # register stream closing callback only when reading is finally concluded
-                    stream_guard.callback(close_stream_callback, part_stream)
-
                     content_length = part_upload_source.get_content_length()
-                    input_stream = ReadingStreamWithProgress(
-                        part_stream, part_progress_listener, length=content_length
-                    )
+                    # reuse the stream in case of retry
+                    if part_stream is None:
+                        part_stream = self._open_rewindable(part_upload_source)
+                        # register stream closing callback only when reading is finally concluded
+                        stream_guard.callback(close_stream_callback, part_stream)
+                        input_stream = self._make_upload_stream(
+                            part_stream,
+                            content_length,
+                            part_progress_listener,
+                            hashed=not part_upload_source.is_sha1_known(),
+                        )
                     if part_upload_source.is_sha1_known():
                         content_sha1 = part_upload_source.get_content_sha1()
                     else:
-                        input_stream = StreamWithHash(input_stream, stream_length=content_length)
                         content_sha1 = HEX_DIGITS_AT_END
                     # it is important that `len()` works on `input_stream`
                     response = self.services.session.upload_part(
@@ -181,11 +297,55 @@ class UploadManager(TransferManager, ThreadPoolMixin):
                     if not e.should_retry_upload():
                         raise
                     exception_list.append(e)
-                    self.account_info.clear_bucket_upload_data(bucket_id)
 
         large_file_upload_state.set_error(str(exception_list[-1]))
         raise MaxRetriesExceeded(self.MAX_UPLOAD_ATTEMPTS, exception_list)
 
+    def _open_rewindable(self, upload_source: AbstractUploadSource):
+        """
+        Open the upload source, making sure the stream can be rewound when the upload is retried.
+
+        If the stream cannot seek, the data read from it is spilled to a temporary file,
+        so that retries do not have to read the source again.
+        """
+        stream = upload_source.open()
+        if stream.seekable():
+            return stream
+        return SpillingStream(
+            stream,
+            length=upload_source.get_content_length(),
+            max_memory_size=self.SPILL_MAX_MEMORY_SIZE,
+        )
+
+    def _make_upload_stream(self, stream, content_length, progress_listener, hashed):
+        """
+        Wrap the stream of an upload, so that it reports progress, is rate-limited and,
+        if ``hashed`` is set, has the hex digest of its SHA1 appended.
+
+        Local files and bytes buffers are read by a single :class:`b2sdk.stream.upload.UploadStream`,
+        other streams through a stack of wrappers.
+        """
+        upload_stream = UploadStream.from_stream(
+            stream,
+            content_length,
+            progress_listener=progress_listener,
+            hashed=hashed,
+            bandwidth_limiter=self.bandwidth_limiter,
+        )
+        if upload_stream is not None:
+            return upload_stream
+        input_stream = ReadingStreamWithProgress(
+            self._limit_rate(stream), progress_listener, length=content_length
+        )
+        if hashed:
+            input_stream = StreamWithHash(input_stream, stream_length=content_length)
+        return input_stream
+
+    def _limit_rate(self, stream):
+        if self.bandwidth_limiter is None:
+            return stream
+        return RateLimitedStream(stream, self.bandwidth_limiter)
+
     def _upload_small_file(
         self,
         bucket_id,
@@ -204,14 +364,16 @@ class UploadManager(TransferManager, ThreadPoolMixin):
         progress_listener.set_total_bytes(content_length)
         for _ in range(self.MAX_UPLOAD_ATTEMPTS):
             try:
-                with upload_source.open() as file:
-                    input_stream = ReadingStreamWithProgress(
-                        file, progress_listener, length=content_length
+                with self._open_rewindable(upload_source) as file:
+                    input_stream = self._make_upload_stream(
+                        file,
+                        content_length,
+                        progress_listener,
+                        hashed=not upload_source.is_sha1_known(),
                     )
                     if upload_source.is_sha1_known():
                         content_sha1 = upload_source.get_content_sha1()
                     else:
-                        input_stream = StreamWithHash(input_stream, stream_length=content_length)
                         content_sha1 = HEX_DIGITS_AT_END
                     # it is important that `len()` works on `input_stream`
                     response = self.services.session.upload_file(
@@ -237,6 +399,5 @@ class UploadManager(TransferManager, ThreadPoolMixin):
                 if not e.should_retry_upload():
                     raise
                 exception_info_list.append(e)
-                self.account_info.clear_bucket_upload_data(bucket_id)
 
         raise MaxRetriesExceeded(self.MAX_UPLOAD_ATTEMPTS, exception_info_list)
@@ -202,6 +202,9 @@ class UploadSourceLocalFileRange(UploadSourceLocalFileBase):
 
 
 class UploadSourceLocalFile(UploadSourceLocalFileBase):
+    # blocks of the local file read ahead of hashing when checking whether an incremental upload is possible
+    HASHING_READ_AHEAD_BLOCKS = 4
+
     def get_incremental_sources(
         self,
         file_version: BaseFileVersion,
@@ -247,7 +250,7 @@ class UploadSourceLocalFile(UploadSourceLocalFileBase):
         # We're calculating hexdigest of the first N bytes of the file. However, if the sha1 differs,
         # we'll be needing the whole hash of the file anyway. So we can use this partial information.
         with self.open() as fp:
-            digester = IncrementalHexDigester(fp)
+            digester = IncrementalHexDigester(fp, read_ahead_blocks=self.HASHING_READ_AHEAD_BLOCKS)
             hex_digest = digester.update_from_stream(file_version.size)
             if hex_digest != content_sha1:
                 logger.debug(
@@ -0,0 +1,300 @@
+######################################################################
+#
+# File: b2sdk/transfer/scheduler.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import atexit
+import collections
+import itertools
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from enum import Enum, IntEnum, unique
+from typing import Callable
+
+
+@unique
+class TransferClass(Enum):
+    UPLOAD = 'upload'
+    COPY = 'copy'
+    DOWNLOAD = 'download'
+
+
+@unique
+class TransferPriority(IntEnum):
+    """
+    Priority of the transfers; the tasks of a higher priority (lower value) are run first.
+    """
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+_local = threading.local()
+
+
+def get_transfer_priority() -> TransferPriority:
+    """
+    Return the priority of the transfers started by the current thread.
+    """
+    return getattr(_local, 'priority', TransferPriority.NORMAL)
+
+
+@contextmanager
+def transfer_priority(priority: TransferPriority):
+    """
+    Set the priority of the transfers started by the current thread within the context.
+
+    The tasks run by the :class:`TransferScheduler` inherit the priority of the thread which submitted them.
+    """
+    previous = get_transfer_priority()
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def run_with_transfer_priority(priority: TransferPriority, fn: Callable, *args, **kwargs):
+    """
+    Call the function with the given transfer priority, i.e. in a thread of another executor.
+    """
+    with transfer_priority(priority):
+        return fn(*args, **kwargs)
+
+
+class _Task:
+    __slots__ = ('future', 'fn', 'args', 'kwargs', 'transfer_class', 'priority', 'group')
+
+    def __init__(self, future, fn, args, kwargs, transfer_class, priority, group):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.transfer_class = transfer_class
+        self.priority = priority
+        self.group = group
+
+
+class TransferScheduler:
+    """
+    Run the tasks of all the transfer managers in one set of worker threads.
+
+    Every class of transfers (uploads, copies, downloads) has a number of workers reserved for it.
+    When a worker is free, it takes the next task:
+
+    * of a class running fewer tasks than its reserved workers, if there is one,
+    * otherwise of any class, borrowing the workers the other classes do not use -
+      but one worker is kept free for each of the other classes which does not use all its reserved workers,
+      so that a flood of tasks of one class cannot keep the tasks of another class waiting.
+
+    Among those, the tasks of the highest :class:`TransferPriority` are run first, and the files
+    take turns, so that the parts of a huge file do not keep the other files waiting.
+    The tasks of a file are the ones submitted by the same thread, or by the tasks of the same file.
+
+    The tasks already scheduled are run before the interpreter exits, like in :class:`concurrent.futures.ThreadPoolExecutor`.
+
+    .. note:
+        This class is thread-safe.
+    """
+
+    DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+    def __init__(self, thread_name_prefix: str = 'b2-transfer'):
+        """
+        :param thread_name_prefix: prefix of the names of the worker threads
+        """
+        self.thread_name_prefix = thread_name_prefix
+        self._condition = threading.Condition()
+        self._max_workers = {}
+        self._running = collections.Counter()
+        # priority -> (group, transfer class) -> tasks; the order of the groups is the order in which they take turns
+        self._queues = {}
+        self._threads = set()
+        self._thread_counter = itertools.count()
+        self._idle = 0
+        self._shutdown = False
+        _schedulers.add(self)
+
+    def get_executor(
+        self, transfer_class: TransferClass, max_workers: int | None = None
+    ) -> TransferClassExecutor:
+        """
+        Return an executor submitting the tasks of a transfer class to the scheduler.
+
+        :param transfer_class: class of the transfers
+        :param max_workers: number of workers reserved for the class
+        """
+        self.set_max_workers(transfer_class, max_workers)
+        return TransferClassExecutor(self, transfer_class)
+
+    def set_max_workers(self, transfer_class: TransferClass, max_workers: int | None = None):
+        """
+        Change the number of workers reserved for a transfer class.
+        """
+        assert max_workers is None or max_workers > 0
+        with self._condition:
+            self._max_workers[transfer_class] = max_workers or self.DEFAULT_MAX_WORKERS
+            # the workers above the new total exit when they are idle
+            self._condition.notify_all()
+            self._idle = 0
+            self._start_workers()
+
+    def get_max_workers(self, transfer_class: TransferClass | None = None) -> int:
+        """
+        Return the number of workers reserved for a transfer class, or the total number of workers.
+        """
+        with self._condition:
+            if transfer_class is None:
+                return self._get_total_workers()
+            return self._max_workers[transfer_class]
+
+    def submit(self, transfer_class: TransferClass, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Schedule a task of a transfer class, with the transfer priority of the current thread.
+        """
+        future = Future()
+        priority = get_transfer_priority()
+        group = getattr(_local, 'group', None) or threading.get_ident()
+        task = _Task(future, fn, args, kwargs, transfer_class, priority, group)
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new transfers after shutdown')
+            assert transfer_class in self._max_workers, transfer_class
+            groups = self._queues.setdefault(priority, collections.OrderedDict())
+            # the tasks of different classes do not wait behind each other
+            groups.setdefault((group, transfer_class), collections.deque()).append(task)
+            if self._idle:
+                self._idle -= 1
+                self._condition.notify()
+            else:
+                self._start_workers()
+        return future
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the workers after they run the tasks already scheduled.
+        """
+        with self._condition:
+            self._shutdown = True
+            self._idle = 0
+            self._condition.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _get_total_workers(self) -> int:
+        return sum(self._max_workers.values())
+
+    def _start_workers(self):
+        missing_workers = min(
+            self._get_total_workers() - len(self._threads),
+            sum(len(tasks) for groups in self._queues.values() for tasks in groups.values()),
+        )
+        for _ in range(missing_workers):
+            thread = threading.Thread(
+                target=self._work,
+                name=f'{self.thread_name_prefix}-{next(self._thread_counter)}',
+                daemon=True,
+            )
+            self._threads.add(thread)
+            thread.start()
+
+    def _take_task(self) -> _Task | None:
+        for within_reserved_workers in (True, False):
+            for priority in sorted(self._queues):
+                groups = self._queues[priority]
+                for group, tasks in groups.items():
+                    transfer_class = tasks[0].transfer_class
+                    if self._running[transfer_class] >= self._max_workers[transfer_class] and \
+                            (within_reserved_workers or not self._can_borrow(transfer_class)):
+                        continue
+                    task = tasks.popleft()
+                    # the group goes to the end of the line
+                    del groups[group]
+                    if tasks:
+                        groups[group] = tasks
+                    elif not groups:
+                        del self._queues[priority]
+                    self._running[transfer_class] += 1
+                    return task
+        return None
+
+    def _can_borrow(self, transfer_class: TransferClass) -> bool:
+        free_workers = self._get_total_workers() - sum(self._running.values())
+        kept_free = sum(
+            1 for other_class, max_workers in self._max_workers.items()
+            if other_class != transfer_class and self._running[other_class] < max_workers
+        )
+        return free_workers > kept_free
+
+    def _work(self):
+        thread = threading.current_thread()
+        while True:
+            with self._condition:
+                task = self._take_task()
+                while task is None:
+                    if self._shutdown or len(self._threads) > self._get_total_workers():
+                        self._threads.discard(thread)
+                        return
+                    self._idle += 1
+                    self._condition.wait()
+                    task = self._take_task()
+            self._run(task)
+            with self._condition:
+                self._running[task.transfer_class] -= 1
+
+    def _run(self, task: _Task):
+        if not task.future.set_running_or_notify_cancel():
+            return
+        _local.group = task.group
+        try:
+            with transfer_priority(task.priority):
+                result = task.fn(*task.args, **task.kwargs)
+        except BaseException as exc:
+            task.future.set_exception(exc)
+        else:
+            task.future.set_result(result)
+        finally:
+            _local.group = None
+
+
+_schedulers = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_schedulers():
+    # the workers are daemon threads, so that the idle ones do not keep the interpreter alive,
+    # but the scheduled transfers are not interrupted
+    for scheduler in list(_schedulers):
+        scheduler.shutdown()
+
+
+class TransferClassExecutor(Executor):
+    """
+    Executor submitting the tasks of a transfer class to a :class:`TransferScheduler`.
+    """
+
+    def __init__(self, scheduler: TransferScheduler, transfer_class: TransferClass):
+        self.scheduler = scheduler
+        self.transfer_class = transfer_class
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        return self.scheduler.submit(self.transfer_class, fn, *args, **kwargs)
+
+    @property
+    def _max_workers(self) -> int:
+        # same as in ThreadPoolExecutor, for the code sizing its work to the number of threads
+        return self.scheduler.get_max_workers(self.transfer_class)
+
+    def set_size(self, max_workers: int) -> None:
+        self.scheduler.set_max_workers(self.transfer_class, max_workers)
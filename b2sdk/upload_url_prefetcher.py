@@ -0,0 +1,129 @@
+######################################################################
+#
+# File: b2sdk/upload_url_prefetcher.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from b2sdk.exception import B2Error
+
+logger = logging.getLogger(__name__)
+
+
+class UploadUrlPrefetcher:
+    """
+    Keep the number of upload URLs of a bucket at a target size, getting the missing ones in the background
+    and putting them to the upload URL pool.
+
+    The URLs which exist are counted (whether they are in the pool or taken by an upload), so that
+    a URL evicted after a failed upload is replaced, while the URLs returned to the pool after
+    successful uploads are not fetched again.
+
+    .. note:
+        This class is thread-safe.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        get_upload_url: Callable[[str], dict],
+        put_upload_url: Callable[[str, str, str], None],
+        max_workers: int | None = None,
+    ):
+        """
+        :param get_upload_url: a function calling ``b2_get_upload_url`` for a bucket ID
+        :param put_upload_url: a function putting a bucket ID, upload URL and auth token to the pool
+        :param max_workers: maximum number of upload URLs fetched at the same time
+        """
+        self.get_upload_url = get_upload_url
+        self.put_upload_url = put_upload_url
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self._lock = threading.Lock()
+        self._executor = None
+        self._target_sizes = {}
+        self._url_counts = collections.Counter()
+        self._pending_counts = collections.Counter()
+
+    def warm_up(self, bucket_id: str, target_size: int):
+        """
+        Start getting upload URLs for the bucket in the background, until there are ``target_size`` of them.
+        The target is kept, so that the URLs evicted later are replaced.
+
+        :param bucket_id: a bucket ID
+        :param target_size: number of upload URLs to keep
+        """
+        with self._lock:
+            self._target_sizes[bucket_id] = max(self._target_sizes.get(bucket_id, 0), target_size)
+        self._refill(bucket_id)
+
+    def url_fetched(self, bucket_id: str):
+        """
+        Count an upload URL fetched without the prefetcher.
+        """
+        with self._lock:
+            self._url_counts[bucket_id] += 1
+
+    def url_evicted(self, bucket_id: str):
+        """
+        Count an upload URL which was not returned to the pool (i.e. because the upload failed),
+        and start getting a new one if the number of URLs fell below the target.
+        """
+        with self._lock:
+            if self._url_counts[bucket_id] > 0:
+                self._url_counts[bucket_id] -= 1
+        self._refill(bucket_id)
+
+    def reset(self):
+        """
+        Forget the counts of the upload URLs, after the upload URL pools were cleared.
+        """
+        with self._lock:
+            self._url_counts.clear()
+
+    def refill(self, bucket_id: str):
+        """
+        Start getting upload URLs for the bucket in the background, if there are fewer than the target
+        (i.e. after the counts were reset).
+        """
+        self._refill(bucket_id)
+
+    def _refill(self, bucket_id: str):
+        with self._lock:
+            target_size = self._target_sizes.get(bucket_id, 0)
+            missing = target_size - self._url_counts[bucket_id] - self._pending_counts[bucket_id]
+            if missing <= 0:
+                return
+            self._pending_counts[bucket_id] += missing
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='upload-url-prefetch'
+                )
+            executor = self._executor
+        logger.debug('prefetching %i upload URLs of bucket %s', missing, bucket_id)
+        for _ in range(missing):
+            executor.submit(self._fetch, bucket_id)
+
+    def _fetch(self, bucket_id: str):
+        fetched = False
+        try:
+            response = self.get_upload_url(bucket_id)
+            self.put_upload_url(bucket_id, response['uploadUrl'], response['authorizationToken'])
+            fetched = True
+        except B2Error:
+            # the upload which needs the URL is going to get it (or fail) by itself
+            logger.debug('prefetching an upload URL of bucket %s failed', bucket_id, exc_info=True)
+        finally:
+            with self._lock:
+                self._pending_counts[bucket_id] -= 1
+                self._url_counts[bucket_id] += fetched
@@ -15,12 +15,14 @@ import logging
 import os
 import pathlib
 import platform
+import queue
 import re
+import threading
 import time
 from dataclasses import dataclass, field
 from decimal import Decimal
 from itertools import chain
-from typing import Any, Iterator, NewType, TypeVar
+from typing import Any, Iterable, Iterator, NewType, TypeVar
 from urllib.parse import quote, unquote_plus
 
 from logfury.v1 import DefaultTraceAbstractMeta, DefaultTraceMeta, limit_trace_arguments, disable_trace, trace_call
@@ -141,6 +143,9 @@ def hex_sha1_of_stream(input_stream: ReadOnlyStream, content_length: int) -> Sha
 class IncrementalHexDigester:
     """
     Calculates digest of a stream or parts of it.
+
+    If ``read_ahead_blocks`` is set, the stream is read on a separate thread, up to that many blocks
+    ahead of the digest, so that reading from disk overlaps hashing.
     """
     stream: ReadOnlyStream
     digest: 'hashlib._Hash' = field(  # noqa (_Hash is a dynamic object)
@@ -148,6 +153,7 @@ class IncrementalHexDigester:
     )
     read_bytes: int = 0
     block_size: int = 1024 * 1024
+    read_ahead_blocks: int = 0
 
     @property
     def hex_digest(self) -> Sha1HexDigest:
@@ -160,6 +166,18 @@ class IncrementalHexDigester:
         """
         :param limit: How many new bytes try to read from the stream. Default None – read until nothing left.
         """
+        if self.read_ahead_blocks > 0:
+            blocks = self._read_blocks_ahead(limit)
+        else:
+            blocks = self._read_blocks(limit)
+
+        for data in blocks:
+            self.digest.update(data)
+            self.read_bytes += len(data)
+
+        return self.hex_digest
+
+    def _read_blocks(self, limit: int | None) -> Iterator[bytes]:
         offset = 0
 
         while True:
@@ -170,13 +188,45 @@ class IncrementalHexDigester:
             data = self.stream.read(to_read)
             data_len = len(data)
             if data_len > 0:
-                self.digest.update(data)
-                self.read_bytes += data_len
+                yield data
                 offset += data_len
             if data_len < to_read or to_read == 0:
                 break
 
-        return self.hex_digest
+    def _read_blocks_ahead(self, limit: int | None) -> Iterable[bytes]:
+        # the reader stops at the limit, so the stream position is the same as without reading ahead
+        blocks = queue.Queue(self.read_ahead_blocks)
+        stop = threading.Event()
+
+        def read():
+            try:
+                for data in self._read_blocks(limit):
+                    blocks.put(data)
+                    if stop.is_set():
+                        return
+                blocks.put(None)
+            except Exception as e:
+                blocks.put(e)
+
+        reader = threading.Thread(target=read, name='read-ahead', daemon=True)
+        reader.start()
+        try:
+            while True:
+                data = blocks.get()
+                if data is None:
+                    break
+                if isinstance(data, Exception):
+                    raise data
+                yield data
+        finally:
+            stop.set()
+            while reader.is_alive():
+                # make room for the block the reader might be waiting to put
+                try:
+                    blocks.get(timeout=0.01)
+                except queue.Empty:
+                    pass
+            reader.join()
 
 
 def hex_sha1_of_unlimited_stream(
@@ -0,0 +1,74 @@
+######################################################################
+#
+# File: b2sdk/utils/bandwidth_limiter.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import threading
+import time
+
+
+class BandwidthLimiter:
+    """
+    Limit the rate of data transferred by all the threads sharing the limiter, with a token bucket.
+
+    The transfers reserve the time needed to transfer their data in the order in which they ask for it,
+    so the bandwidth is shared fairly between them.  Up to ``burst_time`` seconds of unused bandwidth
+    can be used at once.
+
+    .. note:
+        This class is thread-safe.
+    """
+
+    DEFAULT_BURST_TIME = 0.5  # seconds
+
+    def __init__(self, rate: float | None = None, burst_time: float | None = None):
+        """
+        :param rate: maximum number of bytes per second, or ``None`` for no limit
+        :param burst_time: how many seconds worth of data can be transferred at once
+        """
+        self._lock = threading.Lock()
+        self._rate = None
+        self._next_free_time = 0.0
+        self.burst_time = self.DEFAULT_BURST_TIME if burst_time is None else burst_time
+        self.set_rate(rate)
+
+    @property
+    def rate(self) -> float | None:
+        return self._rate
+
+    def set_rate(self, rate: float | None):
+        """
+        Change the limit.  The transfers in progress adjust to it with their next chunk of data.
+
+        :param rate: maximum number of bytes per second, or ``None`` for no limit
+        """
+        assert rate is None or rate > 0
+        with self._lock:
+            self._rate = rate
+
+    def is_limited(self) -> bool:
+        return self._rate is not None
+
+    def consume(self, size: int):
+        """
+        Wait until ``size`` bytes can be transferred without exceeding the limit.
+        """
+        if self._rate is None:
+            return
+        with self._lock:
+            rate = self._rate
+            if rate is None:
+                return
+            now = time.monotonic()
+            # the data is sent when the bandwidth reserved by the earlier transfers is used up,
+            # but up to the burst time in advance
+            self._next_free_time = max(self._next_free_time, now) + size / rate
+            delay = self._next_free_time - self.burst_time - now
+        if delay > 0:
+            time.sleep(delay)
@@ -52,6 +52,7 @@ class B2Folder(v2.B2Folder, AbstractFolder):
             self.folder_name,
             show_versions=True,
             recursive=True,
+            prefetch_pages=self.LIST_PREFETCH_PAGES,
         ):
             yield file_version
 
@@ -44,6 +44,8 @@ class ThreadPoolMixin(v3.ThreadPoolMixin):
     # This method is used in CLI even though it doesn't belong to the public API
     def set_thread_pool_size(self, max_workers: int) -> None:
         self._thread_pool.set_size(max_workers)
+        # the connection pools are sized for the number of transfer threads
+        self.services.api._update_http_pool_maxsize()
 
 
 class DownloadManager(v3.DownloadManager, ThreadPoolMixin):
@@ -19,6 +19,7 @@ from apiver_deps import (
     AbstractAccountInfo,
     SqliteAccountInfo,
 )
+from apiver_deps_exception import MissingAccountData
 
 from .fixtures import *
 
@@ -65,6 +66,46 @@ class TestDatabseMigrations:
         assert (100, 5000000) == sizes
 
 
+class TestSnapshotCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, sqlite_account_info_factory, account_info_default_data):
+        self.sqlite_account_info_factory = sqlite_account_info_factory
+        self.account_info_default_data = account_info_default_data
+
+    def test_reads_do_not_reload(self, mocker):
+        account_info = self.sqlite_account_info_factory()
+        account_info.set_auth_data(**self.account_info_default_data)
+        assert account_info.get_api_url() == self.account_info_default_data['api_url']
+
+        load_snapshot = mocker.spy(account_info, '_load_snapshot')
+        for _ in range(3):
+            account_info.get_api_url()
+            account_info.get_account_auth_token()
+            account_info.get_bucket_id_or_none_from_bucket_name('bucket')
+        assert load_snapshot.call_count == 0
+
+    def test_changes_of_other_instance_are_visible(self):
+        account_info = self.sqlite_account_info_factory()
+        other_account_info = self.sqlite_account_info_factory(file_name=account_info.filename)
+        account_info.set_auth_data(**self.account_info_default_data)
+        auth_token = self.account_info_default_data['auth_token']
+        assert other_account_info.get_account_auth_token() == auth_token
+        assert other_account_info.get_bucket_id_or_none_from_bucket_name('bucket') is None
+
+        data = dict(self.account_info_default_data, auth_token='new_auth')
+        account_info.set_auth_data(**data)
+        account_info.refresh_entire_bucket_name_cache([('bucket', 'bucket_id')])
+        assert other_account_info.get_account_auth_token() == 'new_auth'
+        assert other_account_info.get_bucket_id_or_none_from_bucket_name('bucket') == 'bucket_id'
+        assert other_account_info.get_bucket_name_or_none_from_bucket_id('bucket_id') == 'bucket'
+        assert other_account_info.list_bucket_names_ids() == [('bucket', 'bucket_id')]
+
+        other_account_info.clear()
+        with pytest.raises(MissingAccountData):
+            account_info.get_account_auth_token()
+        assert account_info.list_bucket_names_ids() == []
+
+
 class TestSqliteAccountProfileFileLocation:
     @pytest.fixture(autouse=True)
     def setup(self, monkeypatch, tmpdir):
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import datetime
 import locale
+import socket
 import sys
 from unittest.mock import MagicMock, call, patch
 
@@ -347,6 +348,81 @@ class TestB2HttpUserAgentAppend(TestB2Http):
     EXPECTED_HEADERS = {**TestB2Http.EXPECTED_HEADERS, 'User-Agent': f'{USER_AGENT} {UA_APPEND}'}
 
 
+@pytest.mark.apiver(from_ver=2)
+class TestConnectionPool:
+    def get_adapter(self, b2_http):
+        return b2_http.session.adapters['']
+
+    def test_default(self):
+        adapter = self.get_adapter(B2Http(B2HttpApiConfig()))
+        assert adapter._pool_maxsize == requests.adapters.DEFAULT_POOLSIZE
+        assert adapter._pool_block is False
+        assert adapter.socket_options is None
+
+    def test_options(self):
+        b2_http = B2Http(
+            B2HttpApiConfig(
+                pool_maxsize=50,
+                pool_connections=3,
+                pool_block=True,
+                keep_alive_idle=30,
+                socket_options=[(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024 * 1024)],
+            )
+        )
+        adapter = self.get_adapter(b2_http)
+        assert adapter._pool_maxsize == 50
+        assert adapter._pool_connections == 3
+        assert adapter._pool_block is True
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.socket_options
+        assert (socket.SOL_SOCKET, socket.SO_RCVBUF, 1024 * 1024) in adapter.socket_options
+        assert adapter.poolmanager.connection_pool_kw['socket_options'] == adapter.socket_options
+
+        b2_http.set_pool_maxsize(100)  # set explicitly, so not adjusted
+        assert self.get_adapter(b2_http)._pool_maxsize == 50
+
+    def test_set_pool_maxsize(self):
+        b2_http = B2Http(B2HttpApiConfig(decode_content=True, pool_block=True))
+        b2_http.set_pool_maxsize(100)
+        adapter = self.get_adapter(b2_http)
+        assert adapter._pool_maxsize == 100
+        assert adapter._pool_block is True
+
+    def test_set_pool_maxsize_session_not_managed(self):
+        b2_http = B2Http(B2HttpApiConfig(decode_content=True))
+        adapters = dict(b2_http.session.adapters)
+        b2_http.set_pool_maxsize(100)
+        assert b2_http.session.adapters == adapters
+
+    def test_sized_by_b2api(self):
+        api = apiver_deps.B2Api(
+            apiver_deps.InMemoryAccountInfo(),
+            max_upload_workers=30,
+            max_download_workers=20,
+            max_copy_workers=5,
+        )
+        adapter = self.get_adapter(api.session.raw_api.b2_http)
+        assert adapter._pool_maxsize == 55 + apiver_deps.B2Api.EXTRA_HTTP_CONNECTIONS
+
+    @pytest.mark.apiver(to_ver=2)
+    def test_resized_with_thread_pool(self):
+        api = apiver_deps.B2Api(
+            apiver_deps.InMemoryAccountInfo(),
+            max_upload_workers=30,
+            max_download_workers=20,
+            max_copy_workers=5,
+        )
+        api.services.download_manager.set_thread_pool_size(40)
+        adapter = self.get_adapter(api.session.raw_api.b2_http)
+        assert adapter._pool_maxsize == 75 + apiver_deps.B2Api.EXTRA_HTTP_CONNECTIONS
+
+        api = apiver_deps.B2Api(
+            apiver_deps.InMemoryAccountInfo(),
+            api_config=B2HttpApiConfig(pool_maxsize=50),
+        )
+        api.services.download_manager.set_thread_pool_size(40)
+        assert self.get_adapter(api.session.raw_api.b2_http)._pool_maxsize == 50
+
+
 class TestSetLocaleContextManager(TestBase):
     def test_set_locale_context_manager(self):
         # C.UTF-8 on Ubuntu 18.04 Bionic, C.utf8 on Ubuntu 22.04 Jammy
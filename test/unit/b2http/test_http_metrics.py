@@ -0,0 +1,124 @@
+######################################################################
+#
+# File: test/unit/b2http/test_http_metrics.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from apiver_deps import B2Http, B2HttpApiConfig, HttpMetricsCollector, RequestMetrics
+from apiver_deps_exception import ServiceError
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep the connections alive
+    fail_count = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        if Handler.fail_count:
+            Handler.fail_count -= 1
+            self.send_response(503)
+            body = b'{"status": 503, "code": "service_unavailable", "message": "busy"}'
+        else:
+            self.send_response(200)
+            body = b'{"color": "blue"}'
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    Handler.fail_count = 0
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_metrics(server_url):
+    collector = HttpMetricsCollector()
+    recorded = []
+    b2_http = B2Http(B2HttpApiConfig(metrics_sinks=[collector], install_clock_skew_hook=False))
+    b2_http.add_metrics_sink(type('Sink', (), {'record': lambda self, m: recorded.append(m)})())
+    url = server_url + '/b2api/v3/b2_list_buckets'
+
+    assert b2_http.post_json_return_json(url, {}, {'accountId': 'a'}) == {'color': 'blue'}
+    Handler.fail_count = 1
+    with patch('time.sleep') as sleep:
+        assert b2_http.post_json_return_json(url, {}, {'accountId': 'a'}) == {'color': 'blue'}
+    sleep.assert_called_once_with(1.0)
+
+    first, second = recorded
+    assert first.api_name == 'b2_list_buckets'
+    assert first.host == '127.0.0.1'
+    assert first.method == 'POST'
+    assert first.status_code == 200
+    assert first.tries == 1
+    assert first.new_connections == 1
+    assert first.connection_reused is False
+    assert first.connect_time > 0
+    assert first.tls_time == 0
+    assert first.bytes_sent == len(b'{"accountId": "a"}')
+    assert first.bytes_received == len(b'{"color": "blue"}')
+    assert first.duration >= first.time_to_first_byte > 0
+
+    assert second.tries == 2
+    assert second.retry_sleep_time == 1.0
+    assert second.new_connections == 0
+    assert second.connection_reused is True
+    assert not second.failed
+
+    counters = collector.snapshot()['b2_list_buckets']['127.0.0.1']
+    assert counters['requests'] == 2
+    assert counters['tries'] == 3
+    assert counters['failures'] == 0
+    assert counters['new_connections'] == 1
+    assert counters['reused_connections'] == 1
+    assert counters['retry_sleep_time'] == 1.0
+
+    collector.reset()
+    assert collector.snapshot() == {}
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_metrics_failure(server_url):
+    collector = HttpMetricsCollector()
+    b2_http = B2Http(B2HttpApiConfig(metrics_sinks=[collector], install_clock_skew_hook=False))
+    Handler.fail_count = 2
+    with patch('time.sleep'), pytest.raises(ServiceError):
+        b2_http.post_json_return_json(
+            server_url + '/b2api/v3/b2_get_upload_url', {}, {}, try_count=2
+        )
+    counters = collector.snapshot()['b2_get_upload_url']['127.0.0.1']
+    assert counters['failures'] == 1
+    assert counters['tries'] == 2
+
+
+@pytest.mark.parametrize(
+    'url,api_name',
+    [
+        ('https://api.backblazeb2.com/b2api/v3/b2_list_buckets', 'b2_list_buckets'),
+        ('https://pod.backblaze.com/b2api/v3/b2_upload_file/bucket/token', 'b2_upload_file'),
+        ('https://f000.backblazeb2.com/file/bucket/dir/file.txt', 'download_file_by_name'),
+        ('https://example.com/something', 'other'),
+    ],
+)
+def test_api_name(url, api_name):
+    assert RequestMetrics.from_url('GET', url).api_name == api_name
@@ -0,0 +1,143 @@
+######################################################################
+#
+# File: test/unit/b2http/test_http_upload.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import hashlib
+import io
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+from apiver_deps import (
+    B2Http,
+    B2HttpApiConfig,
+    RangeOfInputStream,
+    ReadingStreamWithProgress,
+    StreamWithHash,
+    UploadStream,
+)
+
+from b2sdk.http_upload import FileRange, UploadBody
+
+DATA = bytes(range(256)) * 1000
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    bodies = []
+
+    def do_POST(self):
+        Handler.bodies.append(self.rfile.read(int(self.headers['Content-Length'])))
+        body = b'{"color": "blue"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    Handler.bodies = []
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / 'file'
+    path.write_bytes(DATA)
+    with open(path, 'rb') as file:
+        yield file
+
+
+def test_blocks():
+    listener = MagicMock()
+    stream = ReadingStreamWithProgress(io.BytesIO(DATA), listener, length=len(DATA))
+    chunks = list(UploadBody(stream, len(DATA), 100000))
+    assert [len(chunk) for chunk in chunks] == [100000, 100000, 56000]
+    assert b''.join(chunks) == DATA
+    listener.bytes_completed.assert_called_with(len(DATA))
+
+
+def test_file_range(local_file):
+    listener = MagicMock()
+    stream = ReadingStreamWithProgress(
+        RangeOfInputStream(local_file, 1000, 50000), listener, length=50000
+    )
+    (file_range,) = UploadBody(stream, 50000, 20000, send_file_ranges=True)
+    assert isinstance(file_range, FileRange)
+    assert (file_range.offset, file_range.length) == (1000, 50000)
+    assert file_range.read() == DATA[1000:51000]
+    listener.bytes_completed.assert_called_with(50000)
+
+
+def test_no_file_range(local_file):
+    hashed = StreamWithHash(local_file, len(DATA))
+    assert UploadBody(hashed, len(hashed), 1000, send_file_ranges=True).get_file_range() is None
+    in_memory = io.BytesIO(DATA)
+    assert UploadBody(in_memory, len(DATA), 1000, send_file_ranges=True).get_file_range() is None
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_sendfile(server_url, local_file):
+    b2_http = B2Http(B2HttpApiConfig(install_clock_skew_hook=False, upload_block_size=100000))
+    listener = MagicMock()
+    stream = ReadingStreamWithProgress(
+        RangeOfInputStream(local_file, 1000, 250000), listener, length=250000
+    )
+    with patch.object(
+        socket.socket, 'sendfile', autospec=True, side_effect=socket.socket.sendfile
+    ) as sendfile:
+        assert b2_http.post_content_return_json(server_url, {}, stream) == {'color': 'blue'}
+    assert Handler.bodies == [DATA[1000:251000]]
+    assert [call.args[2:] for call in sendfile.call_args_list] == [
+        (1000, 100000),
+        (101000, 100000),
+        (201000, 50000),
+    ]
+    listener.bytes_completed.assert_called_with(250000)
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_hashed_upload(server_url, local_file):
+    b2_http = B2Http(B2HttpApiConfig(install_clock_skew_hook=False))
+    stream = StreamWithHash(local_file, len(DATA))
+    b2_http.post_content_return_json(server_url, {}, stream)
+    assert Handler.bodies == [DATA + hashlib.sha1(DATA).hexdigest().encode()]
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_upload_stream(server_url, local_file):
+    b2_http = B2Http(B2HttpApiConfig(install_clock_skew_hook=False))
+    listener = MagicMock()
+    stream = UploadStream(local_file, 1000, 250000, progress_listener=listener)
+    with patch.object(
+        socket.socket, 'sendfile', autospec=True, side_effect=socket.socket.sendfile
+    ) as sendfile:
+        b2_http.post_content_return_json(server_url, {}, stream)
+        hashed = UploadStream(local_file, 1000, 250000, hashed=True)
+        b2_http.post_content_return_json(server_url, {}, hashed)
+    assert Handler.bodies == [
+        DATA[1000:251000],
+        DATA[1000:251000] + hashlib.sha1(DATA[1000:251000]).hexdigest().encode(),
+    ]
+    # the hashed stream is read in Python
+    assert sendfile.call_count == 1
+    listener.bytes_completed.assert_called_with(250000)
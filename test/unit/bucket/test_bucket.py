@@ -17,6 +17,7 @@ import os
 import pathlib
 import platform
 import tempfile
+import threading
 import time
 import unittest.mock as mock
 from contextlib import suppress
@@ -31,12 +32,15 @@ from apiver_deps_exception import (
     B2ConnectionError,
     B2Error,
     B2RequestTimeoutDuringUpload,
+    BadRequest,
     BucketIdNotFound,
+    ChecksumMismatch,
     DestinationDirectoryDoesntAllowOperation,
     DestinationDirectoryDoesntExist,
     DestinationIsADirectory,
     DestinationParentIsNotADirectory,
     DisablingFileLockNotSupported,
+    FileNotPresent,
     FileSha1Mismatch,
     InvalidAuthToken,
     InvalidMetadataDirective,
@@ -49,6 +53,8 @@ from apiver_deps_exception import (
     UnsatisfiableRange,
 )
 
+from b2sdk.page_prefetcher import PagePrefetcher
+
 from ..test_base import TestBase, create_key
 
 if apiver_deps.V <= 1:
@@ -87,8 +93,11 @@ from apiver_deps import (
     LargeFileUploadState,
     LegalHold,
     MetadataDirectiveMode,
+    MmapWriter,
+    MtimeUpdatedFile,
     ParallelDownloader,
     Part,
+    PositionalWriter,
     Range,
     RawSimulator,
     ReplicationConfiguration,
@@ -96,10 +105,13 @@ from apiver_deps import (
     RetentionMode,
     RetentionPeriod,
     SimpleDownloader,
+    StreamingParallelDownloader,
     StubAccountInfo,
     UploadMode,
     UploadSourceBytes,
     UploadSourceLocalFile,
+    UploadSourceStream,
+    UploadUrlPool,
     WriteIntent,
     hex_sha1_of_bytes,
 )
@@ -380,6 +392,40 @@ class TestUploadPart(TestCaseWithBucket):
         except AlreadyFailed:
             pass
 
+    @pytest.mark.apiver(to_ver=1)
+    def test_retry_non_seekable_stream_without_reopening(self):
+        file1 = self.bucket.start_large_file('file1.txt', 'text/plain', {})
+        content = b'hello world'
+        opener = mock.MagicMock(side_effect=lambda: NonSeekableIO(content))
+        upload_part = self.api.session.upload_part
+
+        def upload_part_failing_once(
+            file_id, part_number, content_length, sha1_sum, input_stream, **kwargs
+        ):
+            if upload_part_mock.call_count == 1:
+                input_stream.read()
+                raise B2ConnectionError()
+            return upload_part(
+                file_id, part_number, content_length, sha1_sum, input_stream, **kwargs
+            )
+
+        large_file_upload_state = LargeFileUploadState(mock.MagicMock())
+        with mock.patch.object(
+            self.api.session, 'upload_part', side_effect=upload_part_failing_once
+        ) as upload_part_mock:
+            self.api.services.upload_manager.upload_part(
+                self.bucket_id,
+                file1.file_id,
+                UploadSourceStream(opener, stream_length=len(content)),
+                1,
+                large_file_upload_state,
+            ).result()
+        assert upload_part_mock.call_count == 2
+        opener.assert_called_once()
+        assert list(self.bucket.list_parts(file1.file_id)) == [
+            Part('9999', 1, len(content), hex_sha1_of_bytes(content))
+        ]
+
 
 class TestListUnfinished(TestCaseWithBucket):
     def test_empty(self):
@@ -552,6 +598,70 @@ class TestLs(TestCaseWithBucket):
         ]
         self.assertEqual(expected, actual)
 
+    def test_prefetch_pages(self):
+        data = b'hello world'
+        for file_name in ['a', 'bb/1', 'bb/2', 'bb/2', 'bb/2/sub', 'bb/3', 'ccc']:
+            self.bucket.upload_bytes(data, file_name)
+        for kwargs in [
+            dict(recursive=True),
+            dict(recursive=True, show_versions=True),
+            dict(recursive=False),
+            dict(recursive=False, show_versions=True),
+        ]:
+            expected = [
+                (info.id_, folder)
+                for info, folder in self.bucket_ls('bb', fetch_count=1, **kwargs)
+            ]
+            actual = [
+                (info.id_, folder)
+                for info, folder in self.bucket_ls('bb', fetch_count=1, prefetch_pages=2, **kwargs)
+            ]
+            self.assertEqual(expected, actual)
+
+    def test_prefetch_pages_stops_when_closed(self):
+        data = b'hello world'
+        for i in range(10):
+            self.bucket.upload_bytes(data, f'file{i}')
+        listing = self.bucket_ls('', fetch_count=1, prefetch_pages=3)
+        self.assertEqual('file0', next(listing)[0].file_name)
+        listing.close()
+
+    @pytest.mark.apiver(from_ver=2)
+    def test_ls_parallel(self):
+        data = b'hello world'
+        for file_name in [
+            'a', 'bb/1', 'bb/2/sub1', 'bb/2/sub2', 'bb/2/sub2', 'bb/3/x', 'bb/3', 'bb/4.txt',
+            'bb/5/y', 'bb0', 'ccc'
+        ]:
+            self.bucket.upload_bytes(data, file_name)
+        for folder_to_list in ['', 'bb']:
+            for latest_only in [True, False]:
+                for partitions in [1, 2, 3, 10]:
+                    expected = [
+                        (info.id_, folder) for info, folder in self.bucket.
+                        ls(folder_to_list, latest_only=latest_only, recursive=True, fetch_count=2)
+                    ]
+                    actual = [
+                        (info.id_, folder) for info, folder in self.bucket.ls_parallel(
+                            folder_to_list,
+                            latest_only=latest_only,
+                            fetch_count=2,
+                            partitions=partitions,
+                        )
+                    ]
+                    self.assertEqual(expected, actual)
+
+    @pytest.mark.apiver(from_ver=2)
+    def test_ls_parallel_filters(self):
+        data = b'hello world'
+        for file_name in ['a/1.txt', 'a/2.csv', 'b/3.txt', 'c/4.csv']:
+            self.bucket.upload_bytes(data, file_name)
+        actual = [
+            info.file_name
+            for info, _ in self.bucket.ls_parallel(filters=[Filter.include('*.txt')], partitions=3)
+        ]
+        self.assertEqual(['a/1.txt', 'b/3.txt'], actual)
+
     @pytest.mark.apiver(to_ver=1)
     def test_started_large_file(self):
         self.bucket.start_large_file('hello.txt')
@@ -1789,6 +1899,44 @@ class TestUpload(TestCaseWithBucket):
 
                 last_data = data
 
+    @pytest.mark.apiver(from_ver=2)
+    def test_upload_local_file_incremental_large_file_without_listing_parts(self):
+        # like B2, refuse to list the parts of a finished large file
+        list_parts = BucketSimulator.list_parts
+
+        def list_unfinished_parts(bucket_sim, file_id, *args, **kwargs):
+            if bucket_sim.file_id_to_file[file_id].action != 'start':
+                raise BadRequest(f'No active upload for: {file_id}', 'bad_request')
+            return list_parts(bucket_sim, file_id, *args, **kwargs)
+
+        with tempfile.TemporaryDirectory() as d, mock.patch.object(
+            BucketSimulator, 'list_parts', autospec=True, side_effect=list_unfinished_parts
+        ) as mocked_list_parts:
+            path = os.path.join(d, 'file1')
+            data = self._make_data(self.simulator.MIN_PART_SIZE * 3)
+            write_file(path, data)
+            self.bucket.upload_local_file(path, 'file1', min_part_size=self.simulator.MIN_PART_SIZE)
+            self._check_large_file_sha1('file1', hex_sha1_of_bytes(data))
+
+            for new_data, should_be_incremental in [
+                (data + b'appended', True),
+                (data[:-1] + b'!' + b'appended', False),
+            ]:
+                write_file(path, new_data)
+                with mock.patch.object(
+                    self.bucket, 'concatenate', wraps=self.bucket.concatenate
+                ) as mocked_concatenate:
+                    self.bucket.upload_local_file(path, 'file1', upload_mode=UploadMode.INCREMENTAL)
+                # TODO: use .args[0] instead of [1][0] when we drop Python 3.7
+                sources = mocked_concatenate.mock_calls[0][1][0]
+                assert len(sources) == (2 if should_be_incremental else 1)
+                assert isinstance(sources[0], CopySource) == should_be_incremental
+                self._check_file_contents('file1', new_data)
+                data = new_data
+
+            # the remote file is compared with its large_file_sha1, not with its parts
+            mocked_list_parts.assert_not_called()
+
     @pytest.mark.skipif(platform.system() == 'Windows', reason='no os.mkfifo() on Windows')
     def test_upload_fifo(self):
         with tempfile.TemporaryDirectory() as d:
@@ -1822,6 +1970,31 @@ class TestUpload(TestCaseWithBucket):
         data = b'hello world'
         self.bucket.upload_bytes(data, 'file1')
 
+    def test_upload_retryable_error_evicts_only_failed_url(self):
+        session = self.api.session
+        pool = UploadUrlPool()
+        # without the warm-up, so that the pool only holds the URLs put here
+        with mock.patch.multiple(
+            session.account_info,
+            take_bucket_upload_url=pool.take,
+            put_bucket_upload_url=pool.put,
+            clear_bucket_upload_data=pool.clear_for_key,
+        ), mock.patch.object(session, 'prefetch_upload_urls'):
+            for _ in range(3):
+                response = session.get_upload_url(self.bucket_id)
+                pool.put(self.bucket_id, response['uploadUrl'], response['authorizationToken'])
+            self.simulator.set_upload_errors([CanRetry(True)])
+            self.bucket.upload_bytes(b'hello world', 'file1')
+        assert len(pool._pool[self.bucket_id]) == 2
+
+    def test_upload_prefetches_upload_urls(self):
+        self.bucket.upload_bytes(b'hello world', 'file1')
+        prefetcher = self.api.session._upload_url_prefetcher
+        prefetcher._executor.shutdown(wait=True)
+        upload_manager = self.api.services.upload_manager
+        # the first upload might have fetched its own URL before the prefetched ones arrived
+        assert prefetcher._url_counts[self.bucket_id] >= upload_manager._get_max_uploads()
+
     def test_upload_timeout(self):
         self.simulator.set_upload_errors([B2RequestTimeoutDuringUpload()])
         data = b'hello world'
@@ -2001,6 +2174,40 @@ class TestUpload(TestCaseWithBucket):
                 self.bucket.upload_unbound_stream(f, 'file1')
             self._check_file_contents('file1', data)
 
+    def test_upload_small_files(self):
+        uploads = ((UploadSourceBytes(b'data %d' % i), 'file%d' % i) for i in range(20))
+        results = dict(
+            self.bucket.upload_small_files(uploads, file_info={'a': 'b'}, max_in_flight=3)
+        )
+        assert sorted(results) == sorted('file%d' % i for i in range(20))
+        for i in range(20):
+            file_version = results['file%d' % i]
+            assert file_version.file_name == 'file%d' % i
+            assert file_version.file_info == {'a': 'b'}
+            assert file_version.content_sha1 == hex_sha1_of_bytes(b'data %d' % i)
+            self._check_file_contents('file%d' % i, b'data %d' % i)
+
+    def test_upload_small_files_sends_known_sha1(self):
+        with mock.patch.object(
+            self.api.session, 'upload_file', wraps=self.api.session.upload_file
+        ) as mock_upload:
+            list(self.bucket.upload_small_files([(UploadSourceBytes(b'hello'), 'file1')]))
+        assert mock_upload.call_args[0][4] == hex_sha1_of_bytes(b'hello')
+
+    def test_upload_small_files_failure(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'file1')
+            write_file(path, b'hello')
+            missing_file = UploadSourceLocalFile(path)
+            os.unlink(path)
+            results = dict(
+                self.bucket.upload_small_files(
+                    [(missing_file, 'file1'), (UploadSourceBytes(b'data'), 'file2')]
+                )
+            )
+        assert isinstance(results['file1'], OSError)
+        assert results['file2'].file_name == 'file2'
+
     def _start_large_file(self, file_name, file_info=None):
         if file_info is None:
             file_info = {}
@@ -2557,6 +2764,30 @@ class DownloadTests(DownloadTestsBase):
             assert output_file.getvalue() == self.DATA.encode()
 
 
+class TestOpenFile(TestCaseWithBucket):
+    DATA = ''.join(['01234567890abcdef'] * 32).encode()
+
+    def setUp(self):
+        super().setUp()
+        self.file_version = self.bucket.upload_bytes(self.DATA, 'file1')
+
+    def test_open_file_by_id(self):
+        with self.api.open_file_by_id(self.file_version.id_, block_size=16) as reader:
+            reader.seek(-20, io.SEEK_END)
+            assert reader.read() == self.DATA[-20:]
+            reader.seek(100)
+            assert reader.read(50) == self.DATA[100:150]
+
+    def test_open_file_version(self):
+        with self.file_version.open(block_size=16, cache_size=64) as reader:
+            assert reader.read() == self.DATA
+
+    def test_open_download_version(self):
+        download_version = self.bucket.download_file_by_id(self.file_version.id_).download_version
+        with download_version.open(block_size=1000) as reader:
+            assert reader.read() == self.DATA
+
+
 # download empty file
 
 
@@ -2604,7 +2835,7 @@ class TestChooseStrategy(TestCaseWithBucket):
             min_part_size=16,
             thread_pool=download_manager._thread_pool,
         )
-        simple_downloader = download_manager.strategies[1]
+        simple_downloader = download_manager.strategies[-1]
         download_manager.strategies = [
             parallel_downloader,
             simple_downloader,
@@ -2686,6 +2917,288 @@ class TestDownloadParallelALotOfStreams(DownloadTestsBase, TestCaseWithBucket):
         self._verify(self.DATA)
 
 
+class TestDownloadParallelSegments(
+    DownloadTests,
+    UnverifiedChecksumDownloadScenarioMixin,
+    TestCaseWithBucket,
+):
+    def setUp(self):
+        super().setUp()
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            ParallelDownloader(
+                force_chunk_size=2,
+                max_streams=4,
+                min_part_size=2,
+                min_segment_size=3,
+                thread_pool=download_manager._thread_pool,
+            ),
+        ]
+
+
+class TestDownloadStreamingParallel(
+    DownloadTests,
+    UnverifiedChecksumDownloadScenarioMixin,
+    TestCaseWithBucket,
+):
+    def setUp(self):
+        super().setUp()
+        # the streaming downloader is only used with destinations which cannot seek
+        self.bytes_io = NonSeekableIO()
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            StreamingParallelDownloader(
+                force_chunk_size=1,
+                max_streams=999,
+                segment_size=2,
+                thread_pool=download_manager._thread_pool,
+            ),
+            # used by the tests which download to a local file
+            SimpleDownloader(force_chunk_size=20),
+        ]
+
+    @pytest.mark.apiver(from_ver=2)
+    def test_download_to_seekable_file_does_not_use_streams(self):
+        downloaded_file = self.bucket.download_file_by_id(self.file_version.id_)
+        downloaded_file.save(io.BytesIO())
+        assert isinstance(downloaded_file.download_strategy, SimpleDownloader)
+
+    @pytest.mark.apiver(from_ver=2)
+    def test_download_to_non_seekable_file_uses_streams(self):
+        file_version = self.bucket.upload_bytes(self.DATA.encode(), 'file1')
+        output_file = NonSeekableIO()
+        with mock.patch.object(
+            self.bucket.api.session,
+            'download_file_from_url',
+            wraps=self.bucket.api.session.download_file_from_url,
+        ) as mock_download:
+            downloaded_file = self.bucket.download_file_by_id(file_version.id_)
+            downloaded_file.save(output_file)
+        assert isinstance(downloaded_file.download_strategy, StreamingParallelDownloader)
+        assert output_file.getvalue() == self.DATA.encode()
+        assert mock_download.call_count > 1
+
+    def test_number_of_streams_limited_by_buffer_size(self):
+        downloader = StreamingParallelDownloader(
+            force_chunk_size=1,
+            segment_size=10,
+            max_streams=8,
+            max_buffer_size=35,
+        )
+        assert downloader._get_number_of_streams(1000) == 3
+        assert downloader._get_number_of_streams(20) == 2
+        downloader.max_buffer_size = 5
+        assert downloader._get_number_of_streams(1000) == 1
+
+
+class TestDownloadParallelSegmentsALotOfStreams(DownloadTestsBase, TestCaseWithBucket):
+    DATA = ''.join(['01234567890abcdef'] * 32)
+
+    def setUp(self):
+        super().setUp()
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            ParallelDownloader(
+                force_chunk_size=1,
+                max_streams=32,
+                min_part_size=16,
+                min_segment_size=4,
+                hash_reorder_buffer_size=len(self.DATA),
+                thread_pool=download_manager._thread_pool,
+            ),
+        ]
+
+    def test_download_by_id_progress_monotonic(self):
+        self.download_file_by_id(self.file_version.id_, progress_listener=self.progress_listener)
+        self._verify(self.DATA)
+
+    def test_permanent_segment_error_is_raised(self):
+        session = self.bucket.api.session
+        download_file_from_url = session.download_file_from_url
+
+        def fail_ranged_download(url, range_=None, encryption=None):
+            if range_ is not None:
+                raise FileNotPresent()
+            return download_file_from_url(url, range_=range_, encryption=encryption)
+
+        with mock.patch.object(
+            session, 'download_file_from_url', side_effect=fail_ranged_download
+        ) as mock_download:
+            with pytest.raises(FileNotPresent):
+                self.download_file_by_id(self.file_version.id_)
+        # the segments are not retried, and the download stops rather than go on with other segments
+        assert mock_download.call_count <= 32
+
+
+@pytest.mark.apiver(from_ver=2)
+class TestDownloadParallelPositionalWrites(DownloadTestsBase, TestCaseWithBucket):
+    DATA = ''.join(['01234567890abcdef'] * 32)
+
+    def _set_parallel_downloader(self, **kwargs):
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            ParallelDownloader(
+                force_chunk_size=1,
+                max_streams=32,
+                min_part_size=16,
+                thread_pool=download_manager._thread_pool,
+                **kwargs,
+            ),
+        ]
+
+    def _download_to_file(self, path):
+        with mock.patch.object(
+            PositionalWriter, 'put', autospec=True, side_effect=PositionalWriter.put
+        ) as mock_put:
+            downloaded_file = self.bucket.download_file_by_id(
+                self.file_version.id_, progress_listener=self.progress_listener
+            )
+            downloaded_file.save_to(path)
+        return mock_put
+
+    def test_positional_writes_to_local_file(self):
+        self._set_parallel_downloader()
+        with tempfile.TemporaryDirectory() as d:
+            path = pathlib.Path(d) / 'file2'
+            mock_put = self._download_to_file(path)
+            assert path.read_text() == self.DATA
+        assert mock_put.called
+        valid, reason = self.progress_listener.is_valid_reason(
+            check_progress=False,
+            check_monotonic_progress=True,
+        )
+        assert valid, reason
+
+    def test_positional_writes_disabled(self):
+        self._set_parallel_downloader(positional_writes=False)
+        with tempfile.TemporaryDirectory() as d:
+            path = pathlib.Path(d) / 'file2'
+            mock_put = self._download_to_file(path)
+            assert path.read_text() == self.DATA
+        assert not mock_put.called
+
+    def test_no_positional_writes_without_fileno(self):
+        self._set_parallel_downloader()
+        with mock.patch.object(PositionalWriter, 'put', autospec=True) as mock_put:
+            self.download_file_by_id(self.file_version.id_)
+        self._verify(self.DATA, check_progress_listener=False)
+        assert not mock_put.called
+
+
+@pytest.mark.apiver(from_ver=2)
+class TestDownloadParallelMmap(DownloadTestsBase, TestCaseWithBucket):
+    DATA = ''.join(['01234567890abcdef'] * 32)
+
+    def setUp(self):
+        super().setUp()
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            ParallelDownloader(
+                force_chunk_size=5,
+                max_streams=8,
+                min_part_size=16,
+                thread_pool=download_manager._thread_pool,
+            ),
+            SimpleDownloader(force_chunk_size=5),
+        ]
+
+    def _save_to(self, file_version, **kwargs):
+        with tempfile.TemporaryDirectory() as d:
+            path = pathlib.Path(d) / 'file2'
+            with mock.patch.object(
+                MmapWriter, 'put', autospec=True, side_effect=MmapWriter.put
+            ) as mock_put:
+                downloaded_file = self.bucket.download_file_by_id(
+                    file_version.id_, progress_listener=self.progress_listener
+                )
+                downloaded_file.save_to(path, **kwargs)
+            return path.read_bytes(), mock_put
+
+    def test_mmap(self):
+        contents, mock_put = self._save_to(self.file_version, use_mmap=True)
+        assert contents == self.DATA.encode()
+        assert mock_put.called
+        valid, reason = self.progress_listener.is_valid_reason(
+            check_progress=False,
+            check_monotonic_progress=True,
+        )
+        assert valid, reason
+
+    def test_mmap_hash_mismatch(self):
+        simulated_file = list(self.simulator.bucket_name_to_bucket.values()
+                             )[0].file_id_to_file[self.file_version.id_]
+        simulated_file.content_sha1 = hex_sha1_of_bytes(b'something else')
+        with pytest.raises(ChecksumMismatch):
+            self._save_to(self.file_version, use_mmap=True)
+
+    def test_mmap_fallback_write_only(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = pathlib.Path(d) / 'file2'
+            with MtimeUpdatedFile(path, mod_time_millis=0, mode='wb') as file:
+                assert not file.map(len(self.DATA))
+                assert file.mmap is None
+
+    def test_mmap_fallback_empty_file(self):
+        file_version = self.bucket.upload_bytes(b'', 'empty')
+        contents, mock_put = self._save_to(file_version, use_mmap=True)
+        assert contents == b''
+        assert not mock_put.called
+
+    def test_mmap_simple_downloader(self):
+        file_version = self.bucket.upload_bytes(b'small', 'small')
+        contents, mock_put = self._save_to(file_version, use_mmap=True)
+        assert contents == b'small'
+        assert not mock_put.called
+
+
+@pytest.mark.apiver(from_ver=2)
+class TestDownloadParallelIncrementalHashing(DownloadTestsBase, TestCaseWithBucket):
+    DATA = ''.join(['01234567890abcdef'] * 32)
+
+    def _check_finish_hashing(self, hash_reorder_buffer_size, **kwargs):
+        download_manager = self.bucket.api.services.download_manager
+        downloader = ParallelDownloader(
+            force_chunk_size=1,
+            max_streams=32,
+            min_part_size=16,
+            thread_pool=download_manager._thread_pool,
+            hash_reorder_buffer_size=hash_reorder_buffer_size,
+            **kwargs
+        )
+        download_manager.strategies = [downloader]
+        with mock.patch.object(
+            downloader, '_finish_hashing', side_effect=downloader._finish_hashing
+        ) as mock_finish_hashing:
+            self.download_file_by_id(self.file_version.id_)
+        self._verify(self.DATA, check_progress_listener=False)
+        return mock_finish_hashing
+
+    def test_no_second_pass_over_file(self):
+        mock_finish_hashing = self._check_finish_hashing(len(self.DATA))
+        assert not mock_finish_hashing.called
+
+    def test_no_second_pass_over_file_larger_than_buffer(self):
+        # the streams do not get further ahead than the buffer allows
+        mock_finish_hashing = self._check_finish_hashing(len(self.DATA) // 8)
+        assert not mock_finish_hashing.called
+
+    def test_no_second_pass_over_file_larger_than_buffer_with_segments(self):
+        mock_finish_hashing = self._check_finish_hashing(len(self.DATA) // 8, min_segment_size=4)
+        assert not mock_finish_hashing.called
+
+    def test_reorder_buffer_overflow(self):
+        # the buffer is too small to hash the parts as they are downloaded
+        mock_finish_hashing = self._check_finish_hashing(1)
+        assert mock_finish_hashing.called
+
+    def test_hash_mismatch_detected(self):
+        simulated_file = list(self.simulator.bucket_name_to_bucket.values()
+                             )[0].file_id_to_file[self.file_version.id_]
+        simulated_file.content_sha1 = hex_sha1_of_bytes(b'something else')
+        with pytest.raises(ChecksumMismatch):
+            self._check_finish_hashing(len(self.DATA))
+
+
 # Truncated downloads
 
 
@@ -2735,6 +3248,108 @@ class TestTruncatedDownloadParallel(DownloadTests, TestCaseWithTruncatedDownload
         ]
 
 
+class TestTruncatedDownloadParallelSegments(DownloadTests, TestCaseWithTruncatedDownloadBucket):
+    def setUp(self):
+        super().setUp()
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            ParallelDownloader(
+                force_chunk_size=3,
+                max_streams=2,
+                min_part_size=2,
+                min_segment_size=5,
+            )
+        ]
+
+
+class TestTruncatedDownloadStreamingParallel(DownloadTests, TestCaseWithTruncatedDownloadBucket):
+    def setUp(self):
+        super().setUp()
+        self.bytes_io = NonSeekableIO()
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            StreamingParallelDownloader(
+                force_chunk_size=3,
+                max_streams=2,
+                segment_size=2,
+            ),
+            SimpleDownloader(force_chunk_size=20),
+        ]
+
+
+class ReadintoFakeResponse(FakeResponse):
+    """
+    A special FakeResponse class which exposes the data as a raw stream, like urllib3 does.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.raw = io.BytesIO(self.data_bytes)
+
+
+class ReadintoDownloadBucketSimulator(BucketSimulator):
+    RESPONSE_CLASS = ReadintoFakeResponse
+
+
+class ReadintoDownloadRawSimulator(RawSimulator):
+    BUCKET_SIMULATOR_CLASS = ReadintoDownloadBucketSimulator
+
+
+@pytest.mark.apiver(from_ver=2)
+class TestDownloadBufferPool(DownloadTestsBase, TestCaseWithBucket):
+    RAW_SIMULATOR_CLASS = ReadintoDownloadRawSimulator
+    DATA = ''.join(['01234567890abcdef'] * 32)
+
+    def get_api(self):
+        return B2Api(
+            self.account_info,
+            api_config=B2HttpApiConfig(_raw_api_class=self.RAW_SIMULATOR_CLASS),
+            download_buffer_pool_size=1024,
+        )
+
+    def _set_strategy(self, strategy_class, **kwargs):
+        download_manager = self.bucket.api.services.download_manager
+        download_manager.strategies = [
+            strategy_class(
+                force_chunk_size=7,
+                thread_pool=download_manager._thread_pool,
+                buffer_pool=download_manager.buffer_pool,
+                **kwargs,
+            ),
+        ]
+        return download_manager.buffer_pool
+
+    def test_simple(self):
+        buffer_pool = self._set_strategy(SimpleDownloader)
+        with mock.patch.object(buffer_pool, 'acquire', side_effect=buffer_pool.acquire) as acquire:
+            self.download_file_by_id(
+                self.file_version.id_, progress_listener=self.progress_listener
+            )
+        self._verify(self.DATA)
+        acquire.assert_called_once_with(7)
+
+    def test_parallel_positional_writes(self):
+        buffer_pool = self._set_strategy(
+            ParallelDownloader, max_streams=8, min_part_size=16, min_segment_size=16
+        )
+        with tempfile.TemporaryDirectory() as d:
+            path = pathlib.Path(d) / 'file2'
+            with mock.patch.object(
+                buffer_pool, 'acquire', side_effect=buffer_pool.acquire
+            ) as acquire:
+                self.bucket.download_file_by_id(self.file_version.id_).save_to(path)
+            assert path.read_text() == self.DATA
+        assert acquire.called
+        assert buffer_pool.allocated <= 1024
+
+    def test_parallel_not_used_with_writer_thread(self):
+        buffer_pool = self._set_strategy(ParallelDownloader, max_streams=8, min_part_size=16)
+        with mock.patch.object(buffer_pool, 'acquire') as acquire:
+            self.download_file_by_id(self.file_version.id_)
+        self._verify(self.DATA, check_progress_listener=False)
+        assert not acquire.called
+
+
 class DummyDownloader(AbstractDownloader):
     def download(self, *args, **kwargs):
         pass
@@ -3212,5 +3827,87 @@ class TestEmptyListVersions(TestListVersions):
     RAW_SIMULATOR_CLASS = EmptyListSimulator
 
 
+@pytest.mark.apiver(from_ver=2)
+class TestLsParallel(TestCaseWithBucket):
+    def test_partition_discovery_bounded(self):
+        data = b'hello world'
+        for folder in 'abcdef':
+            for i in range(3):
+                self.bucket.upload_bytes(data, f'{folder}/{i}')
+        for i in range(5):
+            self.bucket.upload_bytes(data, f'flat{i}')
+        expected = [info.id_ for info, _ in self.bucket.ls(recursive=True)]
+        with mock.patch.multiple(
+            self.bucket,
+            LIST_PARTITION_DISCOVERY_REQUESTS=3,
+            LIST_PARTITION_DISCOVERY_FETCH_COUNT=2,
+        ):
+            # the search stops after skipping folder "c", the rest of the names is the last range
+            assert self.bucket._list_partition_boundaries('', 3) == ['b/', 'c0']
+            with mock.patch.object(
+                self.bucket.api.session,
+                'list_file_names',
+                wraps=self.bucket.api.session.list_file_names,
+            ) as list_file_names:
+                actual = [info.id_ for info, _ in self.bucket.ls_parallel(partitions=3)]
+        assert actual == expected
+        # the search and the listing of the ranges
+        assert list_file_names.call_count == 3 + 3
+
+    def test_flat(self):
+        data = b'hello world'
+        for i in range(5):
+            self.bucket.upload_bytes(data, f'file{i}')
+        with mock.patch.multiple(
+            self.bucket,
+            LIST_PARTITION_DISCOVERY_REQUESTS=1,
+            LIST_PARTITION_DISCOVERY_FETCH_COUNT=2,
+        ):
+            assert self.bucket._list_partition_boundaries('', 8) == []
+            actual = [info.file_name for info, _ in self.bucket.ls_parallel(fetch_count=2)]
+        assert actual == [f'file{i}' for i in range(5)]
+
+    def test_prefetch_budget_shared_by_ranges(self):
+        data = b'hello world'
+        for folder in 'abcd':
+            self.bucket.upload_bytes(data, f'{folder}/file')
+        with mock.patch.object(self.bucket, 'DEFAULT_LIST_PREFETCH_BUDGET', 40), mock.patch(
+            'b2sdk.bucket.PagePrefetcher', wraps=PagePrefetcher
+        ) as page_prefetcher:
+            actual = [
+                info.file_name for info, _ in self.bucket.ls_parallel(fetch_count=2, partitions=4)
+            ]
+        assert actual == ['a/file', 'b/file', 'c/file', 'd/file']
+        # every range fetches ahead up to its share of the budget, not only the range being consumed
+        assert [call.args[2] for call in page_prefetcher.call_args_list] == [5, 5, 5, 5]
+
+    def test_ranges_share_bounded_pool(self):
+        data = b'hello world'
+        for folder in 'abcdefgh':
+            self.bucket.upload_bytes(data, f'{folder}/file')
+        list_page = self.bucket._list_page
+        running = []
+        max_running = []
+        lock = threading.Lock()
+
+        def slow_list_page(*args):
+            with lock:
+                running.append(args)
+                max_running.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(args)
+            return list_page(*args)
+
+        with mock.patch.object(self.bucket, '_list_page', side_effect=slow_list_page):
+            actual = [
+                info.file_name
+                for info, _ in self.bucket.ls_parallel(fetch_count=1, partitions=8, max_workers=2)
+            ]
+        assert actual == [f'{folder}/file' for folder in 'abcdefgh']
+        # the ranges are fetched by at most max_workers threads, not by a thread per range
+        assert max(max_running) <= 2
+
+
 class TestEmptyLs(TestLs):
     RAW_SIMULATOR_CLASS = EmptyListSimulator
@@ -0,0 +1,75 @@
+######################################################################
+#
+# File: test/unit/internal/test_buffer_pool.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+import threading
+from unittest.mock import MagicMock
+
+from b2sdk.transfer.inbound.downloader.buffer_pool import BufferPool, iter_response_content
+
+
+def test_buffer_pool_reuses_buffers():
+    pool = BufferPool(100)
+    buffer = pool.acquire(10)
+    pool.release(buffer)
+    assert pool.acquire(10) is buffer
+    assert pool.allocated == 10
+
+
+def test_buffer_pool_drops_free_buffers_of_other_sizes():
+    pool = BufferPool(100)
+    pool.release(pool.acquire(60))
+    buffer = pool.acquire(80)
+    assert len(buffer) == 80
+    assert pool.allocated == 80
+
+
+def test_buffer_pool_oversized_buffer():
+    pool = BufferPool(10)
+    assert len(pool.acquire(20)) == 20
+
+
+def test_buffer_pool_blocks_above_max_size():
+    pool = BufferPool(100)
+    first = pool.acquire(60)
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(pool.acquire(60)))
+    thread.start()
+    thread.join(0.1)
+    assert not acquired
+
+    pool.release(first)
+    thread.join(1)
+    assert acquired == [first]
+
+
+def _response(data, **headers):
+    response = MagicMock()
+    response.raw = io.BytesIO(data)
+    response.headers = headers
+    response.iter_content.return_value = iter([data])
+    return response
+
+
+def test_iter_response_content_readinto():
+    pool = BufferPool(100)
+    chunks = [bytes(chunk) for chunk in iter_response_content(_response(b'x' * 25), 10, pool)]
+    assert chunks == [b'x' * 10, b'x' * 10, b'x' * 5]
+    # the buffer was returned to the pool and is reused
+    pool.acquire(10)
+    assert pool.allocated == 10
+
+
+def test_iter_response_content_fallback():
+    response = _response(b'data', **{'Content-Encoding': 'gzip'})
+    assert list(iter_response_content(response, 10, BufferPool(100))) == [b'data']
+    response = _response(b'data')
+    assert list(iter_response_content(response, 10)) == [b'data']
@@ -0,0 +1,219 @@
+######################################################################
+#
+# File: test/unit/internal/test_concurrency_controller.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from apiver_deps import (
+    AimdConcurrencyLimiter,
+    B2Http,
+    B2HttpApiConfig,
+    ConcurrencyController,
+    RequestClass,
+)
+
+from b2sdk.b2http import ConcurrencyControllerHook
+
+
+def hold_permits(limiter, count):
+    for _ in range(count):
+        limiter.acquire()
+
+
+def test_no_limit_until_overloaded():
+    limiter = AimdConcurrencyLimiter()
+    hold_permits(limiter, 100)
+    limiter.on_success()
+    assert limiter.limit is None
+
+
+def test_multiplicative_decrease():
+    limiter = AimdConcurrencyLimiter(min_limit=2)
+    hold_permits(limiter, 16)
+    with patch('time.monotonic', side_effect=[10.0, 10.5, 11.5, 13.0, 14.5]):
+        limiter.on_overloaded()
+        assert limiter.limit == 8
+        limiter.on_overloaded()  # within DECREASE_INTERVAL, probably a response to the same burst
+        assert limiter.limit == 8
+        limiter.on_overloaded()
+        assert limiter.limit == 4
+        limiter.on_overloaded()
+        limiter.on_overloaded()
+        assert limiter.limit == 2
+
+
+def test_additive_increase():
+    limiter = AimdConcurrencyLimiter(max_limit=5)
+    hold_permits(limiter, 8)
+    limiter.on_overloaded()
+    assert limiter.limit == 4
+    for _ in range(6):
+        limiter.release()
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 4  # the limit is not reached, so there is no point in increasing it
+    hold_permits(limiter, 2)
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == pytest.approx(4.95, abs=0.05)
+    for _ in range(10):
+        limiter.on_success()
+    assert 5 <= limiter.limit < 5.5
+
+
+def test_acquire_waits_for_release():
+    limiter = AimdConcurrencyLimiter()
+    hold_permits(limiter, 2)
+    limiter.on_overloaded()
+    assert limiter.limit == 1
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    limiter.release()
+    assert not acquired.wait(0.1)  # one permit is still held, and the limit is 1
+    limiter.release()
+    assert acquired.wait(5)
+    thread.join()
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.parametrize(
+    'url,request_class',
+    [
+        ('https://api000.backblazeb2.com/b2api/v3/b2_list_buckets', RequestClass.API),
+        ('https://pod-000.backblaze.com/b2api/v3/b2_upload_file/bucket/token', RequestClass.UPLOAD),
+        ('https://pod-000.backblaze.com/b2api/v3/b2_upload_part/file/token', RequestClass.UPLOAD),
+        ('https://api000.backblazeb2.com/b2api/v3/b2_copy_file', RequestClass.COPY),
+        ('https://api000.backblazeb2.com/b2api/v3/b2_copy_part', RequestClass.COPY),
+        ('https://f000.backblazeb2.com/file/bucket/file.txt', RequestClass.DOWNLOAD),
+        (
+            'https://f000.backblazeb2.com/b2api/v3/b2_download_file_by_id?fileId=1',
+            RequestClass.DOWNLOAD
+        ),
+    ],
+)
+def test_classify_url(url, request_class):
+    assert ConcurrencyController.classify_url(url) == request_class
+
+
+def test_hook_records_responses():
+    controller = ConcurrencyController()
+    hold_permits(controller.limiters[RequestClass.UPLOAD], 10)
+    hook = ConcurrencyControllerHook(controller)
+    url = 'https://pod-000.backblaze.com/b2api/v3/b2_upload_file/bucket/token'
+    hook.post_request('POST', url, {}, MagicMock(status_code=200))
+    hook.post_request('POST', url, {}, MagicMock(status_code=400))
+    assert controller.get_limits()[RequestClass.UPLOAD] is None
+    hook.post_request('POST', url, {}, MagicMock(status_code=503))
+    assert controller.get_limits() == {
+        RequestClass.API: None,
+        RequestClass.UPLOAD: 5,
+        RequestClass.COPY: None,
+        RequestClass.DOWNLOAD: None,
+    }
+
+
+UPLOAD_URL = 'https://pod-000.backblaze.com/b2api/v3/b2_upload_file/bucket/token'
+DOWNLOAD_URL = 'https://f000.backblazeb2.com/file/bucket/file.txt'
+
+
+def make_response(status_code, url):
+    content = b'{}'
+    if status_code != 200:
+        content = json.dumps(
+            {
+                'status': status_code,
+                'code': 'service_unavailable',
+                'message': 'too busy'
+            }
+        ).encode()
+    return MagicMock(status_code=status_code, content=content, headers={}, url=url)
+
+
+def make_b2_http(controller):
+    b2_http = B2Http(
+        B2HttpApiConfig(install_clock_skew_hook=False, concurrency_controller=controller)
+    )
+    b2_http.session = MagicMock()
+    return b2_http
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_retries_wait_for_permits():
+    controller = ConcurrencyController()
+    limiter = controller.limiters[RequestClass.UPLOAD]
+    b2_http = make_b2_http(controller)
+    in_flight = []
+    responses = iter([make_response(503, UPLOAD_URL), make_response(200, UPLOAD_URL)])
+
+    def post(*args, **kwargs):
+        in_flight.append(limiter.in_flight)
+        return next(responses)
+
+    b2_http.session.post.side_effect = post
+    sleeping = threading.Event()
+    resume = threading.Event()
+
+    def sleep(seconds):
+        sleeping.set()
+        assert resume.wait(5)
+
+    with patch('time.sleep', sleep):
+        thread = threading.Thread(
+            target=b2_http.post_content_return_json, args=(UPLOAD_URL, {}, io.BytesIO(b'data'))
+        )
+        thread.start()
+        assert sleeping.wait(5)
+        # the request waiting before its retry does not hold a permit
+        assert limiter.in_flight == 0
+        assert limiter.limit == 1
+        # another upload takes the only permit left by the overloaded server
+        limiter.acquire()
+        resume.set()
+        thread.join(0.1)
+        assert thread.is_alive()
+        assert b2_http.session.post.call_count == 1
+        limiter.release()
+        thread.join(5)
+    assert not thread.is_alive()
+    assert in_flight == [1, 1]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_download_holds_permit_until_closed():
+    controller = ConcurrencyController()
+    limiter = controller.limiters[RequestClass.DOWNLOAD]
+    b2_http = make_b2_http(controller)
+    b2_http.session.get.side_effect = [
+        make_response(503, DOWNLOAD_URL),
+        make_response(200, DOWNLOAD_URL),
+    ]
+
+    with patch('time.sleep'):
+        with b2_http.get_content(DOWNLOAD_URL, {}) as response:
+            assert limiter.in_flight == 1
+            response.close()
+            assert limiter.in_flight == 0
+    assert limiter.in_flight == 0
+
+    b2_http.session.get.side_effect = [make_response(200, DOWNLOAD_URL)]
+    with b2_http.get_content(DOWNLOAD_URL, {}):
+        assert limiter.in_flight == 1
+    assert limiter.in_flight == 0
@@ -0,0 +1,115 @@
+######################################################################
+#
+# File: test/unit/internal/test_page_prefetcher.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from b2sdk.page_prefetcher import PagePrefetcher
+
+PAGE_COUNT = 10
+
+
+def next_cursor(page):
+    return page + 1 if page + 1 < PAGE_COUNT else None
+
+
+class FetchPage:
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def __call__(self, cursor):
+        with self.lock:
+            self.fetched.append(cursor)
+        if cursor == self.fail_at:
+            raise RuntimeError(f'failed to fetch page {cursor}')
+        return cursor
+
+
+@pytest.mark.parametrize('max_pages', [0, 1, 3])
+def test_pages_in_order(max_pages):
+    fetch_page = FetchPage()
+    with PagePrefetcher(fetch_page, next_cursor, max_pages) as pages:
+        assert [pages.get(cursor) for cursor in range(PAGE_COUNT)] == list(range(PAGE_COUNT))
+    assert fetch_page.fetched == list(range(PAGE_COUNT))
+
+
+def test_pages_fetched_ahead():
+    fetched_ahead = threading.Event()
+
+    def fetch_page(cursor):
+        if cursor == 2:
+            fetched_ahead.set()
+        return cursor
+
+    with PagePrefetcher(fetch_page, next_cursor, 2) as pages:
+        assert pages.get(0) == 0
+        assert fetched_ahead.wait(5)
+
+
+def test_skip_ahead():
+    fetch_page = FetchPage()
+    with PagePrefetcher(fetch_page, next_cursor, 2) as pages:
+        assert pages.get(0) == 0
+        assert pages.get(5) == 5
+        assert pages.get(6) == 6
+    assert 5 in fetch_page.fetched
+
+
+def test_error():
+    fetch_page = FetchPage(fail_at=2)
+    with PagePrefetcher(fetch_page, next_cursor, 3) as pages:
+        assert pages.get(0) == 0
+        assert pages.get(1) == 1
+        with pytest.raises(RuntimeError):
+            pages.get(2)
+    assert 3 not in fetch_page.fetched
+
+
+def test_retry_after_error():
+    fetch_page = FetchPage(fail_at=2)
+    with PagePrefetcher(fetch_page, next_cursor, 3) as pages:
+        assert pages.get(0) == 0
+        assert pages.get(1) == 1
+        with pytest.raises(RuntimeError):
+            pages.get(2)
+        fetch_page.fail_at = None
+        assert [pages.get(cursor) for cursor in range(2, PAGE_COUNT)] == list(range(2, PAGE_COUNT))
+
+
+def test_prefetchers_share_executor():
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def fetch_page(cursor):
+        with lock:
+            running.append(cursor)
+            max_running.append(len(running))
+        time.sleep(0.001)
+        with lock:
+            running.remove(cursor)
+        return cursor
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        prefetchers = [PagePrefetcher(fetch_page, next_cursor, 3, executor) for _ in range(4)]
+        for pages in prefetchers:
+            pages.start(0)
+        # every prefetcher gets its pages, although there are fewer threads than prefetchers
+        for pages in prefetchers:
+            with pages:
+                assert [pages.get(cursor)
+                        for cursor in range(PAGE_COUNT)] == list(range(PAGE_COUNT))
+    assert max(max_running) <= 2
@@ -0,0 +1,121 @@
+######################################################################
+#
+# File: test/unit/internal/test_remote_file.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import contextlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from b2sdk.exception import TruncatedOutput
+from b2sdk.transfer.inbound.remote_file import RemoteFileReader
+
+DATA = bytes(range(256)) * 4
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_content(self, chunk_size):
+        for offset in range(0, len(self.data), chunk_size):
+            yield self.data[offset:offset + chunk_size]
+
+
+class FakeSession:
+    def __init__(self, data=DATA, truncate_to=None):
+        self.data = data
+        self.truncate_to = truncate_to
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def download_file_from_url(self, url, range_=None, encryption=None):
+        with self.lock:
+            self.ranges.append(range_)
+        data = self.data[range_[0]:range_[1] + 1]
+        yield FakeResponse(data[:self.truncate_to])
+
+
+def open_reader(session, **kwargs):
+    kwargs.setdefault('block_size', 100)
+    return RemoteFileReader(session, 'url', len(session.data), **kwargs)
+
+
+def test_read_whole_file():
+    with open_reader(FakeSession()) as reader:
+        assert reader.read() == DATA
+        assert reader.read() == b''
+        assert reader.tell() == len(DATA)
+
+
+def test_random_reads():
+    session = FakeSession()
+    with open_reader(session) as reader:
+        assert reader.seek(-10, io.SEEK_END) == len(DATA) - 10
+        assert reader.read(20) == DATA[-10:]
+        reader.seek(250)
+        assert reader.read(5) == DATA[250:255]
+        assert reader.seek(-5, io.SEEK_CUR) == 250
+        assert reader.read(60) == DATA[250:310]
+    assert session.ranges == [(1000, 1023), (200, 299), (300, 399)]
+
+
+def test_read_through_buffered_reader():
+    with io.BufferedReader(open_reader(FakeSession()), buffer_size=64) as reader:
+        reader.seek(500)
+        assert reader.read(300) == DATA[500:800]
+
+
+def test_lru_cache():
+    session = FakeSession()
+    with open_reader(session, cache_size=200) as reader:
+        for offset in (0, 500, 0, 900, 0, 500):
+            reader.seek(offset)
+            assert reader.read(1) == DATA[offset:offset + 1]
+    assert [range_[0] for range_ in session.ranges] == [0, 500, 900, 500]
+
+
+def test_sequential_read_prefetches():
+    session = FakeSession()
+    with ThreadPoolExecutor(2) as thread_pool:
+        with open_reader(session, max_prefetch_blocks=3, thread_pool=thread_pool) as reader:
+            assert reader.read(250) == DATA[:250]
+            assert reader._prefetched
+            assert reader.read() == DATA[250:]
+    assert sorted(session.ranges) == [
+        (offset, min(offset + 100, len(DATA)) - 1) for offset in range(0, len(DATA), 100)
+    ]
+
+
+def test_truncated_block_is_retried():
+    session = FakeSession(truncate_to=40)
+    with open_reader(session) as reader:
+        assert reader.read(100) == DATA[:100]
+    assert session.ranges == [(0, 99), (40, 99), (80, 99)]
+
+
+def test_truncated_block():
+    session = FakeSession(truncate_to=10)
+    with open_reader(session) as reader:
+        with pytest.raises(TruncatedOutput):
+            reader.read(10)
+    assert len(session.ranges) == RemoteFileReader.MAX_BLOCK_RETRIES
+
+
+def test_closed():
+    reader = open_reader(FakeSession())
+    reader.close()
+    with pytest.raises(ValueError):
+        reader.read(1)
+    with pytest.raises(ValueError):
+        reader.seek(0)
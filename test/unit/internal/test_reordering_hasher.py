@@ -0,0 +1,78 @@
+######################################################################
+#
+# File: test/unit/internal/test_reordering_hasher.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from b2sdk.transfer.inbound.downloader.parallel import ReorderingHasher
+
+DATA = bytes(range(256)) * 4
+
+
+def _chunks(start, end, size):
+    return [(offset, DATA[offset:min(offset + size, end)]) for offset in range(start, end, size)]
+
+
+@pytest.mark.parametrize('reverse', [False, True])
+def test_reordering_hasher_in_memory(reverse):
+    chunks = _chunks(0, len(DATA), 100)
+    if reverse:
+        chunks.reverse()
+    hasher = hashlib.sha1()
+    reordering_hasher = ReorderingHasher(hasher, 0, max_buffered_bytes=len(DATA))
+    for offset, data in chunks:
+        reordering_hasher.update_at(offset, data)
+
+    assert reordering_hasher.hashed_offset == len(DATA)
+    assert reordering_hasher.buffered_bytes == 0
+    assert hasher.hexdigest() == hashlib.sha1(DATA).hexdigest()
+
+
+def test_reordering_hasher_evicts_highest_offsets():
+    hasher = hashlib.sha1()
+    reordering_hasher = ReorderingHasher(hasher, 0, max_buffered_bytes=250)
+    for offset, data in reversed(_chunks(100, len(DATA), 100)):
+        reordering_hasher.update_at(offset, data)
+    assert reordering_hasher.buffered_bytes <= 250
+
+    reordering_hasher.update_at(0, DATA[:100])
+
+    hashed_until = reordering_hasher.hashed_offset
+    assert 100 < hashed_until < len(DATA)
+    assert reordering_hasher.buffered_bytes == 0
+    hasher.update(DATA[hashed_until:])
+    assert hasher.hexdigest() == hashlib.sha1(DATA).hexdigest()
+
+
+def test_reordering_hasher_for_offset():
+    hasher = hashlib.sha1()
+    reordering_hasher = ReorderingHasher(hasher, 10, max_buffered_bytes=len(DATA))
+    second_part = reordering_hasher.for_offset(500)
+    first_part = reordering_hasher.for_offset(10)
+    for _, data in _chunks(500, len(DATA), 64):
+        second_part.update(data)
+    for _, data in _chunks(10, 500, 64):
+        first_part.update(data)
+
+    assert reordering_hasher.hashed_offset == len(DATA)
+    assert hasher.hexdigest() == hashlib.sha1(DATA[10:]).hexdigest()
+
+
+def test_reordering_hasher_ignores_empty_data():
+    hasher = hashlib.sha1()
+    reordering_hasher = ReorderingHasher(hasher, 0, max_buffered_bytes=len(DATA))
+    reordering_hasher.update_at(100, DATA[100:])
+    reordering_hasher.update_at(100, b'')
+    reordering_hasher.update_at(0, DATA[:100])
+
+    assert reordering_hasher.hashed_offset == len(DATA)
+    assert hasher.hexdigest() == hashlib.sha1(DATA).hexdigest()
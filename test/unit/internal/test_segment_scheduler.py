@@ -0,0 +1,202 @@
+######################################################################
+#
+# File: test/unit/internal/test_segment_scheduler.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import contextlib
+import errno
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from b2sdk.exception import (
+    B2ConnectionError,
+    FileNotPresent,
+    ServiceError,
+    SSECKeyError,
+    TruncatedOutput,
+)
+from b2sdk.transfer.inbound.downloader.parallel import download_segments, is_transient_error
+from b2sdk.transfer.inbound.downloader.segment_scheduler import SegmentScheduler
+from b2sdk.utils.range_ import Range
+
+
+@pytest.fixture
+def scheduler():
+    return SegmentScheduler(
+        Range(1000, 1999),
+        Range(0, 999),
+        num_streams=4,
+        min_segment_size=100,
+    )
+
+
+def test_take_min_segment_size_without_throughput(scheduler):
+    segment = scheduler.take()
+    assert (segment.start, segment.end) == (0, 99)
+    assert scheduler.get_cloud_range(segment) == Range(1000, 1099)
+
+
+def test_take_sized_by_throughput(scheduler):
+    scheduler.take()
+    # 1 byte/s would give segments smaller than the minimum
+    segment = scheduler.take(throughput=1)
+    assert (segment.start, segment.end) == (100, 199)
+    # fast stream gets a bigger segment, but not more than a fair share of what is left
+    segment = scheduler.take(throughput=10**9)
+    assert (segment.start, segment.end) == (200, 399)
+
+
+def test_take_does_not_leave_small_tail():
+    scheduler = SegmentScheduler(Range(0, 249), Range(0, 249), num_streams=1, min_segment_size=100)
+    assert scheduler.take().end == 99
+    assert scheduler.take().end == 249
+
+
+def test_claim(scheduler):
+    segment = scheduler.take()
+    assert scheduler.claim(segment, 60) == (0, 60)
+    assert scheduler.claim(segment, 60) == (60, 40)
+    assert scheduler.claim(segment, 60) == (100, 0)
+    assert segment.remaining() == 0
+
+
+def test_steal_from_straggler():
+    scheduler = SegmentScheduler(Range(0, 999), Range(0, 999), num_streams=2, min_segment_size=100)
+    slow = scheduler.take(throughput=10**9)
+    assert (slow.start, slow.end) == (0, 499)
+    scheduler.claim(slow, 100)
+    # segments get smaller as less is left unassigned
+    for start, end in [(500, 749), (750, 874), (875, 999)]:
+        fast = scheduler.take(throughput=10**9)
+        assert (fast.start, fast.end) == (start, end)
+        scheduler.claim(fast, fast.remaining())
+        scheduler.release(fast)
+
+    stolen = scheduler.take()
+    assert (stolen.start, stolen.end) == (300, 499)
+    assert slow.end == 299
+    assert scheduler.claim(slow, 300) == (100, 200)
+
+
+def test_no_steal_below_twice_min_segment_size():
+    scheduler = SegmentScheduler(Range(0, 999), Range(0, 999), num_streams=1, min_segment_size=100)
+    segment = scheduler.take(throughput=10**9)
+    assert (segment.start, segment.end) == (0, 999)
+    scheduler.claim(segment, 801)
+
+    assert scheduler.take() is None
+
+
+def test_release_unfinished(scheduler):
+    segment = scheduler.take()
+    scheduler.claim(segment, 30)
+    scheduler.release(segment)
+
+    assert scheduler.take() is segment
+    assert scheduler.get_cloud_range(segment) == Range(1030, 1099)
+
+    segment.retries_left = 0
+    scheduler.release(segment)
+    assert scheduler.take().start == 100
+
+
+def test_take_waits_for_slower_streams():
+    scheduler = SegmentScheduler(
+        Range(0, 999),
+        Range(0, 999),
+        num_streams=2,
+        min_segment_size=100,
+        max_segment_size=100,
+        max_ahead=250,
+    )
+    first = scheduler.take(throughput=10**9)
+    assert (first.start, first.end) == (0, 99)
+    assert scheduler.take().start == 100
+    taken = []
+    thread = threading.Thread(target=lambda: taken.append(scheduler.take()))
+    thread.start()
+    thread.join(0.1)
+    # the next segment would end 300 bytes after the first one, which is not written yet
+    assert not taken
+    scheduler.claim(first, 60)
+    thread.join(5)
+    assert (taken[0].start, taken[0].end) == (200, 299)
+
+
+def test_download_segments_retries_failed_range():
+    data = bytes(range(250))
+    scheduler = SegmentScheduler(Range(0, 249), Range(0, 249), num_streams=1, min_segment_size=100)
+    written = bytearray(len(data))
+    failed = []
+
+    @contextlib.contextmanager
+    def download_file_from_url(url, range_, encryption=None):
+        if range_[0] == 100 and not failed:
+            failed.append(range_)
+            raise ConnectionError('connection reset')
+        response = MagicMock()
+        response.iter_content.return_value = [data[range_[0]:range_[1] + 1]]
+        yield response
+
+    def put(offset, to_write):
+        written[offset:offset + len(to_write)] = to_write
+
+    session = MagicMock(download_file_from_url=download_file_from_url)
+    download_segments('url', session, MagicMock(put=put), scheduler, chunk_size=100)
+
+    # the stream went on after the error, and downloaded the failed range again
+    assert failed == [(100, 249)]
+    assert written == data
+
+
+@pytest.mark.parametrize(
+    'error',
+    [
+        FileNotPresent(),
+        SSECKeyError(),
+        OSError(errno.ENOSPC, 'No space left on device'),
+        TypeError('unexpected argument'),
+    ],
+)
+def test_download_segments_does_not_retry_permanent_error(error):
+    scheduler = SegmentScheduler(Range(0, 249), Range(0, 249), num_streams=2, min_segment_size=100)
+    attempts = []
+
+    @contextlib.contextmanager
+    def download_file_from_url(url, range_, encryption=None):
+        attempts.append(range_)
+        raise error
+
+    session = MagicMock(download_file_from_url=download_file_from_url)
+    with pytest.raises(type(error)):
+        download_segments('url', session, MagicMock(), scheduler, chunk_size=100)
+
+    # the error was raised at the first attempt, and the remaining segments are not downloaded
+    assert attempts == [(0, 99)]
+    assert scheduler.take() is None
+
+
+@pytest.mark.parametrize(
+    'error,transient',
+    [
+        (ConnectionError('connection reset'), True),
+        (requests.exceptions.ChunkedEncodingError(), True),
+        (B2ConnectionError(), True),
+        (ServiceError('503 service unavailable'), True),
+        (TruncatedOutput(50, 100), True),
+        (FileNotPresent(), False),
+        (OSError(errno.EBADF, 'Bad file descriptor'), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_transient_error(error, transient):
+    assert is_transient_error(error) is transient
@@ -0,0 +1,71 @@
+######################################################################
+#
+# File: test/unit/internal/test_spilling_stream.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from b2sdk.stream.spilling import SpillingStream
+
+from ...helpers import NonSeekableIO
+
+DATA = bytes(range(256)) * 8
+
+
+def test_rewind_does_not_read_source_again():
+    source = NonSeekableIO(DATA)
+    bytes_read_from_source = []
+    read = source.read
+
+    def counting_read(*args):
+        data = read(*args)
+        bytes_read_from_source.append(len(data))
+        return data
+
+    source.read = counting_read
+    stream = SpillingStream(source, len(DATA))
+    assert stream.read(1000) == DATA[:1000]
+    assert stream.seek(0) == 0
+    assert stream.read(500) == DATA[:500]
+    assert stream.read() == DATA[500:]
+    assert stream.read() == b''
+    assert sum(bytes_read_from_source) == len(DATA)
+    assert len(stream) == len(DATA)
+
+
+def test_seek():
+    stream = SpillingStream(NonSeekableIO(DATA))
+    assert stream.seek(100) == 100
+    assert stream.read(10) == DATA[100:110]
+    assert stream.seek(-20, io.SEEK_CUR) == 90
+    assert stream.tell() == 90
+    assert stream.seek(-10, io.SEEK_END) == len(DATA) - 10
+    assert stream.read() == DATA[-10:]
+    assert stream.seek(len(DATA) + 10) == len(DATA)
+    with pytest.raises(ValueError):
+        stream.seek(-1)
+
+
+def test_spills_to_disk():
+    stream = SpillingStream(NonSeekableIO(DATA), max_memory_size=100)
+    assert stream.read() == DATA
+    assert stream.spill._rolled
+    stream.seek(0)
+    assert stream.read() == DATA
+
+
+def test_close():
+    source = NonSeekableIO(DATA)
+    stream = SpillingStream(source)
+    stream.read(10)
+    stream.close()
+    assert source.closed
+    assert stream.spill.closed
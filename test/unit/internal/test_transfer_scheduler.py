@@ -0,0 +1,207 @@
+######################################################################
+#
+# File: test/unit/internal/test_transfer_scheduler.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+from concurrent.futures import wait
+
+import pytest
+from apiver_deps import (
+    B2Api,
+    TransferClass,
+    TransferPriority,
+    TransferScheduler,
+    transfer_priority,
+)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = TransferScheduler()
+    yield scheduler
+    scheduler.shutdown()
+
+
+class Recorder:
+    def __init__(self):
+        self.order = []
+        self.lock = threading.Lock()
+
+    def record(self, name):
+        with self.lock:
+            self.order.append(name)
+        return name
+
+
+def block(executor):
+    """
+    Occupy a worker until the returned event is set.
+    """
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+
+    future = executor.submit(blocked)
+    assert started.wait(5)
+    return release, future
+
+
+def submit_from_thread(executor, fn, *args):
+    futures = []
+    thread = threading.Thread(target=lambda: futures.append(executor.submit(fn, *args)))
+    thread.start()
+    thread.join()
+    return futures[0]
+
+
+def test_priorities(scheduler):
+    executor = scheduler.get_executor(TransferClass.UPLOAD, max_workers=1)
+    recorder = Recorder()
+    release, _ = block(executor)
+    with transfer_priority(TransferPriority.BACKGROUND):
+        futures = [executor.submit(recorder.record, 'background')]
+    futures.append(executor.submit(recorder.record, 'normal'))
+    with transfer_priority(TransferPriority.INTERACTIVE):
+        futures.append(executor.submit(recorder.record, 'interactive'))
+    release.set()
+    wait(futures)
+    assert recorder.order == ['interactive', 'normal', 'background']
+
+
+def test_files_take_turns(scheduler):
+    executor = scheduler.get_executor(TransferClass.UPLOAD, max_workers=1)
+    recorder = Recorder()
+    release, _ = block(executor)
+    futures = [executor.submit(recorder.record, f'huge-{i}') for i in range(4)]
+    futures.append(submit_from_thread(executor, recorder.record, 'small'))
+    release.set()
+    wait(futures)
+    assert recorder.order == ['huge-0', 'small', 'huge-1', 'huge-2', 'huge-3']
+
+
+def test_tasks_inherit_file_and_priority(scheduler):
+    executor = scheduler.get_executor(TransferClass.UPLOAD, max_workers=1)
+    recorder = Recorder()
+    release, _ = block(executor)
+    futures = []
+
+    def large_file():
+        futures.extend(executor.submit(recorder.record, f'part-{i}') for i in range(3))
+
+    with transfer_priority(TransferPriority.BACKGROUND):
+        futures.append(executor.submit(large_file))
+    futures.append(submit_from_thread(executor, recorder.record, 'other'))
+    release.set()
+    futures[0].result(5)  # the parts are scheduled by then
+    wait(futures)
+    # the parts are in the background, like the task which scheduled them
+    assert recorder.order == ['other', 'part-0', 'part-1', 'part-2']
+
+
+def test_idle_workers_are_borrowed(scheduler):
+    uploads = scheduler.get_executor(TransferClass.UPLOAD, max_workers=1)
+    scheduler.get_executor(TransferClass.DOWNLOAD, max_workers=2)
+    barrier = threading.Barrier(2, timeout=5)
+    futures = [uploads.submit(barrier.wait) for _ in range(2)]
+    wait(futures)
+    assert all(future.exception() is None for future in futures)
+
+
+def test_reserved_workers_go_first(scheduler):
+    uploads = scheduler.get_executor(TransferClass.UPLOAD, max_workers=1)
+    downloads = scheduler.get_executor(TransferClass.DOWNLOAD, max_workers=2)
+    recorder = Recorder()
+    release_first, _ = block(uploads)
+    release_second, _ = block(uploads)  # borrowed from the downloads
+    with transfer_priority(TransferPriority.INTERACTIVE):
+        futures = [uploads.submit(recorder.record, 'upload')]
+    futures.append(downloads.submit(recorder.record, 'download'))
+    release_first.set()
+    release_second.set()
+    wait(futures)
+    # the uploads used all their workers, so the download went first despite its lower priority
+    assert recorder.order == ['download', 'upload']
+
+
+def test_flood_does_not_take_all_workers(scheduler):
+    uploads = scheduler.get_executor(TransferClass.UPLOAD, max_workers=2)
+    copies = scheduler.get_executor(TransferClass.COPY, max_workers=2)
+    downloads = scheduler.get_executor(TransferClass.DOWNLOAD, max_workers=2)
+    release = threading.Event()
+    running = threading.Semaphore(0)
+
+    def blocked():
+        running.release()
+        release.wait(5)
+
+    flood = [uploads.submit(blocked) for _ in range(100)]
+    for _ in range(4):
+        assert running.acquire(timeout=5)
+    # two workers are borrowed, and one is kept free for each of the other classes
+    assert not running.acquire(timeout=0.1)
+    try:
+        assert downloads.submit(int, '1').result(5) == 1
+        assert copies.submit(int, '2').result(5) == 2
+    finally:
+        release.set()
+    wait(flood)
+
+
+def test_scheduled_tasks_run_at_exit(tmp_path):
+    path = tmp_path / 'done'
+    code = f'''
+import time
+from b2sdk.transfer.scheduler import TransferClass, TransferScheduler
+
+def task():
+    time.sleep(0.2)
+    open({str(path)!r}, 'w').close()
+
+executor = TransferScheduler().get_executor(TransferClass.UPLOAD, max_workers=1)
+executor.submit(time.sleep, 0.1)
+executor.submit(task)
+'''
+    subprocess.run([sys.executable, '-c', code], check=True, timeout=30)
+    assert path.exists()
+
+
+def test_cancel_and_exception(scheduler):
+    executor = scheduler.get_executor(TransferClass.COPY, max_workers=1)
+    release, _ = block(executor)
+    cancelled = executor.submit(pytest.fail, 'cancelled task was run')
+    failed = executor.submit(int, 'not a number')
+    assert cancelled.cancel()
+    release.set()
+    with pytest.raises(ValueError):
+        failed.result(5)
+
+
+def test_set_size(scheduler):
+    executor = scheduler.get_executor(TransferClass.DOWNLOAD)
+    assert executor._max_workers == TransferScheduler.DEFAULT_MAX_WORKERS
+    executor.set_size(3)
+    scheduler.get_executor(TransferClass.UPLOAD, max_workers=2)
+    assert executor._max_workers == 3
+    assert scheduler.get_max_workers() == 5
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_managers_share_scheduler():
+    api = B2Api(max_upload_workers=3, max_copy_workers=2, max_download_workers=4)
+    services = api.services
+    assert services.transfer_scheduler.get_max_workers() == 9
+    assert services.get_max_transfer_workers() == 9
+    for manager in (services.upload_manager, services.copy_manager, services.download_manager):
+        assert manager._thread_pool.scheduler is services.transfer_scheduler
@@ -0,0 +1,82 @@
+######################################################################
+#
+# File: test/unit/internal/test_upload_stream.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import hashlib
+import io
+from unittest.mock import MagicMock
+
+import pytest
+
+from b2sdk.stream.range import RangeOfInputStream
+from b2sdk.stream.upload import UploadStream
+
+from ...helpers import NonSeekableIO
+
+DATA = bytes(range(256)) * 8
+DIGEST = hashlib.sha1(DATA[100:1100]).hexdigest().encode()
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    path = tmp_path / 'file'
+    path.write_bytes(DATA)
+    with open(path, 'rb') as file:
+        yield file
+
+
+@pytest.fixture(params=['bytes', 'file'])
+def stream(request, local_file):
+    source = io.BytesIO(DATA) if request.param == 'bytes' else local_file
+    # nested ranges, like a part of a range of a local file
+    range_ = RangeOfInputStream(RangeOfInputStream(source, 50, 2000), 50, 1500)
+    yield UploadStream.from_stream(range_, 1000, hashed=True, progress_listener=MagicMock())
+
+
+def test_read(stream):
+    assert len(stream) == 1040
+    assert stream.read(600) == DATA[100:700]
+    assert stream.read() == DATA[700:1100] + DIGEST
+    assert stream.hash == DIGEST.decode()
+    assert stream.read() == b''
+    stream.progress_listener.bytes_completed.assert_called_with(1000)
+
+
+def test_iter_blocks(stream):
+    blocks = [bytes(block) for block in stream.iter_blocks(300)]
+    assert [len(block) for block in blocks] == [300, 300, 300, 100, 40]
+    assert b''.join(blocks) == DATA[100:1100] + DIGEST
+
+
+def test_rewind(stream):
+    stream.read(500)
+    assert stream.seek(0) == 0
+    assert stream.hash is None
+    assert stream.read() == DATA[100:1100] + DIGEST
+    with pytest.raises(io.UnsupportedOperation):
+        stream.seek(10)
+
+
+def test_not_hashed(local_file):
+    stream = UploadStream(local_file, 10, 20)
+    assert len(stream) == 20
+    assert stream.read() == DATA[10:30]
+    assert stream.hash is None
+
+
+def test_bandwidth_limiter():
+    limiter = MagicMock()
+    stream = UploadStream(DATA, 0, len(DATA), bandwidth_limiter=limiter)
+    list(stream.iter_blocks(1500))
+    assert [call.args for call in limiter.consume.call_args_list] == [(1500,), (548,)]
+
+
+def test_unsupported_stream():
+    assert UploadStream.from_stream(NonSeekableIO(DATA), len(DATA)) is None
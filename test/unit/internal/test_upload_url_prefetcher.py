@@ -0,0 +1,124 @@
+######################################################################
+#
+# File: test/unit/internal/test_upload_url_prefetcher.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import itertools
+import threading
+
+from b2sdk.account_info.upload_url_pool import UploadUrlPool
+from b2sdk.exception import ServiceError
+from b2sdk.upload_url_prefetcher import UploadUrlPrefetcher
+
+
+class FakeApi:
+    def __init__(self):
+        self.pool = UploadUrlPool()
+        self.counter = itertools.count()
+        self.calls = 0
+        self.fail = False
+        self.lock = threading.Lock()
+
+    def get_upload_url(self, bucket_id):
+        with self.lock:
+            self.calls += 1
+        if self.fail:
+            raise ServiceError('busy')
+        i = next(self.counter)
+        return {'uploadUrl': f'url-{bucket_id}-{i}', 'authorizationToken': f'token-{i}'}
+
+    def take_all(self, bucket_id):
+        urls = []
+        while True:
+            url, _ = self.pool.take(bucket_id)
+            if url is None:
+                return urls
+            urls.append(url)
+
+
+def make_prefetcher(api):
+    return UploadUrlPrefetcher(api.get_upload_url, api.pool.put, max_workers=2)
+
+
+def wait(prefetcher):
+    prefetcher._executor.shutdown(wait=True)
+    prefetcher._executor = None
+
+
+def test_warm_up():
+    api = FakeApi()
+    prefetcher = make_prefetcher(api)
+    prefetcher.warm_up('bucket', 5)
+    wait(prefetcher)
+    assert len(api.take_all('bucket')) == 5
+
+    # the URLs were taken, but not evicted
+    prefetcher.warm_up('bucket', 5)
+    assert prefetcher._executor is None
+    assert api.calls == 5
+
+
+def test_refill_after_eviction():
+    api = FakeApi()
+    prefetcher = make_prefetcher(api)
+    prefetcher.warm_up('bucket', 3)
+    wait(prefetcher)
+    prefetcher.url_evicted('bucket')
+    wait(prefetcher)
+    assert api.calls == 4
+    assert len(api.take_all('bucket')) == 4
+    assert len(api.take_all('other-bucket')) == 0
+
+
+def test_urls_fetched_without_prefetcher_are_counted():
+    api = FakeApi()
+    prefetcher = make_prefetcher(api)
+    prefetcher.url_fetched('bucket')
+    prefetcher.url_fetched('bucket')
+    prefetcher.warm_up('bucket', 3)
+    wait(prefetcher)
+    assert api.calls == 1
+
+
+def test_failed_fetch():
+    api = FakeApi()
+    api.fail = True
+    prefetcher = make_prefetcher(api)
+    prefetcher.warm_up('bucket', 2)
+    wait(prefetcher)
+    assert api.take_all('bucket') == []
+
+    api.fail = False
+    prefetcher.url_evicted('bucket')
+    wait(prefetcher)
+    assert len(api.take_all('bucket')) == 2
+
+
+def test_reset():
+    api = FakeApi()
+    prefetcher = make_prefetcher(api)
+    prefetcher.warm_up('bucket', 2)
+    wait(prefetcher)
+    prefetcher.reset()
+    prefetcher.warm_up('bucket', 2)
+    wait(prefetcher)
+    assert api.calls == 4
+
+
+def test_refill_after_reset():
+    api = FakeApi()
+    prefetcher = make_prefetcher(api)
+    prefetcher.warm_up('bucket', 2)
+    wait(prefetcher)
+    api.take_all('bucket')
+    prefetcher.reset()
+    prefetcher.refill('bucket')
+    wait(prefetcher)
+    assert len(api.take_all('bucket')) == 2
+    assert api.calls == 4
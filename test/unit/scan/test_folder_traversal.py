@@ -10,7 +10,7 @@
 from __future__ import annotations
 
 import platform
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -530,3 +530,61 @@ class TestFolderTraversal:
         assert absolute_paths == [
             fix_windows_path_limit(str(d1_dir / "file1.txt")),
         ]
+
+    def test_folder_all_files__b2_order(self, tmp_path):
+        # '/' sorts between '.' and '0', so the files inside "a" go between "a.txt" and "a0.txt"
+        for relative_path in [
+            'a.txt',
+            'a/b.txt',
+            'a/c/d.txt',
+            'a/c.txt',
+            'a/c0/e.txt',
+            'a0.txt',
+            'b/f.txt',
+            'b/g/h/i.txt',
+        ]:
+            (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / relative_path).write_text(relative_path)
+
+        folder = LocalFolder(tmp_path)
+        local_paths = list(folder.all_files(reporter=MagicMock()))
+
+        assert [path.relative_path for path in local_paths] == [
+            'a.txt',
+            'a/b.txt',
+            'a/c.txt',
+            'a/c/d.txt',
+            'a/c0/e.txt',
+            'a0.txt',
+            'b/f.txt',
+            'b/g/h/i.txt',
+        ]
+        assert [path.size
+                for path in local_paths] == [len(path.relative_path) for path in local_paths]
+
+    def test_folder_all_files__interrupted(self, tmp_path):
+        for i in range(20):
+            (tmp_path / f'dir{i:02}').mkdir()
+            (tmp_path / f'dir{i:02}' / 'file.txt').write_text('content')
+
+        folder = LocalFolder(tmp_path)
+        local_paths = folder.all_files(reporter=MagicMock())
+
+        assert next(local_paths).relative_path == 'dir00/file.txt'
+        local_paths.close()
+
+    def test_folder_all_files__bounded_lookahead(self, tmp_path, monkeypatch):
+        for i in range(20):
+            (tmp_path / f'dir{i:02}').mkdir()
+            (tmp_path / f'dir{i:02}' / 'file.txt').write_text('content')
+        monkeypatch.setattr(LocalFolder, 'SCAN_LOOKAHEAD', 3)
+
+        folder = LocalFolder(tmp_path)
+        with patch.object(folder, '_scan_directory', wraps=folder._scan_directory) as scan:
+            local_paths = folder.all_files(reporter=MagicMock())
+            assert next(local_paths).relative_path == 'dir00/file.txt'
+            # at most the root, "dir00" and the next 3 subdirectories were listed
+            assert scan.call_count <= 5
+            assert [path.relative_path
+                    for path in local_paths] == [f'dir{i:02}/file.txt' for i in range(1, 20)]
+        assert scan.call_count == 21
@@ -0,0 +1,118 @@
+######################################################################
+#
+# File: test/unit/scan/test_scan_manifest.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from b2sdk.scan.folder import LocalFolder
+from b2sdk.scan.manifest import ScanManifest
+
+LONG_AGO = time.time() - 3600
+
+
+def make_tree(root, relative_paths):
+    for relative_path in relative_paths:
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative_path)
+    set_directories_mtime(root)
+
+
+def set_directories_mtime(root, mtime=LONG_AGO):
+    for dir_path, _, _ in os.walk(root):
+        os.utime(dir_path, (mtime, mtime))
+
+
+def scan(root, manifest):
+    folder = LocalFolder(root, manifest=manifest)
+    return [(path.relative_path, path.size) for path in folder.all_files(reporter=None)]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'root'
+    make_tree(root, ['a.txt', 'b/c.txt', 'b/d/e.txt', 'f/g.txt'])
+    return root
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / 'manifest.sqlite')
+
+
+def test_unchanged_directories_are_not_listed(tree, manifest_path):
+    with ScanManifest(manifest_path) as manifest:
+        expected = scan(tree, manifest)
+    with ScanManifest(manifest_path) as manifest, mock.patch('os.scandir') as scandir:
+        assert scan(tree, manifest) == expected
+    scandir.assert_not_called()
+
+
+def test_changed_directory_is_listed(tree, manifest_path):
+    with ScanManifest(manifest_path) as manifest:
+        scan(tree, manifest)
+    (tree / 'b' / 'h.txt').write_text('new file')
+    (tree / 'f' / 'g.txt').unlink()
+    set_directories_mtime(tree / 'b', LONG_AGO + 10)
+    set_directories_mtime(tree / 'f', LONG_AGO + 10)
+    with ScanManifest(manifest_path) as manifest:
+        assert scan(tree, manifest) == [
+            ('a.txt', 5),
+            ('b/c.txt', 7),
+            ('b/d/e.txt', 9),
+            ('b/h.txt', 8),
+        ]
+
+
+def test_files_are_checked(tree, manifest_path):
+    with ScanManifest(manifest_path) as manifest:
+        scan(tree, manifest)
+    (tree / 'b' / 'c.txt').write_text('modified in place')
+    with ScanManifest(manifest_path) as manifest:
+        assert ('b/c.txt', 17) in scan(tree, manifest)
+
+
+def test_trust_mtime(tree, manifest_path):
+    with ScanManifest(manifest_path) as manifest:
+        expected = scan(tree, manifest)
+    (tree / 'b' / 'c.txt').write_text('modified in place')
+    with ScanManifest(manifest_path, trust_mtime=True) as manifest, \
+            mock.patch('os.scandir') as scandir, \
+            mock.patch('os.access') as access:
+        assert scan(tree, manifest) == expected
+    scandir.assert_not_called()
+    access.assert_not_called()
+
+
+def test_recently_modified_directory_is_not_recorded(tree, manifest_path):
+    set_directories_mtime(tree / 'f', time.time())
+    with ScanManifest(manifest_path) as manifest:
+        expected = scan(tree, manifest)
+    with ScanManifest(manifest_path) as manifest, \
+            mock.patch('os.scandir', wraps=os.scandir) as scandir:
+        assert scan(tree, manifest) == expected
+    scandir.assert_called_once_with(tree / 'f')
+
+
+def test_removed_directories_are_pruned(tree, manifest_path):
+    with ScanManifest(manifest_path) as manifest:
+        scan(tree, manifest)
+        assert manifest.get(str(tree / 'f'), os.stat(tree / 'f')) is not None
+    (tree / 'f' / 'g.txt').unlink()
+    (tree / 'f').rmdir()
+    set_directories_mtime(tree, LONG_AGO + 10)
+    with ScanManifest(manifest_path) as manifest:
+        scan(tree, manifest)
+        rows = manifest._connection.execute('SELECT path FROM directory;').fetchall()
+    assert sorted(path for (path,) in rows) == sorted(str(tree / path) for path in ['', 'b', 'b/d'])
@@ -12,7 +12,7 @@ from __future__ import annotations
 import re
 
 import pytest
-from apiver_deps import ScanPoliciesManager
+from apiver_deps import RegexSet, ScanPoliciesManager
 from apiver_deps_exception import InvalidArgument
 
 
@@ -82,3 +82,30 @@ class TestScanPoliciesManager:
             )
         }
         ScanPoliciesManager(**kwargs)
+
+
+class TestRegexSet:
+    @pytest.mark.parametrize(
+        'regexes,s,expected',
+        [
+            ((), 'a.txt', False),
+            ((r'.*\.txt$', r'b/'), 'a.txt', True),
+            ((r'.*\.txt$', r'b/'), 'a.txt2', False),
+            ((r'.*\.txt$', r'b/'), 'b/c', True),
+            ((r'.*\.txt$', r'(?i)A\.JPG'), 'a.jpg', True),
+            ((r'.*\.txt$', r'(\w)\1'), 'aa', True),
+            ((r'.*\.txt$', r'(\w)\1'), 'ab', False),
+            ((r'.*\.txt$', r'(?P<x>a)(?P=x)', r'b|c'), 'aa', True),
+            ((r'.*\.txt$', re.compile('B', re.IGNORECASE)), 'b', True),
+        ],
+    )
+    def test_matches(self, regexes, s, expected):
+        assert RegexSet(regexes).matches(s) is expected
+        assert RegexSet(regexes, cache_size=10).matches(s) is expected
+
+    def test_cache(self):
+        regex_set = RegexSet([r'a', r'b'], cache_size=10)
+        assert regex_set.matches('a/b')
+        regex_set._combined = re.compile('nothing')
+        assert regex_set.matches('a/b')
+        assert not regex_set.matches('b/a')
@@ -0,0 +1,83 @@
+######################################################################
+#
+# File: test/unit/sync/test_hash_cache.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from unittest import mock
+
+from apiver_deps import LocalFileHashCache
+
+
+def test_get_sha1(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(b'hello world')
+    cache_path = str(tmp_path / 'hashes.sqlite')
+
+    with LocalFileHashCache(cache_path) as hash_cache:
+        assert hash_cache.get_sha1(str(path)) == hashlib.sha1(b'hello world').hexdigest()
+
+    with LocalFileHashCache(cache_path) as hash_cache, \
+            mock.patch('b2sdk.sync.hash_cache.hex_sha1_of_file') as hex_sha1_of_file:
+        assert hash_cache.get_sha1(str(path)) == hashlib.sha1(b'hello world').hexdigest()
+    hex_sha1_of_file.assert_not_called()
+
+
+def test_changed_file_is_hashed_again(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(b'hello world')
+    with LocalFileHashCache() as hash_cache:
+        hash_cache.get_sha1(str(path))
+        stat_result = os.stat(path)
+        path.write_bytes(b'HELLO WORLD')
+        os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1))
+        assert hash_cache.get_sha1(str(path)) == hashlib.sha1(b'HELLO WORLD').hexdigest()
+
+
+def test_caches_share_database(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'file{i}.txt'
+        path.write_bytes(b'hello world %d' % i)
+        paths.append(str(path))
+    cache_path = str(tmp_path / 'hashes.sqlite')
+
+    with LocalFileHashCache(cache_path) as hash_cache1, \
+            LocalFileHashCache(cache_path) as hash_cache2, \
+            mock.patch.object(LocalFileHashCache, 'SAVE_BATCH_SIZE', 2):
+        hash_cache1.get_sha1(paths[0])
+        hash_cache2.get_sha1(paths[1])
+        # the first batch of the first cache is saved without waiting for the second cache
+        hash_cache1.get_sha1(paths[2])
+        hash_cache2.save()
+
+    with LocalFileHashCache(cache_path) as hash_cache, \
+            mock.patch('b2sdk.sync.hash_cache.hex_sha1_of_file') as hex_sha1_of_file:
+        for i, path in enumerate(paths):
+            assert hash_cache.get_sha1(path) == hashlib.sha1(b'hello world %d' % i).hexdigest()
+    hex_sha1_of_file.assert_not_called()
+
+
+def test_locked_database(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(b'hello world')
+    cache_path = str(tmp_path / 'hashes.sqlite')
+    LocalFileHashCache(cache_path).close()
+
+    other_connection = sqlite3.connect(cache_path, isolation_level=None)
+    other_connection.execute('BEGIN EXCLUSIVE;')
+    try:
+        with mock.patch.object(LocalFileHashCache, 'DATABASE_TIMEOUT', 0.01), \
+                LocalFileHashCache(cache_path) as hash_cache:
+            assert hash_cache.get_sha1(str(path)) == hashlib.sha1(b'hello world').hexdigest()
+    finally:
+        other_connection.rollback()
+        other_connection.close()
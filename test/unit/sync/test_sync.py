@@ -24,6 +24,7 @@ from apiver_deps import (
     FileVersion,
     IncrementalHexDigester,
     KeepOrDeleteMode,
+    LocalFileHashCache,
     NewerFileSyncMode,
     SyncPolicyManager,
     UploadSourceLocalFile,
@@ -683,6 +684,58 @@ class TestSynchronizer:
         dst = self.folder_factory(dst_type, ('a.txt', [100], 10))
         self.assert_folder_sync_actions(synchronizer, src, dst, expected)
 
+    @pytest.mark.parametrize(
+        'src_type,dst_type',
+        [
+            ('local', 'b2'),
+            ('b2', 'local'),
+            ('b2', 'b2'),
+        ],
+    )
+    def test_compare_sha1_equal(self, synchronizer_factory, src_type, dst_type):
+        synchronizer = synchronizer_factory(compare_version_mode=CompareVersionMode.SHA1)
+        src = self.folder_factory(src_type, ('a.txt', [200], 10))
+        dst = self.folder_factory(dst_type, ('a.txt', [100], 10))
+        with mock.patch.object(LocalFileHashCache, 'get_sha1', return_value='content_sha1'):
+            self.assert_folder_sync_actions(synchronizer, src, dst, [])
+
+    @pytest.mark.parametrize(
+        'src_type,dst_type,expected',
+        [
+            ('local', 'b2', ['b2_upload(/dir/a.txt, folder/a.txt, 100)']),
+            ('b2', 'local', ['b2_download(folder/a.txt, id_a_100, /dir/a.txt, 100)']),
+        ],
+    )
+    def test_compare_sha1_not_equal(self, synchronizer_factory, src_type, dst_type, expected):
+        synchronizer = synchronizer_factory(compare_version_mode=CompareVersionMode.SHA1)
+        src = self.folder_factory(src_type, ('a.txt', [100], 10))
+        dst = self.folder_factory(dst_type, ('a.txt', [200], 10))
+        with mock.patch.object(LocalFileHashCache, 'get_sha1', return_value='other_sha1'):
+            self.assert_folder_sync_actions(synchronizer, src, dst, expected)
+
+    def test_compare_sha1_size_not_equal(self, synchronizer_factory):
+        synchronizer = synchronizer_factory(compare_version_mode=CompareVersionMode.SHA1)
+        src = self.folder_factory('local', ('a.txt', [100], 11))
+        dst = self.folder_factory('b2', ('a.txt', [200], 10))
+        with mock.patch.object(LocalFileHashCache, 'get_sha1') as get_sha1:
+            self.assert_folder_sync_actions(
+                synchronizer, src, dst, ['b2_upload(/dir/a.txt, folder/a.txt, 100)']
+            )
+        get_sha1.assert_not_called()
+
+    @pytest.mark.apiver(from_ver=2)
+    def test_compare_sha1_unknown(self, synchronizer_factory):
+        synchronizer = synchronizer_factory(compare_version_mode=CompareVersionMode.SHA1)
+        src = self.folder_factory('local', ('a.txt', [200], 10))
+        dst = self.folder_factory('b2', ('a.txt', [100], 10))
+        with mock.patch.object(FileVersion, 'get_content_sha1', return_value=None), \
+                mock.patch.object(LocalFileHashCache, 'get_sha1') as get_sha1:
+            # falls back to comparing modification time
+            self.assert_folder_sync_actions(
+                synchronizer, src, dst, ['b2_upload(/dir/a.txt, folder/a.txt, 200)']
+            )
+        get_sha1.assert_not_called()
+
     @pytest.mark.parametrize(
         'src_type,dst_type,expected',
         [
@@ -0,0 +1,115 @@
+######################################################################
+#
+# File: test/unit/utils/test_bandwidth_limiter.py
+#
+# Copyright 2024 Backblaze Inc. All Rights Reserved.
+#
+# License https://www.backblaze.com/using_b2_code.html
+#
+######################################################################
+from __future__ import annotations
+
+import io
+from unittest.mock import patch
+
+import pytest
+from apiver_deps import (
+    B2Api,
+    B2HttpApiConfig,
+    BandwidthLimiter,
+    InMemoryAccountInfo,
+    RateLimitedStream,
+    RawSimulator,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch('time.monotonic', clock.monotonic), patch('time.sleep', clock.sleep):
+        yield clock
+
+
+def test_unlimited(clock):
+    limiter = BandwidthLimiter()
+    assert not limiter.is_limited()
+    limiter.consume(10**9)
+    assert clock.sleeps == []
+
+
+def test_burst_then_rate(clock):
+    limiter = BandwidthLimiter(1000, burst_time=0.5)
+    limiter.consume(500)
+    assert clock.sleeps == []
+    limiter.consume(500)
+    limiter.consume(1000)
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(1.0)]
+
+
+def test_idle_time_does_not_accumulate(clock):
+    limiter = BandwidthLimiter(1000, burst_time=0.5)
+    clock.now += 60
+    limiter.consume(1500)
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_set_rate(clock):
+    limiter = BandwidthLimiter(1000, burst_time=0)
+    limiter.consume(1000)
+    limiter.set_rate(2000)
+    limiter.consume(1000)
+    limiter.set_rate(None)
+    limiter.consume(1000)
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(0.5)]
+
+
+def test_rate_limited_stream(clock):
+    limiter = BandwidthLimiter(100, burst_time=0)
+    stream = RateLimitedStream(io.BytesIO(b'x' * 150), limiter)
+    assert stream.read(100) == b'x' * 100
+    assert stream.read() == b'x' * 50
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(0.5)]
+
+
+@pytest.mark.apiver(from_ver=2)
+def test_transfers_are_limited():
+    api = B2Api(
+        InMemoryAccountInfo(),
+        api_config=B2HttpApiConfig(_raw_api_class=RawSimulator),
+        max_upload_bandwidth=10**6,
+    )
+    simulator = api.session.raw_api
+    application_key_id, master_key = simulator.create_account()
+    api.authorize_account(
+        realm='production', application_key_id=application_key_id, application_key=master_key
+    )
+    bucket = api.create_bucket('bucket1', 'allPrivate')
+    data = b'hello world' * 100
+
+    upload_limiter = api.services.upload_bandwidth_limiter
+    with patch.object(upload_limiter, 'consume', wraps=upload_limiter.consume) as consume:
+        file_version = bucket.upload_bytes(data, 'file1')
+    # the simulator reads the data twice, like a retried request sends it again
+    assert sum(call.args[0] for call in consume.call_args_list) == 2 * len(data)
+
+    api.set_bandwidth_limits(max_download_bandwidth=10**6)
+    assert not upload_limiter.is_limited()
+    download_limiter = api.services.download_bandwidth_limiter
+    with patch.object(download_limiter, 'consume', wraps=download_limiter.consume) as consume:
+        output = io.BytesIO()
+        bucket.download_file_by_id(file_version.id_).save(output)
+    assert output.getvalue() == data
+    assert sum(call.args[0] for call in consume.call_args_list) == len(data)
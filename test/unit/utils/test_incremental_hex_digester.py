@@ -11,7 +11,9 @@ from __future__ import annotations
 
 import hashlib
 import io
+import threading
 from test.unit.test_base import TestBase
+from unittest import mock
 
 from b2sdk.utils import (
     IncrementalHexDigester,
@@ -76,3 +78,60 @@ class TestIncrementalHexDigester(TestBase):
         expected_sha1_whole = self._get_sha1(input_data)
         result_sha1_whole = digester.update_from_stream()
         self.assertEqual(expected_sha1_whole, result_sha1_whole)
+
+    def test_read_ahead(self):
+        limit = self.BLOCK_SIZE * 10
+        input_data = bytes(range(limit * 2))
+        stream = io.BytesIO(input_data)
+        digester = IncrementalHexDigester(stream, block_size=self.BLOCK_SIZE, read_ahead_blocks=2)
+
+        self.assertEqual(self._get_sha1(input_data[:limit]), digester.update_from_stream(limit))
+        # the stream is not read past the limit
+        self.assertEqual(limit, stream.tell())
+        self.assertEqual(self._get_sha1(input_data), digester.update_from_stream())
+        self.assertEqual(len(input_data), digester.read_bytes)
+
+    def test_read_ahead_overlaps_hashing(self):
+        input_data = b'1' * self.BLOCK_SIZE * 3
+        stream = io.BytesIO(input_data)
+        second_block_read = threading.Event()
+        read = stream.read
+
+        def read_block(size):
+            data = read(size)
+            if stream.tell() == self.BLOCK_SIZE * 2:
+                second_block_read.set()
+            return data
+
+        class Digest:
+            def __init__(self):
+                self.sha1 = hashlib.sha1()
+                self.updates = 0
+
+            def update(self, data):
+                if self.updates == 0:
+                    # the next block is read while the first one is being hashed
+                    assert second_block_read.wait(5)
+                self.updates += 1
+                self.sha1.update(data)
+
+            def hexdigest(self):
+                return self.sha1.hexdigest()
+
+        stream.read = read_block
+        digester = IncrementalHexDigester(
+            stream, digest=Digest(), block_size=self.BLOCK_SIZE, read_ahead_blocks=1
+        )
+
+        self.assertEqual(self._get_sha1(input_data), digester.update_from_stream())
+
+    def test_read_ahead_error(self):
+        stream = mock.Mock(
+            read=mock.Mock(side_effect=[b'1' * self.BLOCK_SIZE,
+                                        OSError('read error')])
+        )
+        digester = IncrementalHexDigester(stream, block_size=self.BLOCK_SIZE, read_ahead_blocks=2)
+
+        with self.assertRaisesRegex(OSError, 'read error'):
+            digester.update_from_stream()
+        self.assertEqual(self.BLOCK_SIZE, digester.read_bytes)
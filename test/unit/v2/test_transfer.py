@@ -17,9 +17,11 @@ from .apiver.apiver_deps import DownloadManager, UploadManager
 
 class TestDownloadManager(TestBase):
     def test_set_thread_pool_size(self) -> None:
-        download_manager = DownloadManager(services=Mock())
+        services = Mock()
+        download_manager = DownloadManager(services=services)
         download_manager.set_thread_pool_size(21)
         self.assertEqual(download_manager._thread_pool._max_workers, 21)
+        services.api._update_http_pool_maxsize.assert_called_once_with()
 
 
 class TestUploadManager(TestBase):
@@ -59,6 +59,7 @@ class TestServices:
                     'save_to_buffer_size': 5,
                     'check_download_hash': True,
                     'max_download_streams_per_file': 6,
+                    'download_hash_reorder_buffer_size': 7,
                 },
                 DummyB,
             ],
@@ -103,6 +104,9 @@ class TestServices:
         assert download_manager.write_buffer_size == kwargs['save_to_buffer_size']
         assert download_manager.check_hash == kwargs['check_download_hash']
         assert download_manager.strategies[0].max_streams == kwargs['max_download_streams_per_file']
+        assert download_manager.strategies[0].hash_reorder_buffer_size == kwargs.get(
+            'download_hash_reorder_buffer_size', download_manager.DEFAULT_HASH_REORDER_BUFFER_SIZE
+        )
 
 
 class TestApi(TestBase):